@@ -0,0 +1,149 @@
+"""Benchmark GeoTiff creation profiles.
+
+Writes a raster with each of a number of GeoTiffProfiles and reports the
+bytes written, the write time, and the read throughput for full reads and
+for reads of random windows (as a training data loader would do).
+
+Usage (from the repository root):
+    python -m benchmarks.geotiff_profiles_benchmark [--raster PATH]
+        [--size SIZE] [--window-size SIZE] [--out-dir DIR]
+
+If no raster is given, a synthetic uint8 raster is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import rasterio as rio
+from rasterio.transform import from_origin
+from rasterio.windows import Window
+
+from geographer.utils.geotiff_profile import GeoTiffProfile
+
+PROFILES: dict[str, GeoTiffProfile] = {
+    "default": GeoTiffProfile(),
+    "tiled": GeoTiffProfile(tiled=True),
+    "lzw": GeoTiffProfile(tiled=True, compress="lzw", predictor=True),
+    "deflate": GeoTiffProfile(tiled=True, compress="deflate", predictor=True),
+    "zstd": GeoTiffProfile(tiled=True, compress="zstd", predictor=True),
+    "cog_deflate": GeoTiffProfile(cog=True, compress="deflate", predictor=True),
+}
+
+NUM_WINDOW_READS = 100
+
+
+def synthetic_raster(size: int) -> tuple[np.ndarray, dict]:
+    """Return smooth synthetic 3 band uint8 raster and its profile."""
+    rows, cols = np.mgrid[0:size, 0:size]
+    noise = np.random.default_rng(0).integers(0, 8, (3, size, size))
+    raster = ((rows + cols)[None, :, :] // 8 + noise) % 256
+    profile = dict(
+        height=size,
+        width=size,
+        count=3,
+        dtype="uint8",
+        crs="EPSG:32633",
+        transform=from_origin(0, 0, 10, 10),
+    )
+    return raster.astype(np.uint8), profile
+
+
+def read_raster(raster_path: Path) -> tuple[np.ndarray, dict]:
+    """Return raster and its profile."""
+    with rio.open(raster_path) as src:
+        profile = dict(
+            height=src.height,
+            width=src.width,
+            count=src.count,
+            dtype=src.dtypes[0],
+            crs=src.crs,
+            transform=src.transform,
+        )
+        return src.read(), profile
+
+
+def benchmark_profile(
+    profile: GeoTiffProfile,
+    raster: np.ndarray,
+    raster_profile: dict,
+    path: Path,
+    window_size: int,
+) -> dict[str, float]:
+    """Write raster with profile and measure sizes and throughputs."""
+    start = time.perf_counter()
+    with profile.open(path, "w", **raster_profile) as dst:
+        dst.write(raster)
+    write_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with rio.open(path) as src:
+        src.read()
+    full_read_time = time.perf_counter() - start
+
+    rng = random.Random(0)
+    height, width = raster.shape[1:]
+    start = time.perf_counter()
+    with rio.open(path) as src:
+        for _ in range(NUM_WINDOW_READS):
+            window = Window(
+                rng.randrange(0, width - window_size + 1),
+                rng.randrange(0, height - window_size + 1),
+                window_size,
+                window_size,
+            )
+            src.read(window=window)
+    window_read_time = time.perf_counter() - start
+
+    window_nbytes = raster.nbytes * window_size**2 / (height * width)
+    return {
+        "MB written": path.stat().st_size / 1e6,
+        "ratio": raster.nbytes / path.stat().st_size,
+        "write MB/s": raster.nbytes / 1e6 / write_time,
+        "full read MB/s": raster.nbytes / 1e6 / full_read_time,
+        "window read MB/s": NUM_WINDOW_READS * window_nbytes / 1e6 / window_read_time,
+    }
+
+
+def main():
+    """Run benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--raster", type=Path, default=None)
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--window-size", type=int, default=256)
+    parser.add_argument("--out-dir", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.raster is None:
+        raster, raster_profile = synthetic_raster(args.size)
+    else:
+        raster, raster_profile = read_raster(args.raster)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_dir = args.out_dir or Path(tmp_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        results = {
+            name: benchmark_profile(
+                profile,
+                raster,
+                raster_profile,
+                out_dir / f"{name}.tif",
+                args.window_size,
+            )
+            for name, profile in PROFILES.items()
+        }
+
+    columns = list(next(iter(results.values())))
+    print(f"{'profile':<12}" + "".join(f"{col:>18}" for col in columns))
+    for name, result in results.items():
+        print(f"{name:<12}" + "".join(f"{result[col]:>18.2f}" for col in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark memory usage of the graph engines.
+
+Builds the bipartite graph of a synthetic dataset (each vector feature is
+contained in two rasters) with each graph engine and reports the memory
+held by the graph (as traced by tracemalloc, including the vertex names),
+the time taken to build it from the synthetic data, and the time taken to
+look up the rasters containing each of NUM_QUERIES vector features. The
+timings are taken in a separate run without tracemalloc, which slows down
+memory allocations considerably.
+
+Usage (from the repository root):
+    python -m benchmarks.graph_memory_benchmark [--num-edges NUM_EDGES]
+        [--vectors-per-raster NUM]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable
+
+from geographer.graph import BipartiteGraph, CSRBipartiteGraph
+from geographer.graph.bipartite_graph_mixin import (
+    RASTER_IMGS_COLOR,
+    VECTOR_FEATURES_COLOR,
+)
+
+RASTERS_PER_VECTOR = 2
+NUM_QUERIES = 10_000
+
+
+def synthetic_graph_dict(num_edges: int, vectors_per_raster: int) -> dict:
+    """Return graph dict of a synthetic dataset with num_edges edges."""
+    num_vectors = num_edges // RASTERS_PER_VECTOR
+    num_rasters = max(1, num_edges // vectors_per_raster)
+    graph_dict = {VECTOR_FEATURES_COLOR: {}, RASTER_IMGS_COLOR: {}}
+    raster_names = [f"raster_{idx}.tif" for idx in range(num_rasters)]
+    for raster_name in raster_names:
+        graph_dict[RASTER_IMGS_COLOR][raster_name] = {}
+    for vector_idx in range(num_vectors):
+        vector_name = f"vector_{vector_idx}"
+        vector_edges = graph_dict[VECTOR_FEATURES_COLOR][vector_name] = {}
+        for offset in range(RASTERS_PER_VECTOR):
+            raster_name = raster_names[(vector_idx + offset) % num_rasters]
+            vector_edges[raster_name] = "contains"
+            graph_dict[RASTER_IMGS_COLOR][raster_name][vector_name] = "contains"
+    return graph_dict
+
+
+def measure(make_graph: Callable[[], object]) -> dict[str, float]:
+    """Return memory held by the graph made by make_graph and timings."""
+    gc.collect()
+    tracemalloc.start()
+    graph = make_graph()
+    gc.collect()
+    graph_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+
+    gc.collect()
+    start = time.perf_counter()
+    graph = make_graph()
+    build_time = time.perf_counter() - start
+
+    vector_names = list(graph.vertices(VECTOR_FEATURES_COLOR))[:NUM_QUERIES]
+    start = time.perf_counter()
+    for vector_name in vector_names:
+        graph.vertices_opposite(vector_name, VECTOR_FEATURES_COLOR)
+    query_time = time.perf_counter() - start
+    del graph
+    return {"MB": graph_bytes / 1e6, "build s": build_time, "query s": query_time}
+
+
+def main():
+    """Run benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-edges", type=int, default=1_000_000)
+    parser.add_argument("--vectors-per-raster", type=int, default=100)
+    args = parser.parse_args()
+
+    def graph_dict() -> dict:
+        return synthetic_graph_dict(args.num_edges, args.vectors_per_raster)
+
+    results = {
+        "dict": measure(lambda: BipartiteGraph(graph_dict=graph_dict())),
+        "csr": measure(lambda: CSRBipartiteGraph(graph_dict=graph_dict())),
+    }
+
+    columns = list(next(iter(results.values())))
+    print(f"{'engine':<12}" + "".join(f"{col:>18}" for col in columns))
+    for name, result in results.items():
+        print(f"{name:<12}" + "".join(f"{result[col]:>18.2f}" for col in columns))
+    print(f"dict / csr memory: {results['dict']['MB'] / results['csr']['MB']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
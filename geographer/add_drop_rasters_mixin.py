@@ -74,14 +74,12 @@ class AddDropRastersMixIn:
             self_df_name="self.rasters",
         )
 
-        # go through all new rasters...
-        for raster_name in new_rasters.index:
-            # add new raster vertex to the graph, add all connections
-            # to existing rasters, and modify self.vectors 'raster_count' value
-            raster_bounding_rectangle = new_rasters.loc[raster_name, "geometry"]
-            self._add_raster_to_graph_modify_vectors(
-                raster_name, raster_bounding_rectangle=raster_bounding_rectangle
-            )
+        # add new raster vertices to the graph, add all connections
+        # to existing vector features, and modify self.vectors 'raster_count' values
+        self._add_rasters_to_graph_modify_vectors(
+            raster_names=new_rasters.index.tolist(),
+            raster_bounding_rectangles=new_rasters.geometry.tolist(),
+        )
 
         # append new_rasters
         self.rasters = concat_gdfs([self.rasters, new_rasters])
@@ -119,15 +117,22 @@ class AddDropRastersMixIn:
 
         # drop row from self.rasters
         self.rasters.drop(raster_names, inplace=True)
+        self._drop_from_spatial_index("rasters", raster_names)
+        # the journal can't record dropped rows
+        self.mark_rows_changed("rasters")
 
         # remove all vertices from graph and modify vectors if necessary
-        for raster_name in raster_names:
-            self._remove_raster_from_graph_modify_vectors(raster_name)
+        self._remove_rasters_from_graph_modify_vectors(raster_names)
 
         # remove rasters and labels from disk
         if remove_rasters_from_disk:
             if label_maker is not None:
                 label_maker.delete_labels(self, raster_names)
-            for dir_ in self.raster_data_dirs:
-                for raster_name in raster_names:
-                    (dir_ / raster_name).unlink(missing_ok=True)
+            raster_paths = [
+                dir_ / raster_name
+                for dir_ in self.raster_data_dirs
+                for raster_name in raster_names
+            ]
+            for raster_path in raster_paths:
+                raster_path.unlink(missing_ok=True)
+            self.forget_raster_data_files(raster_paths)
@@ -89,25 +89,26 @@ class AddDropVectorsMixIn(object):
         # self._check_classes_in_vectors_contained_in_all_classes(
         #     new_vectors, 'new_vectors')
 
-        # For each new vector feature...
-        for vector_name in new_vectors.index:
-            # ... add a vertex for the new vector feature to the graph and add all
-            # connections to existing rasters.
-            self._add_vector_to_graph(vector_name, vectors=new_vectors)
+        # Add vertices for the new vector features to the graph and add all
+        # connections to existing rasters.
+        self._add_vectors_to_graph(vectors=new_vectors)
 
         # Append new_vectors to the connector's (self.)vectors.
         self.vectors = concat_gdfs([self.vectors, new_vectors])
         # self.vectors = self.vectors.convert_dtypes()
 
         if label_maker is not None:
-            # delete labels that need to change and recompute
-            rasters_w_new_vectors = [
-                raster_name
-                for vector_name in new_vectors.index
-                for raster_name in self.rasters_intersecting_vector(vector_name)
-            ]
-            label_maker.recompute_labels(
+            # update labels that need to change
+            rasters_w_new_vectors = list(
+                dict.fromkeys(
+                    raster_name
+                    for vector_name in new_vectors.index
+                    for raster_name in self.rasters_intersecting_vector(vector_name)
+                )
+            )
+            label_maker.patch_labels(
                 connector=self,
+                changed_geoms=new_vectors.geometry,
                 raster_names=rasters_w_new_vectors,
             )
 
@@ -144,19 +145,19 @@ class AddDropVectorsMixIn(object):
                 vector_name, VECTOR_FEATURES_COLOR, force_delete_with_edges=True
             )
 
+        dropped_geoms = self.vectors.geometry.loc[vector_names]
+
         # drop row from self.vectors
         self.vectors.drop(vector_names, inplace=True)
+        self._drop_from_spatial_index("vectors", vector_names)
+        self._drop_from_reprojected_vectors(vector_names)
+        # the journal can't record dropped rows
+        self.mark_rows_changed("vectors")
 
-        # recompute labels
-        if label_maker is True:
-            names_of_rasters_with_labels_to_recompute = list(
-                names_of_rasters_with_labels_to_recompute
-            )
-            label_maker.delete_labels(
-                connector=self,
-                raster_names=names_of_rasters_with_labels_to_recompute,
-            )
-            label_maker.make_labels(
+        # update labels
+        if label_maker is not None:
+            label_maker.patch_labels(
                 connector=self,
-                raster_names=names_of_rasters_with_labels_to_recompute,
+                changed_geoms=dropped_geoms,
+                raster_names=list(names_of_rasters_with_labels_to_recompute),
             )
@@ -8,7 +8,6 @@ from json.decoder import JSONDecodeError
 from pathlib import Path
 from typing import Any, Literal, Sequence, Type, TypeVar
 
-import geopandas as gpd
 from geopandas import GeoDataFrame
 
 # Mix-in classes:
@@ -19,22 +18,32 @@ from geographer.global_constants import (
     STANDARD_CRS_EPSG_CODE,
     VECTOR_FEATURES_INDEX_NAME,
 )
-from geographer.graph import BipartiteGraph
 from geographer.graph.bipartite_graph_mixin import BipartiteGraphMixIn
+from geographer.incremental_save_mixin import IncrementalSaveMixIn
+from geographer.raster_data_files_mixin import RasterDataFilesMixIn
+from geographer.reprojected_vectors_mixin import ReprojectedVectorsMixIn
+from geographer.spatial_index_mixin import SpatialIndexMixIn
 from geographer.utils.connector_utils import (
+    GRAPH_FILENAMES,
+    STORAGE_FORMAT_SUFFIXES,
+    GraphEngine,
+    GraphFileFormat,
+    StorageFormat,
     empty_gdf,
     empty_gdf_same_format_as,
     empty_graph,
+    existing_gdf_file_path,
+    gdf_file_path,
+    load_gdf,
+    load_graph,
+    save_gdf,
 )
 
 DEFAULT_CONNECTOR_DIR_NAME = "connector"
 DEFAULT_IMAGES_DIR_NAME = "rasters"
 DEFAULT_LABELS_DIR_NAME = "labels"
 INFERRED_PATH_ATTR_FILENAMES = {
-    "_vectors_path": "vectors.geojson",
-    "_rasters_path": "rasters.geojson",
     "attrs_path": "attrs.json",
-    "_graph_path": "graph.json",
 }
 """Attribute self.key will be self.connector_dir / val."""
 
@@ -46,6 +55,10 @@ log = logging.getLogger(__name__)
 class Connector(
     AddDropVectorsMixIn,
     AddDropRastersMixIn,
+    ReprojectedVectorsMixIn,
+    RasterDataFilesMixIn,
+    SpatialIndexMixIn,
+    IncrementalSaveMixIn,
     BipartiteGraphMixIn,  # Needs to be last
 ):
     """Dataset class that connects vector features and raster data.
@@ -81,6 +94,9 @@ class Connector(
         background_class: str | None = None,
         crs_epsg_code: int = STANDARD_CRS_EPSG_CODE,
         raster_count_col_name: str = "raster_count",
+        graph_engine: GraphEngine = "dict",
+        graph_file_format: GraphFileFormat = "npz",
+        storage_format: StorageFormat = "geoparquet",
 
         # optional kwargs
         **kwargs: Any,
@@ -114,6 +130,20 @@ class Connector(
             crs_epsg_code: EPSG code connector works with.
                 Defaults to STANDARD_CRS_EPSG_CODE
             data_dir: data directory containing rasters_dir, labels_dir, connector_dir.
+            graph_engine: implementation of the internal bipartite graph. Either
+                "dict" (dict-of-dicts, the default) or "csr" (compact array-backed
+                :class:`~geographer.graph.CSRBipartiteGraph`, recommended for
+                datasets with millions of vector features or rasters).
+            graph_file_format: format the graph is saved in. Either "npz"
+                (compact binary format, the default, see
+                :mod:`geographer.graph.binary_graph_file`) or "json" (indented
+                graph dict). When loading, whichever graph file exists is used.
+            storage_format: format vectors and rasters are saved in. Either
+                "geoparquet" (the default) or "geojson". When loading, files in
+                the other format are used if there are none in storage_format.
+                Connectors saved without a storage_format or graph_file_format
+                keep the format of their files. Use :meth:`export_geojson` to
+                export to GeoJSON.
             kwargs: optional keyword args for subclass implementations.
         """
         super().__init__()
@@ -140,12 +170,19 @@ class Connector(
                 "background_class": background_class,
                 "crs_epsg_code": crs_epsg_code,
                 "raster_count_col_name": raster_count_col_name,
+                "graph_engine": graph_engine,
+                "graph_file_format": graph_file_format,
+                "storage_format": storage_format,
                 **kwargs,
             }
         )
 
+        # state of the connector's files on disk, see IncrementalSaveMixIn
+        self._saved_state = None
+
         # get vectors and rasters
         if load_from_disk:
+            self._load_journal_manifest()
             vectors = self._load_df_from_disk("vectors")
             rasters = self._load_df_from_disk("rasters")
         else:
@@ -186,6 +223,9 @@ class Connector(
             self.labels_dir,
         ]  # in subclass implementation, can add e.g. mask_dir
 
+        if load_from_disk:
+            self._record_saved_state()
+
     def __getattr__(self, key: str) -> Any:
         """Check for key in attrs dict."""
         if "attrs" in self.__dict__ and key in self.__dict__["attrs"]:
@@ -232,6 +272,27 @@ class Connector(
                 connector_dir)
             raise
 
+        # Connectors saved before the storage format and graph file format
+        # could be chosen keep the format of their files.
+        if "storage_format" not in kwargs:
+            vectors_path = existing_gdf_file_path(
+                connector_dir, "vectors", "geoparquet"
+            )
+            kwargs["storage_format"] = next(
+                storage_format
+                for storage_format, suffix in STORAGE_FORMAT_SUFFIXES.items()
+                if suffix == vectors_path.suffix
+            )
+        if "graph_file_format" not in kwargs:
+            kwargs["graph_file_format"] = next(
+                (
+                    graph_file_format
+                    for graph_file_format, filename in GRAPH_FILENAMES.items()
+                    if (connector_dir / filename).is_file()
+                ),
+                "npz",
+            )
+
         new_connector = cls(
             load_from_disk=True,
             data_dir=data_dir,
@@ -261,6 +322,9 @@ class Connector(
 
     @vectors.setter
     def vectors(self, new_vectors: GeoDataFrame) -> None:
+        self._update_spatial_index("vectors", new_vectors)
+        self._update_reprojected_vectors(new_vectors)
+        self._update_changed_rows("vectors", new_vectors)
         self._vectors = new_vectors
 
     @property
@@ -270,6 +334,9 @@ class Connector(
 
     @rasters.setter
     def rasters(self, new_rasters: GeoDataFrame) -> None:
+        self._update_spatial_index("rasters", new_rasters)
+        self._update_raster_data_files(new_rasters)
+        self._update_changed_rows("rasters", new_rasters)
         self._rasters = new_rasters
 
     @property
@@ -363,40 +430,19 @@ class Connector(
         """
         return str(self._graph)
 
-    def save(self):
-        """Save connector to disk."""
-        log.info("Saving connector to disk...")
+    def export_geojson(self, out_dir: Path | str):
+        """Export vectors and rasters as GeoJSON files.
 
-        # Make sure connector_dir exists.
-        self._connector_dir.mkdir(parents=True, exist_ok=True)
-
-        rasters_non_geometry_columns = [
-            col for col in self.rasters.columns
-            if col != "geometry"
-        ]
-        self.rasters[rasters_non_geometry_columns] = self.rasters[
-            rasters_non_geometry_columns
-        ].convert_dtypes(
-            infer_objects=True,
-            convert_string=True,
-            convert_integer=True,
-            convert_boolean=True,
-            convert_floating=False,
+        Args:
+            out_dir: directory to save vectors.geojson and rasters.geojson to
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        save_gdf(self.vectors, gdf_file_path(out_dir, "vectors", "geojson"))
+        save_gdf(
+            self._get_rasters_with_geojson_dtypes(),
+            gdf_file_path(out_dir, "rasters", "geojson"),
         )
-        self.rasters.index.name = RASTER_IMGS_INDEX_NAME
-        self.rasters.to_file(Path(self._rasters_path), driver="GeoJSON")
-        self.vectors.index.name = VECTOR_FEATURES_INDEX_NAME
-        self.vectors.to_file(Path(self._vectors_path), driver="GeoJSON")
-        self._graph.save_to_file(Path(self._graph_path))
-        # Save params dict
-        with open(self.attrs_path, "w", encoding='utf-8') as write_file:
-            saveattrs = self._replace_path_values(self.attrs)
-            try:
-                json.dump(saveattrs, write_file, ensure_ascii=False, indent=4)
-            except TypeError as exc:
-                raise TypeError(
-                    "User defined attributes must be JSON-serializable."
-                    ) from exc
 
     def empty_connector_same_format(
         self,
@@ -474,19 +520,31 @@ class Connector(
 
         if load_from_disk:
 
-            self._graph = BipartiteGraph(file_path=self._graph_path)
+            self._graph = load_graph(self._existing_graph_path(), self.graph_engine)
+            self._apply_graph_journal()
             self.vectors = vectors
             self._rasters = rasters
 
         else:
 
-            self._graph = empty_graph()
+            self._graph = empty_graph(self.graph_engine)
             self._vectors = empty_gdf_same_format_as(vectors)
             self._rasters = empty_gdf_same_format_as(rasters)
 
             self.add_to_vectors(vectors)
             self.add_to_rasters(rasters)
 
+    def _existing_graph_path(self) -> Path:
+        """Return path of graph file to load, see GRAPH_FILENAMES."""
+        for filename in GRAPH_FILENAMES.values():
+            graph_path = self._connector_dir / filename
+            if graph_path.is_file():
+                return graph_path
+        raise FileNotFoundError(
+            f"No graph file ({', '.join(GRAPH_FILENAMES.values())}) "
+            f"found in {self._connector_dir}"
+        )
+
     def _check_required_df_cols_exist(
             self, df: GeoDataFrame, df_name: str,
             mode: Literal["vectors", "rasters"]) -> bool:
@@ -514,18 +572,53 @@ class Connector(
             # faster than unnecessary df.to_crs(epsg=crs_epsg_code)
             return df
 
-    def _load_df_from_disk(self, df_name: str) -> GeoDataFrame:
-        """Load vectors or rasters from disk."""
+    def _load_df_from_disk(
+        self, df_name: str, columns: list[str] | None = None
+    ) -> GeoDataFrame:
+        """Load vectors or rasters from disk.
+
+        Args:
+            df_name: "vectors" or "rasters"
+            columns: columns to load. Defaults to None, i.e. all columns.
+        """
         if df_name == "vectors":
             df_index_name = VECTOR_FEATURES_INDEX_NAME
         elif df_name == "rasters":
             df_index_name = RASTER_IMGS_INDEX_NAME
 
-        df_json_path = getattr(self, f"_{df_name}_path")
-        return_df = gpd.read_file(df_json_path)
-        return_df.set_index(df_index_name, inplace=True)
+        df_path = existing_gdf_file_path(
+            self._connector_dir, df_name, self.storage_format
+        )
+        df = load_gdf(df_path, index_name=df_index_name, columns=columns)
+        return self._apply_df_journal(df_name, df, columns=columns)
 
-        return return_df
+    def _convert_rasters_dtypes_for_geojson(self):
+        """Convert rasters columns to dtypes that survive a GeoJSON round trip."""
+        rasters_non_geometry_columns = [
+            col for col in self.rasters.columns
+            if col != "geometry"
+        ]
+        self.rasters[rasters_non_geometry_columns] = (
+            self._get_rasters_with_geojson_dtypes()[rasters_non_geometry_columns]
+        )
+
+    def _get_rasters_with_geojson_dtypes(self) -> GeoDataFrame:
+        """Return copy of rasters with dtypes that survive a GeoJSON round trip."""
+        rasters = self.rasters.copy()
+        rasters_non_geometry_columns = [
+            col for col in rasters.columns
+            if col != "geometry"
+        ]
+        rasters[rasters_non_geometry_columns] = rasters[
+            rasters_non_geometry_columns
+        ].convert_dtypes(
+            infer_objects=True,
+            convert_string=True,
+            convert_integer=True,
+            convert_boolean=True,
+            convert_floating=False,
+        )
+        return rasters
 
     def _init_set_paths(
         self,
@@ -564,6 +657,30 @@ class Connector(
 
         return rasters_dir, labels_dir, connector_dir
 
+    @staticmethod
+    def _connector_components_exist(connector_dir: Path | str) -> list[bool]:
+        """Return for each connector component whether a file for it exists.
+
+        The components are the attrs, vectors, rasters, and graph. Files in
+        any storage or graph file format count.
+        """
+        connector_dir = Path(connector_dir)
+        return [
+            (connector_dir / filename).is_file()
+            for filename in INFERRED_PATH_ATTR_FILENAMES.values()
+        ] + [
+            any(
+                gdf_file_path(connector_dir, df_name, storage_format).is_file()
+                for storage_format in STORAGE_FORMAT_SUFFIXES
+            )
+            for df_name in ["vectors", "rasters"]
+        ] + [
+            any(
+                (connector_dir / filename).is_file()
+                for filename in GRAPH_FILENAMES.values()
+            )
+        ]
+
     @staticmethod
     def _replace_path_values(input_dict: dict) -> dict:
         """Replace data_dir, rasters_dir, etc Paths with strings.
@@ -161,17 +161,13 @@ class DSConverterCombineRemoveClasses(DSCreatorFromSource):
 
         # Determine which rasters to copy to target dataset
         rasters_in_target_dataset_before_addings_rasters_from_source_dataset = (
-            {
-                raster_path.name
-                for raster_path in self.target_connector.rasters_dir.iterdir()
-            }
-            if self.target_connector.rasters_dir.exists()
-            else set()
+            self.target_connector.raster_data_file_names(
+                self.target_connector.rasters_dir
+            )
+        )
+        rasters_in_source_rasters_dir = self.source_connector.raster_data_file_names(
+            self.source_connector.rasters_dir
         )
-        rasters_in_source_rasters_dir = {
-            raster_path.name
-            for raster_path in self.source_connector.rasters_dir.iterdir()
-        }
         if self.remove_rasters:
             rasters_in_source_that_should_be_in_target = {
                 # all rasters in the source dataset ...
@@ -183,7 +179,7 @@ class DSConverterCombineRemoveClasses(DSCreatorFromSource):
                         self.source_connector.vectors_intersecting_raster(raster_name)
                     ).isdisjoint(vectors_from_source_df.index)
                 )
-                and (self.source_connector.rasters_dir / raster_name).exists()
+                and raster_name in rasters_in_source_rasters_dir
             }
         else:
             rasters_in_source_that_should_be_in_target = rasters_in_source_rasters_dir
@@ -239,6 +235,9 @@ class DSConverterCombineRemoveClasses(DSCreatorFromSource):
             ] = self.source_connector.vectors.loc[
                 list(vectors_to_add_to_target_dataset), "type"
             ]
+            self.target_connector.mark_rows_changed(
+                "vectors", vectors_to_add_to_target_dataset
+            )
 
         return self.target_connector
 
@@ -1,21 +1,35 @@
 """Convert a dataset of GeoTiffs to NPYs."""
 
+from __future__ import annotations
+
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 from typing import Literal
 
 import numpy as np
 import rasterio as rio
+from geopandas import GeoDataFrame
 from pydantic import Field
 from tqdm.auto import tqdm
 
+from geographer.connector import Connector
 from geographer.creator_from_source_dataset_base import DSCreatorFromSourceWithBands
-from geographer.raster_bands_getter_mixin import RasterBandsGetterMixIn
 
 log = logging.Logger(__name__)
 
+TMP_FILE_PREFIX = ".tmp."
+
 
-class DSConverterGeoTiffToNpy(DSCreatorFromSourceWithBands, RasterBandsGetterMixIn):
-    """Convert a dataset of GeoTiffs to NPYs."""
+class DSConverterGeoTiffToNpy(DSCreatorFromSourceWithBands):
+    """Convert a dataset of GeoTiffs to NPYs.
+
+    Each .npy file is preallocated as a memory-mapped array and the bands
+    are read into it with a single multi-band read, so converting a raster
+    needs no more memory than the raster itself. If n_workers > 1, the
+    rasters are converted by a pool of worker processes.
+    """
 
     squeeze_label_channel_dim_if_single_channel: bool = Field(
         default=True,
@@ -26,6 +40,18 @@ class DSConverterGeoTiffToNpy(DSCreatorFromSourceWithBands, RasterBandsGetterMix
         description="Ignoring squeezing: 'last' -> (height, width, channels), "
         "'first' -> (channels, height, width).",
     )
+    n_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of worker processes converting the GeoTiffs.",
+    )
+
+    def convert(self) -> Connector:
+        """Convert a dataset.
+
+        Alternate name for the create method.
+        """
+        return self.create()
 
     def _create(self):
         self._create_or_update()
@@ -33,107 +59,133 @@ class DSConverterGeoTiffToNpy(DSCreatorFromSourceWithBands, RasterBandsGetterMix
     def _update(self):
         self._create_or_update()
 
-    def _create_or_update(self) -> None:
-        # need this later
-        geoms_that_will_be_added_to_target_dataset = set(
-            self.source_assoc.geoms_df.index
-        ) - set(self.target_assoc.geoms_df.index)
+    def _create_or_update(self) -> Connector:
+        self._check_rasters_are_tifs(self.source_connector.rasters.index.tolist())
+        self._create_target_dirs()
 
-        # build npy associator
-        npy_rasters = self._get_npy_rasters()
-        self.target_assoc.add_to_rasters(npy_rasters)
-        self.target_assoc.add_to_geoms_df(self.source_assoc.geoms_df)
+        # need this later
+        vectors_that_will_be_added_to_target_dataset = set(
+            self.source_connector.vectors.index
+        ) - set(self.target_connector.vectors.index)
+        rasters_that_already_existed_in_target_rasters_dir = (
+            self.target_connector.raster_data_file_names(
+                self.target_connector.rasters_dir
+            )
+            & set(self.target_connector.rasters.index)
+        )
 
-        # Determine which rasters to copy to target dataset
-        rasters_that_already_existed_in_target_rasters_dir = {
-            raster_path.name for raster_path in self.target_assoc.rasters_dir.iterdir()
-        }
+        self._add_missing_vectors_to_target()
 
         # For each raster that already existed in the target dataset ...
         for raster_name in rasters_that_already_existed_in_target_rasters_dir:
-            # ... if among the (vector) geometries intersecting
+            # ... if among the vector features intersecting
             # it in the target dataset ...
-            geoms_intersecting_raster = set(
-                self.target_assoc.geoms_intersecting_raster(raster_name)
+            vectors_intersecting_raster = set(
+                self.target_connector.vectors_intersecting_raster(raster_name)
             )
-            # ... there is a *new* (vector) geometry ...
+            # ... there is a *new* vector feature ...
             if (
-                geoms_intersecting_raster & geoms_that_will_be_added_to_target_dataset
+                vectors_intersecting_raster
+                & vectors_that_will_be_added_to_target_dataset
                 != set()
             ):
                 # ... then we need to update the label for it,
                 # so we delete the current label.
-                (self.target_assoc.labels_dir / raster_name).unlink(missing_ok=True)
+                label_path = self.target_connector.labels_dir / raster_name
+                label_path.unlink(missing_ok=True)
+                self.target_connector.forget_raster_data_files([label_path])
+
+        # Convert all tifs whose npy doesn't exist in the target dataset ...
+        conversions = self._get_conversions()
+        if self.n_workers == 1:
+            for conversion in tqdm(conversions, desc="Converting to npy: "):
+                _convert_tif_to_npy(*conversion)
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                futures = [
+                    executor.submit(_convert_tif_to_npy, *conversion)
+                    for conversion in conversions
+                ]
+                for future in tqdm(
+                    as_completed(futures),
+                    total=len(futures),
+                    desc="Converting to npy: ",
+                ):
+                    future.result()  # raise exceptions from worker
+        self.target_connector.record_raster_data_files(
+            npy_path for _, npy_path, *_ in conversions
+        )
+
+        # ... and add the new npy rasters to the target connector.
+        npy_rasters = self._get_npy_rasters()
+        self.target_connector.add_to_rasters(
+            npy_rasters[~npy_rasters.index.isin(self.target_connector.rasters.index)]
+        )
+
+        self.target_connector.save()
+        self.save()
+
+        return self.target_connector
+
+    def _get_conversions(
+        self,
+    ) -> list[tuple[Path, Path, list[int] | None, Literal["last", "first"], bool]]:
+        """Return arguments of _convert_tif_to_npy for all npys to be created."""
+        conversions = []
 
         # For the rasters_dir and labels_dir of the source tif
         # and target npy dataset ...
-        for tif_dir, npy_dir in zip(
-            self.source_assoc.raster_data_dirs, self.target_assoc.raster_data_dirs
+        for count, (tif_dir, npy_dir) in enumerate(
+            zip(
+                self.source_connector.raster_data_dirs,
+                self.target_connector.raster_data_dirs,
+            )
         ):
-            # ... go through all tif files. ...
-            for tif_raster_name in tqdm(
-                self.source_assoc.rasters.index, desc=f"Converting {tif_dir.name}"
-            ):
-                # If the corresponding npy in the target raster data dir
-                # does not exist ...
-                if not (
-                    npy_dir / self._npy_filename_from_tif(tif_raster_name)
-                ).is_file():
-                    # ... convert the tif: Open the tif file ...
-                    with rio.open(tif_dir / tif_raster_name) as src:
-                        raster_bands = self._get_bands_for_raster(
-                            self.bands,
-                            tif_dir / tif_raster_name,
-                        )
-
-                        # extract bands to list of arrays
-                        seq_extracted_np_bands = [
-                            src.read(band) for band in raster_bands
-                        ]
-
-                        # new raster path
-                        new_npy_raster_path = npy_dir / self._npy_filename_from_tif(
-                            tif_raster_name
-                        )
-
-                        # axis along which to stack
-                        if self.channels_first_or_last_in_npy == "last":
-                            axis = 2
-                        else:  # 'first'
-                            axis = 0
-
-                        # stack band arrays into single tensor
-                        np_raster = np.stack(seq_extracted_np_bands, axis=axis)
-
-                        # squeeze np_raster if necessary
-                        if (
-                            str(tif_dir.name) == "labels"
-                            and self.squeeze_label_channel_dim_if_single_channel
-                        ):
-                            if len(raster_bands) == 1:
-                                np_raster = np.squeeze(np_raster, axis=axis)
-
-                        # save numpy array
-                        np.save(new_npy_raster_path, np_raster)
-
-        # ... and save the associator.
-        self.target_assoc.save()
-        self.save()
-
-        return self.target_assoc
-
-    def _get_npy_rasters(self):
-        npy_rasters = self.source_assoc.rasters
-        # the line after the next destroys the index name of tif_assoc.rasters,
-        # so we remember it ...
-        tif_assoc_rasters_index_name = self.source_assoc.rasters.index.name
-        tif_raster_name_list = (
-            npy_rasters.index.tolist().copy()
-        )  # (it's either the .tolist() or .copy() operation, don't understand why)
-        npy_rasters.index = list(map(self._npy_filename_from_tif, tif_raster_name_list))
-        # ... and then set it by hand
-        npy_rasters.index.name = tif_assoc_rasters_index_name
-        return npy_rasters
+            raster_bands = self._get_bands_for_dir(tif_dir)
+            squeeze = (
+                npy_dir == self.target_connector.labels_dir
+                and self.squeeze_label_channel_dim_if_single_channel
+            )
+            tif_names = self.source_connector.raster_data_file_names(tif_dir)
+            npy_names = self.target_connector.raster_data_file_names(npy_dir)
+
+            # ... go through all tif files ...
+            for tif_raster_name in self.source_connector.rasters.index:
+                npy_raster_name = self._npy_filename_from_tif(tif_raster_name)
+
+                # ... whose npy doesn't exist yet.
+                if npy_raster_name in npy_names:
+                    continue
+                if count > 0 and tif_raster_name not in tif_names:
+                    # count == 0 corresponds to rasters_dir
+                    continue
+
+                conversions.append(
+                    (
+                        tif_dir / tif_raster_name,
+                        npy_dir / npy_raster_name,
+                        raster_bands,
+                        self.channels_first_or_last_in_npy,
+                        squeeze,
+                    )
+                )
+
+        return conversions
+
+    def _get_bands_for_dir(self, tif_dir: Path) -> list[int] | None:
+        """Return band indices to convert for a raster data dir.
+
+        Returns None if all bands are to be converted.
+        """
+        if self.bands is None:
+            return None
+        if tif_dir.name not in self.bands:
+            raise ValueError(f"Missing bands key: {tif_dir.name}")
+        return self.bands[tif_dir.name]
+
+    def _get_npy_rasters(self) -> GeoDataFrame:
+        """Return source connector's rasters renamed to the npy filenames."""
+        return self.source_connector.rasters.rename(index=self._npy_filename_from_tif)
 
     @staticmethod
     def _npy_filename_from_tif(tif_filename: str) -> str:
@@ -151,3 +203,52 @@ class DSConverterGeoTiffToNpy(DSCreatorFromSourceWithBands, RasterBandsGetterMix
         )
         if non_tif_rasters:
             raise ValueError("Only works with dataset of GeoTiff rasters!")
+
+
+def _convert_tif_to_npy(
+    tif_path: Path,
+    npy_path: Path,
+    raster_bands: list[int] | None,
+    channels_first_or_last_in_npy: Literal["last", "first"],
+    squeeze: bool,
+):
+    """Convert GeoTiff to .npy.
+
+    Args:
+        tif_path: path of GeoTiff
+        npy_path: path of .npy file to be created
+        raster_bands: band indices to convert. None means all bands.
+        channels_first_or_last_in_npy: 'last' -> (height, width, channels),
+            'first' -> (channels, height, width)
+        squeeze: whether to squeeze the channel dim/axis if there is a
+            single band
+    """
+    # write to temporary file first so an interrupted conversion does not
+    # leave a truncated npy behind
+    tmp_path = npy_path.with_name(f"{TMP_FILE_PREFIX}{npy_path.name}")
+
+    with rio.open(tif_path) as src:
+        if raster_bands is None:
+            raster_bands = list(src.indexes)
+        dtype = src.dtypes[raster_bands[0] - 1]
+
+        if squeeze and len(raster_bands) == 1:
+            shape = (src.height, src.width)
+        elif channels_first_or_last_in_npy == "last":
+            shape = (src.height, src.width, len(raster_bands))
+        else:  # 'first'
+            shape = (len(raster_bands), src.height, src.width)
+        npy = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=shape)
+
+        # view of npy of shape (channels, height, width) to read the bands into
+        if len(shape) == 2:
+            out = npy[np.newaxis]
+        elif channels_first_or_last_in_npy == "last":
+            out = np.moveaxis(npy, 2, 0)
+        else:
+            out = npy
+        src.read(raster_bands, out=out)
+
+    npy.flush()
+    del npy, out
+    os.replace(tmp_path, npy_path)
@@ -16,11 +16,7 @@ from pydantic import (
 from geographer.base_model_dict_conversion.save_load_base_model_mixin import (
     SaveAndLoadBaseModelMixIn,
 )
-from geographer.connector import (
-    DEFAULT_CONNECTOR_DIR_NAME,
-    INFERRED_PATH_ATTR_FILENAMES,
-    Connector,
-)
+from geographer.connector import DEFAULT_CONNECTOR_DIR_NAME, Connector
 
 
 class DSCreatorFromSource(ABC, SaveAndLoadBaseModelMixIn, BaseModel):
@@ -51,10 +47,9 @@ class DSCreatorFromSource(ABC, SaveAndLoadBaseModelMixIn, BaseModel):
             self._source_connector = Connector.from_data_dir(self.source_data_dir)
 
         if self.target_data_dir:
-            connector_file_paths_exist = [
-                (self.target_data_dir / DEFAULT_CONNECTOR_DIR_NAME / filename).is_file()
-                for filename in INFERRED_PATH_ATTR_FILENAMES.values()
-            ]
+            connector_file_paths_exist = Connector._connector_components_exist(
+                self.target_data_dir / DEFAULT_CONNECTOR_DIR_NAME
+            )
 
             if all(connector_file_paths_exist):
                 self._target_connector = Connector.from_data_dir(self.target_data_dir)
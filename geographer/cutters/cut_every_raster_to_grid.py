@@ -25,6 +25,9 @@ def get_cutter_every_raster_to_grid(
     name: str,
     new_raster_size: RasterSize = 512,
     raster_filter_predicate: Optional[RasterFilterPredicate] = None,
+    n_workers: int = 1,
+    streaming: bool = False,
+    vrt: bool = False,
 ) -> DSCutterIterOverRasters:
     """Return dataset cutter that cuts every raster to a grid.
 
@@ -39,13 +42,21 @@ def get_cutter_every_raster_to_grid(
         raster_filter_predicate: raster filter predicate to select
             rasters. Defaults to None (i.e. cut all
             rasters that have not been previously cut).
+        n_workers: number of worker processes cutting rasters. Defaults to 1.
+        streaming: whether to read each source raster row by row of the grid
+            in one sequential pass, see SingleRasterCutterToGrid. Defaults to
+            False.
+        vrt: whether to create VRTs referencing windows of the source rasters
+            instead of GeoTiffs, see SingleRasterCutter. Defaults to False.
 
     Returns:
         DSCutterIterOverRasters: dataset cutter
     """
     if raster_filter_predicate is None:
         raster_filter_predicate = RastersNotPreviouslyCutOnly()
-    raster_cutter = SingleRasterCutterToGrid(new_raster_size=new_raster_size)
+    raster_cutter = SingleRasterCutterToGrid(
+        new_raster_size=new_raster_size, streaming=streaming, vrt=vrt
+    )
 
     return DSCutterIterOverRasters(
         source_data_dir=source_data_dir,
@@ -54,4 +65,5 @@ def get_cutter_every_raster_to_grid(
         raster_cutter=raster_cutter,
         raster_filter_predicate=raster_filter_predicate,
         cut_rasters=[],
+        n_workers=n_workers,
     )
@@ -13,6 +13,7 @@ from tqdm.auto import tqdm
 
 from geographer.connector import Connector
 from geographer.creator_from_source_dataset_base import DSCreatorFromSourceWithBands
+from geographer.cutters.parallel_cutting import cut_raster_in_worker, cutting_executor
 from geographer.cutters.raster_filter_predicates import AlwaysTrue as AlwaysTrueRasters
 from geographer.cutters.raster_filter_predicates import RasterFilterPredicate
 from geographer.cutters.single_raster_cutter_base import SingleRasterCutter
@@ -45,6 +46,16 @@ class DSCutterIterOverRasters(DSCreatorFromSourceWithBands):
             "Names of cut rasters in source_data_dir. Usually not to be set by hand!"
         ),
     )
+    n_workers: int = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Number of worker processes. If greater than 1, the raster cutter runs "
+            "in a process pool and its results are merged into the target dataset "
+            "in the same order as in serial mode. The raster filter predicate and "
+            "raster cutter then must not depend on rasters cut in the same run."
+        ),
+    )
 
     def __init__(self, **data) -> None:
         """Initialize DSCutterIterOverRasters."""
@@ -124,53 +135,50 @@ class DSCutterIterOverRasters(DSCreatorFromSourceWithBands):
         self._add_missing_vectors_to_target()
 
         # Iterate over all rasters in source dataset
-        for raster_name in tqdm(
-            self.source_connector.rasters.index, desc="Cutting dataset: "
-        ):
-            # If filter condition is satisfied, (if not, don't do anything) ...
-            if self.raster_filter_predicate(
-                raster_name,
-                target_connector=self.target_connector,
-                new_raster_dict=new_rasters_dict,
-                source_connector=self.source_connector,
-                cut_rasters=self.cut_rasters,
+        if self.n_workers == 1:
+            for raster_name in tqdm(
+                self.source_connector.rasters.index, desc="Cutting dataset: "
             ):
-                # ... cut the rasters (and their labels) and remember information
-                # to be appended to self.target_connector rasters in return dict
-                rasters_from_single_cut_dict = self.raster_cutter(
-                    raster_name=raster_name,
-                    source_connector=self.source_connector,
-                    target_connector=self.target_connector,
-                    new_rasters_dict=new_rasters_dict,
-                    bands=self.bands,
-                )
-
-                # Make sure raster_cutter returned dict with same keys
-                # as needed by new_rasters_dict.
-                assert {
-                    RASTER_IMGS_INDEX_NAME,
-                    "geometry",
-                    "orig_crs_epsg_code",
-                } <= set(rasters_from_single_cut_dict.keys()), (
-                    "dict returned by raster_cutter needs the following keys: "
-                    "IMGS_DF_INDEX_NAME, 'geometry', 'orig_crs_epsg_code'."
+                # If filter condition is satisfied, (if not, don't do anything) ...
+                if self._filter_raster(raster_name, new_rasters_dict):
+                    # ... cut the rasters (and their labels) and remember information
+                    # to be appended to self.target_connector rasters in return dict
+                    rasters_from_single_cut_dict = self.raster_cutter(
+                        raster_name=raster_name,
+                        source_connector=self.source_connector,
+                        target_connector=self.target_connector,
+                        new_rasters_dict=new_rasters_dict,
+                        bands=self.bands,
+                    )
+                    self._add_rasters_from_single_cut(
+                        raster_name, rasters_from_single_cut_dict, new_rasters_dict
+                    )
+        else:
+            raster_names = [
+                raster_name
+                for raster_name in self.source_connector.rasters.index
+                if self._filter_raster(raster_name, new_rasters_dict)
+            ]
+            with cutting_executor(
+                n_workers=self.n_workers,
+                raster_cutter=self.raster_cutter,
+                source_connector=self.source_connector,
+                target_connector=self.target_connector,
+                new_rasters_dict=new_rasters_dict,
+                bands=self.bands,
+            ) as executor:
+                # map preserves order, so the results are merged as in serial mode
+                rasters_from_cut_dicts = executor.map(
+                    cut_raster_in_worker,
+                    [{"raster_name": raster_name} for raster_name in raster_names],
                 )
-
-                # Accumulate information for the new rasters in new_rasters_dict.
-                for key in new_rasters_dict.keys():
-                    new_rasters_dict[key] += rasters_from_single_cut_dict[key]
-
-                new_raster_names = rasters_from_single_cut_dict[RASTER_IMGS_INDEX_NAME]
-                raster_bounding_rectangles = rasters_from_single_cut_dict["geometry"]
-                for new_raster_name, raster_bounding_rectangle in zip(
-                    new_raster_names, raster_bounding_rectangles
+                for raster_name, rasters_from_single_cut_dict in tqdm(
+                    zip(raster_names, rasters_from_cut_dicts),
+                    total=len(raster_names),
+                    desc="Cutting dataset: ",
                 ):
-                    self.cut_rasters.append(raster_name)
-
-                    # Update graph and modify vectors in self.target_connector
-                    self.target_connector._add_raster_to_graph_modify_vectors(
-                        raster_name=new_raster_name,
-                        raster_bounding_rectangle=raster_bounding_rectangle,
+                    self._add_rasters_from_single_cut(
+                        raster_name, rasters_from_single_cut_dict, new_rasters_dict
                     )
 
         # Extract accumulated information about the rasters we've
@@ -204,6 +212,54 @@ class DSCutterIterOverRasters(DSCreatorFromSourceWithBands):
                 raster_names=rasters_w_new_vectors,
             )
 
+    def _filter_raster(self, raster_name: str, new_rasters_dict: dict) -> bool:
+        """Return whether raster is to be cut."""
+        return self.raster_filter_predicate(
+            raster_name,
+            target_connector=self.target_connector,
+            new_raster_dict=new_rasters_dict,
+            source_connector=self.source_connector,
+            cut_rasters=self.cut_rasters,
+        )
+
+    def _add_rasters_from_single_cut(
+        self,
+        raster_name: str,
+        rasters_from_single_cut_dict: dict,
+        new_rasters_dict: dict,
+    ):
+        """Merge rasters cut from a single source raster into the target dataset.
+
+        Args:
+            raster_name: name of source raster
+            rasters_from_single_cut_dict: dict returned by raster_cutter
+            new_rasters_dict: information about cut rasters not yet appended to
+                target_connector.rasters
+        """
+        # Make sure raster_cutter returned dict with same keys
+        # as needed by new_rasters_dict.
+        assert {
+            RASTER_IMGS_INDEX_NAME,
+            "geometry",
+            "orig_crs_epsg_code",
+        } <= set(rasters_from_single_cut_dict.keys()), (
+            "dict returned by raster_cutter needs the following keys: "
+            "IMGS_DF_INDEX_NAME, 'geometry', 'orig_crs_epsg_code'."
+        )
+
+        # Accumulate information for the new rasters in new_rasters_dict.
+        for key in new_rasters_dict.keys():
+            new_rasters_dict[key] += rasters_from_single_cut_dict[key]
+
+        new_raster_names = rasters_from_single_cut_dict[RASTER_IMGS_INDEX_NAME]
+        self.cut_rasters += [raster_name] * len(new_raster_names)
+
+        # Update graph and modify vectors in self.target_connector
+        self.target_connector._add_rasters_to_graph_modify_vectors(
+            raster_names=new_raster_names,
+            raster_bounding_rectangles=rasters_from_single_cut_dict["geometry"],
+        )
+
     def _check_crs_agree(self):
         """Run safety check.
 
@@ -9,7 +9,9 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from typing import Optional
+from concurrent.futures import Executor, Future
+from contextlib import nullcontext
+from typing import Literal, Optional
 
 from geopandas import GeoDataFrame
 from pydantic import Field
@@ -17,8 +19,12 @@ from tqdm.auto import tqdm
 
 from geographer.connector import Connector
 from geographer.creator_from_source_dataset_base import DSCreatorFromSourceWithBands
+from geographer.cutters.parallel_cutting import cutting_executor, make_rasters_in_worker
 from geographer.cutters.raster_selectors import RasterSelector
-from geographer.cutters.single_raster_cutter_base import SingleRasterCutter
+from geographer.cutters.single_raster_cutter_base import (
+    SingleRasterCutter,
+    SourceDatasets,
+)
 from geographer.cutters.vector_filter_predicates import (
     AlwaysTrue,
     VectorFilterPredicate,
@@ -29,6 +35,9 @@ from geographer.utils.utils import concat_gdfs, map_dict_values
 
 logger = logging.getLogger(__name__)
 
+# maximum number of source rasters kept open while planning cuts
+MAX_OPEN_SOURCE_DATASETS = 32
+
 
 class DSCutterIterOverVectors(DSCreatorFromSourceWithBands):
     """Dataset cutter that iterates over vector features.
@@ -67,6 +76,27 @@ class DSCutterIterOverVectors(DSCreatorFromSourceWithBands):
         description="Normally, should not be set by hand! Dict with vector features\
         as keys and lists of rasters cut for each vector feature as values",
     )
+    n_workers: int = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Number of worker processes. If greater than 1, the vector filter "
+            "predicate, raster selector, and the computation of the windows to cut "
+            "still run in order in the main process, so the result is the same as "
+            "in serial mode, but the new rasters (and labels) are written by a "
+            "process pool, one task per cut source raster."
+        ),
+    )
+    schedule: Literal["vector", "raster"] = Field(
+        default="vector",
+        description=(
+            "If 'vector', the rasters for a vector feature are cut right after "
+            "they have been selected. If 'raster', all cuts are planned first "
+            "(using the vector filter predicate and raster selector as in "
+            "'vector' mode), then grouped by source raster, and each source "
+            "raster is opened once to cut all of its windows."
+        ),
+    )
 
     def __init__(self, **data) -> None:
         """Initialize DSCutterIterOverVectors."""
@@ -151,93 +181,58 @@ class DSCutterIterOverVectors(DSCreatorFromSourceWithBands):
             )
         )
 
-        # For each vector feature ...
-        for vector_name in tqdm(vectors_to_iterate_over, desc="Cutting dataset: "):
-            # ... if we want to create new rasters for it ...
-            if self.vector_filter_predicate(
-                vector_name=vector_name,
+        if self.n_workers == 1:
+            executor_context = nullcontext()
+        else:
+            executor_context = cutting_executor(
+                n_workers=self.n_workers,
+                raster_cutter=self.raster_cutter,
+                source_connector=self.source_connector,
                 target_connector=self.target_connector,
                 new_rasters_dict=new_rasters_dict,
-                source_connector=self.source_connector,
-            ):
-                # ... remember it ...
-                added_vectors += [vector_name]
-
-                # ... and then from the rasters in the source dataset
-                # containing the vector feature ...
-                potential_source_rasters = (
-                    self.source_connector.rasters_containing_vector(vector_name)
-                )
-                # ... but from which a raster for that vector feature
-                # has not yet been cut ...
-                potential_source_rasters = self._filter_out_previously_cut_rasters(
-                    vector_name=vector_name,
-                    src_rasters_containing_vector=set(potential_source_rasters),
-                )
+                bands=self.bands,
+            )
 
-                # ... select the rasters we want to cut from.
-                for raster_name in self.raster_selector(
+        # Unless cutting serially vector by vector, the cuts are planned
+        # first and the new rasters written later
+        if self.n_workers == 1 and self.schedule == "vector":
+            planned_cuts = None
+        else:
+            planned_cuts = []
+
+        with executor_context as executor, SourceDatasets(
+            max_open=MAX_OPEN_SOURCE_DATASETS
+        ) as source_datasets:
+            futures: list[Future] = []
+
+            # For each vector feature ...
+            for vector_name in tqdm(vectors_to_iterate_over, desc="Cutting dataset: "):
+                # ... if we want to create new rasters for it ...
+                if self.vector_filter_predicate(
                     vector_name=vector_name,
-                    raster_names_list=potential_source_rasters,
                     target_connector=self.target_connector,
                     new_rasters_dict=new_rasters_dict,
                     source_connector=self.source_connector,
-                    cut_rasters=self.cut_rasters,
                 ):
-                    # Cut each raster (and label) and remember the information to be
-                    # appended to self.target_connector rasters in return dict
-                    rasters_from_single_cut_dict = self.raster_cutter(
-                        raster_name=raster_name,
-                        vector_name=vector_name,
-                        source_connector=self.source_connector,
-                        target_connector=self.target_connector,
-                        new_rasters_dict=new_rasters_dict,
-                        bands=self.bands,
+                    # ... remember it and cut rasters for it.
+                    added_vectors += [vector_name]
+                    self._cut_rasters_for_vector(
+                        vector_name, new_rasters_dict, planned_cuts, source_datasets
                     )
 
-                    # Make sure raster_cutter returned dict with same keys as needed
-                    # by new_rasters_dict.
-                    assert {
-                        RASTER_IMGS_INDEX_NAME,
-                        "geometry",
-                        "orig_crs_epsg_code",
-                    } <= set(rasters_from_single_cut_dict.keys()), (
-                        "Dict returned by raster_cutter needs the following keys: "
-                        "IMGS_DF_INDEX_NAME, 'geometry', 'orig_crs_epsg_code'."
-                    )
+                    if executor is not None and self.schedule == "vector":
+                        futures += [
+                            executor.submit(make_rasters_in_worker, new_rasters_kwargs)
+                            for _, new_rasters_kwargs in planned_cuts
+                        ]
+                        planned_cuts.clear()
+
+            if self.schedule == "raster":
+                futures += self._make_planned_rasters(planned_cuts, executor)
 
-                    # Accumulate information for the new rasters in new_rasters_dict.
-                    for key in new_rasters_dict.keys():
-                        new_rasters_dict[key] += rasters_from_single_cut_dict[key]
-
-                    new_raster_names = rasters_from_single_cut_dict[
-                        RASTER_IMGS_INDEX_NAME
-                    ]
-                    raster_bounding_rectangles = rasters_from_single_cut_dict[
-                        "geometry"
-                    ]
-                    for new_raster_name, raster_bounding_rectangle in zip(
-                        new_raster_names, raster_bounding_rectangles
-                    ):
-                        # Update graph and modify vectors
-                        # in self.target_connector
-                        self.target_connector._add_raster_to_graph_modify_vectors(
-                            raster_name=new_raster_name,
-                            raster_bounding_rectangle=raster_bounding_rectangle,
-                        )
-
-                        # Update self.cut_rasters
-                        for (
-                            vector_name_
-                        ) in self.target_connector.vectors_contained_in_raster(
-                            new_raster_name
-                        ):
-                            self.cut_rasters[vector_name_] += [raster_name]
-
-                    # In case the vector feature vector_name is not contained in any
-                    # of the new_rasters:
-                    if raster_name not in self.cut_rasters[vector_name]:
-                        self.cut_rasters[vector_name] += [raster_name]
+            # Wait for the workers, raise their errors if any
+            for future in futures:
+                future.result()
 
         # Extract accumulated information about the rasters we've created in the target
         # dataset into a dataframe...
@@ -285,6 +280,145 @@ class DSCutterIterOverVectors(DSCreatorFromSourceWithBands):
         # Finally, save connector to disk.
         self.target_connector.save()
 
+    def _cut_rasters_for_vector(
+        self,
+        vector_name: str | int,
+        new_rasters_dict: dict,
+        planned_cuts: list[tuple[str, list[dict]]] | None = None,
+        source_datasets: SourceDatasets | None = None,
+    ):
+        """Cut rasters for a vector feature.
+
+        Args:
+            vector_name: name/id of vector feature
+            new_rasters_dict: information about cut rasters not yet appended to
+                target_connector.rasters
+            planned_cuts: if not None, the new rasters are not written but
+                planned, and the source raster names and keyword arguments for
+                the raster cutter's make_new_rasters_and_labels method are
+                appended to planned_cuts.
+            source_datasets: open source datasets to reuse when planning
+        """
+        # From the rasters in the source dataset containing the vector feature ...
+        potential_source_rasters = self.source_connector.rasters_containing_vector(
+            vector_name
+        )
+        # ... but from which a raster for that vector feature
+        # has not yet been cut ...
+        potential_source_rasters = self._filter_out_previously_cut_rasters(
+            vector_name=vector_name,
+            src_rasters_containing_vector=set(potential_source_rasters),
+        )
+
+        # ... select the rasters we want to cut from.
+        for raster_name in self.raster_selector(
+            vector_name=vector_name,
+            raster_names_list=potential_source_rasters,
+            target_connector=self.target_connector,
+            new_rasters_dict=new_rasters_dict,
+            source_connector=self.source_connector,
+            cut_rasters=self.cut_rasters,
+        ):
+            # Cut each raster (and label) and remember the information to be
+            # appended to self.target_connector rasters in return dict
+            if planned_cuts is None:
+                rasters_from_single_cut_dict = self.raster_cutter(
+                    raster_name=raster_name,
+                    vector_name=vector_name,
+                    source_connector=self.source_connector,
+                    target_connector=self.target_connector,
+                    new_rasters_dict=new_rasters_dict,
+                    bands=self.bands,
+                )
+            else:
+                rasters_from_single_cut_dict, new_rasters_kwargs = (
+                    self.raster_cutter.plan_cut(
+                        raster_name=raster_name,
+                        vector_name=vector_name,
+                        source_connector=self.source_connector,
+                        target_connector=self.target_connector,
+                        new_rasters_dict=new_rasters_dict,
+                        source_datasets=source_datasets,
+                    )
+                )
+                planned_cuts.append((raster_name, new_rasters_kwargs))
+
+            # Make sure raster_cutter returned dict with same keys as needed
+            # by new_rasters_dict.
+            assert {
+                RASTER_IMGS_INDEX_NAME,
+                "geometry",
+                "orig_crs_epsg_code",
+            } <= set(rasters_from_single_cut_dict.keys()), (
+                "Dict returned by raster_cutter needs the following keys: "
+                "IMGS_DF_INDEX_NAME, 'geometry', 'orig_crs_epsg_code'."
+            )
+
+            # Accumulate information for the new rasters in new_rasters_dict.
+            for key in new_rasters_dict.keys():
+                new_rasters_dict[key] += rasters_from_single_cut_dict[key]
+
+            new_raster_names = rasters_from_single_cut_dict[RASTER_IMGS_INDEX_NAME]
+
+            # Update graph and modify vectors in self.target_connector
+            self.target_connector._add_rasters_to_graph_modify_vectors(
+                raster_names=new_raster_names,
+                raster_bounding_rectangles=rasters_from_single_cut_dict["geometry"],
+            )
+
+            # Update self.cut_rasters
+            for new_raster_name in new_raster_names:
+                for vector_name_ in self.target_connector.vectors_contained_in_raster(
+                    new_raster_name
+                ):
+                    self.cut_rasters[vector_name_] += [raster_name]
+
+            # In case the vector feature vector_name is not contained in any
+            # of the new_rasters:
+            if raster_name not in self.cut_rasters[vector_name]:
+                self.cut_rasters[vector_name] += [raster_name]
+
+    def _make_planned_rasters(
+        self,
+        planned_cuts: list[tuple[str, list[dict]]],
+        executor: Executor | None,
+    ) -> list[Future]:
+        """Make planned new rasters (and labels) grouped by source raster.
+
+        Each source raster (and label etc) is opened once and all windows
+        planned for it are cut together.
+
+        Args:
+            planned_cuts: source raster names and keyword arguments for the
+                raster cutter's make_new_rasters_and_labels method
+            executor: if not None, submit one task per source raster to the
+                executor
+
+        Returns:
+            futures of submitted tasks
+        """
+        new_rasters_kwargs_by_source_raster: dict[str, list[dict]] = defaultdict(list)
+        for raster_name, new_rasters_kwargs in planned_cuts:
+            new_rasters_kwargs_by_source_raster[raster_name] += new_rasters_kwargs
+
+        if executor is not None:
+            return [
+                executor.submit(make_rasters_in_worker, new_rasters_kwargs)
+                for new_rasters_kwargs in new_rasters_kwargs_by_source_raster.values()
+            ]
+
+        for new_rasters_kwargs in tqdm(
+            new_rasters_kwargs_by_source_raster.values(),
+            desc="Cutting source rasters: ",
+        ):
+            self.raster_cutter.make_new_rasters_and_labels(
+                new_rasters_kwargs,
+                source_connector=self.source_connector,
+                target_connector=self.target_connector,
+                bands=self.bands,
+            )
+        return []
+
     def _filter_out_previously_cut_rasters(
         self, vector_name: str | int, src_rasters_containing_vector: set[str]
     ) -> list[str]:
@@ -31,6 +31,8 @@ def get_cutter_rasters_around_every_vector(
     target_raster_count: int = 1,
     bands: dict | None = None,
     random_seed: int = 10,
+    n_workers: int = 1,
+    schedule: Literal["vector", "raster"] = "vector",
 ) -> DSCutterIterOverVectors:
     """Return dataset cutter that creates cutouts around vector features.
 
@@ -53,6 +55,11 @@ def get_cutter_rasters_around_every_vector(
         mode: On. Defaults to "random".
         bands: bands dict. Defaults to None.
         random_seed: random seed. Defaults to 10.
+        n_workers: number of worker processes writing the new rasters.
+            Defaults to 1.
+        schedule: "vector" to cut vector by vector or "raster" to cut source
+            raster by source raster, see DSCutterIterOverVectors. Defaults to
+            "vector".
 
     Returns:
         DSCutterIterOverVectors: dataset cutter
@@ -79,4 +86,6 @@ def get_cutter_rasters_around_every_vector(
         raster_selector=random_raster_selector,
         raster_cutter=small_rasters_around_vectors_cutter,
         bands=bands,
+        n_workers=n_workers,
+        schedule=schedule,
     )
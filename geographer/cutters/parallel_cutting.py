@@ -0,0 +1,113 @@
+"""Run single raster cutters in worker processes.
+
+Used by the dataset cutters' parallel modes: the workers do the GeoTiff I/O
+(and possibly compute the windows), the calling process merges the raster
+info dicts into the target connector.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from geographer.connector import Connector
+from geographer.cutters.single_raster_cutter_base import SingleRasterCutter
+
+# state of a worker process, set by _init_worker
+_worker_state: dict[str, Any] = {}
+
+
+def cutting_executor(
+    n_workers: int,
+    raster_cutter: SingleRasterCutter,
+    source_connector: Connector,
+    target_connector: Connector,
+    new_rasters_dict: dict,
+    bands: dict[str, list[int] | None] | None,
+) -> ProcessPoolExecutor:
+    """Return process pool whose workers can run the raster cutter.
+
+    The arguments are sent to each worker once. The connectors and
+    new_rasters_dict the workers see are snapshots taken when the workers
+    start, i.e. the workers do not see rasters cut after that.
+
+    Args:
+        n_workers: number of worker processes
+        raster_cutter: single raster cutter
+        source_connector: connector of source dataset
+        target_connector: connector of target dataset
+        new_rasters_dict: information about cut rasters not yet appended to
+            target_connector.rasters
+        bands: bands to extract, see DSCreatorFromSourceWithBands
+
+    Returns:
+        process pool executor, to be used with :func:`cut_raster_in_worker`
+        or :func:`make_rasters_in_worker`
+    """
+    # load the source's manifest of raster data files once, not in each worker
+    for raster_data_dir in source_connector.raster_data_dirs:
+        source_connector.raster_data_file_names(raster_data_dir)
+
+    return ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_worker,
+        initargs=(
+            raster_cutter,
+            source_connector,
+            target_connector,
+            new_rasters_dict,
+            bands,
+        ),
+    )
+
+
+def cut_raster_in_worker(raster_cutter_kwargs: dict[str, Any]) -> dict:
+    """Run the worker's raster cutter.
+
+    Args:
+        raster_cutter_kwargs: keyword arguments for the raster cutter in
+            addition to the connectors, new_rasters_dict, and bands, e.g.
+            raster_name.
+
+    Returns:
+        dict returned by the raster cutter
+    """
+    return _worker_state["raster_cutter"](
+        source_connector=_worker_state["source_connector"],
+        target_connector=_worker_state["target_connector"],
+        new_rasters_dict=_worker_state["new_rasters_dict"],
+        bands=_worker_state["bands"],
+        **raster_cutter_kwargs,
+    )
+
+
+def make_rasters_in_worker(new_rasters_kwargs: list[dict[str, Any]]):
+    """Create new rasters (and labels) planned by the worker's raster cutter.
+
+    Args:
+        new_rasters_kwargs: keyword arguments for the raster cutter's
+            _make_new_raster_and_label method as returned by its plan_cut
+            method, one for each new raster
+    """
+    _worker_state["raster_cutter"].make_new_rasters_and_labels(
+        new_rasters_kwargs,
+        source_connector=_worker_state["source_connector"],
+        target_connector=_worker_state["target_connector"],
+        bands=_worker_state["bands"],
+    )
+
+
+def _init_worker(
+    raster_cutter: SingleRasterCutter,
+    source_connector: Connector,
+    target_connector: Connector,
+    new_rasters_dict: dict,
+    bands: dict[str, list[int] | None] | None,
+):
+    _worker_state.update(
+        raster_cutter=raster_cutter,
+        source_connector=source_connector,
+        target_connector=target_connector,
+        new_rasters_dict=new_rasters_dict,
+        bands=bands,
+    )
@@ -5,21 +5,27 @@ from __future__ import annotations
 import logging
 import math
 import random
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Literal, Optional
 
+import numpy as np
 import rasterio as rio
+import shapely
 from affine import Affine
 from pydantic import PrivateAttr
 from rasterio.io import DatasetReader
+from rasterio.transform import rowcol
 from rasterio.windows import Window
 from shapely.geometry import box
 from shapely.geometry.base import BaseGeometry
 
 from geographer.connector import Connector
-from geographer.cutters.single_raster_cutter_base import SingleRasterCutter
+from geographer.cutters.single_raster_cutter_base import (
+    SingleRasterCutter,
+    SourceDatasets,
+)
 from geographer.cutters.type_aliases import RasterSize
-from geographer.utils.utils import transform_shapely_geometry
 
 logger = logging.getLogger(__name__)
 
@@ -165,7 +171,8 @@ class SingleRasterCutterAroundVector(SingleRasterCutter):
                 to rasters containing information about cut rasters not yet appended
                 to target_connector.
             vector_crs_epsg_code: EPSG code of the vector feature crs
-            **kwargs: keyword arguments
+            **kwargs: keyword arguments, need to contain vector_name, optionally
+                source_datasets (open source datasets to reuse)
 
         Returns:
             list of windows, window_transformations, and new raster names
@@ -176,15 +183,18 @@ class SingleRasterCutterAroundVector(SingleRasterCutter):
 
         source_raster_path = source_connector.rasters_dir / source_raster_name
 
-        vector_geom = target_connector.vectors.loc[vector_name, "geometry"]
+        # reuse open dataset if possible
+        source_datasets: SourceDatasets | None = kwargs.get("source_datasets")
+        if source_datasets is not None:
+            src_context = nullcontext(source_datasets.open(source_raster_path))
+        else:
+            src_context = rio.open(source_raster_path)
 
-        with rio.open(source_raster_path) as src:
+        with src_context as src:
             # transform vector feature from connector's crs to raster source crs
-            transformed_vector_geom = transform_shapely_geometry(
-                vector_geom,
-                from_epsg=source_connector.vectors.crs.to_epsg(),
-                to_epsg=src.crs.to_epsg(),
-            )
+            transformed_vector_geom = target_connector.vector_geoms_in_crs(
+                [vector_name], src.crs.to_epsg()
+            )[0]
 
             # FOR DEBUGGING:
             raster_bbox = box(*src.bounds)
@@ -240,52 +250,98 @@ class SingleRasterCutterAroundVector(SingleRasterCutter):
             )
 
             # The row and col offs and number of rasters in row and col direction define
-            # a grid. Iterate through the grid and accumulate windows, transforms,
-            # and raster_names in a list:
-
-            windows_transforms_raster_names_single_geom = []
-
-            for raster_row in range(num_small_rasters_in_row_direction):
-                for raster_col in range(num_small_rasters_in_col_direction):
-                    # Define the square window with the calculated offsets.
-                    window = rio.windows.Window(
-                        col_off=col_off + new_raster_size_cols * raster_col,
-                        row_off=row_off + new_raster_size_rows * raster_row,
-                        width=new_raster_size_cols,
-                        height=new_raster_size_rows,
-                    )
-
-                    # Remember the transform for the new geotiff.
-                    window_transform = src.window_transform(window)
-
-                    # Generate new raster name.
-                    raster_name_no_extension = Path(source_raster_name).stem
-
-                    # (if there is only one window in the grid)
-                    if (
-                        num_small_rasters_in_row_direction == 1
-                        and num_small_rasters_in_col_direction == 1
-                    ):
-                        new_raster_name = (
-                            f"{raster_name_no_extension}_{vector_name}.tif"
-                        )
-                    else:
-                        new_raster_name = (
-                            f"{raster_name_no_extension}_{vector_name}_"
-                            f"{raster_row}_{raster_col}.tif"
-                        )
-
-                    window_bounding_rectangle = box(
-                        *rio.windows.bounds(window, src.transform)
-                    )
-
-                    # append window if it intersects the vector feature
-                    if window_bounding_rectangle.intersects(transformed_vector_geom):
-                        windows_transforms_raster_names_single_geom.append(
-                            (window, window_transform, new_raster_name)
-                        )
-
-            return windows_transforms_raster_names_single_geom
+            # a grid. Compute the windows, transforms, and raster_names of the grid
+            # cells intersecting the vector feature:
+            return self._get_grid_windows_transforms_raster_names(
+                raster=src,
+                source_raster_name=source_raster_name,
+                vector_name=vector_name,
+                transformed_vector_geom=transformed_vector_geom,
+                row_off=row_off,
+                col_off=col_off,
+                new_raster_size_rows=new_raster_size_rows,
+                new_raster_size_cols=new_raster_size_cols,
+                num_small_rasters_in_row_direction=num_small_rasters_in_row_direction,
+                num_small_rasters_in_col_direction=num_small_rasters_in_col_direction,
+            )
+
+    def _get_grid_windows_transforms_raster_names(
+        self,
+        raster: DatasetReader,
+        source_raster_name: str,
+        vector_name: str | int,
+        transformed_vector_geom: BaseGeometry,
+        row_off: int,
+        col_off: int,
+        new_raster_size_rows: float,
+        new_raster_size_cols: float,
+        num_small_rasters_in_row_direction: int,
+        num_small_rasters_in_col_direction: int,
+    ) -> list[tuple[Window, Affine, str]]:
+        """Return windows, transforms, and names of grid cells meeting vector feature.
+
+        The grid cells are processed as arrays.
+        """
+        raster_rows, raster_cols = np.meshgrid(
+            np.arange(num_small_rasters_in_row_direction),
+            np.arange(num_small_rasters_in_col_direction),
+            indexing="ij",
+        )
+        raster_rows, raster_cols = raster_rows.ravel(), raster_cols.ravel()
+        row_offs = row_off + new_raster_size_rows * raster_rows
+        col_offs = col_off + new_raster_size_cols * raster_cols
+
+        # Bounds of the windows, as in rio.windows.bounds ...
+        transform = raster.transform
+        lefts, bottoms = transform * (col_offs, row_offs + new_raster_size_rows)
+        rights, tops = transform * (col_offs + new_raster_size_cols, row_offs)
+
+        # ... to keep only windows intersecting the vector feature.
+        shapely.prepare(transformed_vector_geom)
+        intersects = shapely.intersects(
+            shapely.box(lefts, bottoms, rights, tops), transformed_vector_geom
+        )
+
+        # Window transforms, with the same arithmetic as rio.windows.transform.
+        xs, ys = transform * (col_offs, row_offs)
+        window_transform_cs = transform.c + (xs - transform.c)
+        window_transform_fs = transform.f + (ys - transform.f)
+
+        # Generate new raster names.
+        raster_name_no_extension = Path(source_raster_name).stem
+        only_one_window = (
+            num_small_rasters_in_row_direction == 1
+            and num_small_rasters_in_col_direction == 1
+        )
+
+        windows_transforms_raster_names_single_geom = []
+        for idx in np.flatnonzero(intersects):
+            window = Window(
+                col_off=col_offs[idx].item(),
+                row_off=row_offs[idx].item(),
+                width=new_raster_size_cols,
+                height=new_raster_size_rows,
+            )
+            window_transform = Affine(
+                transform.a,
+                transform.b,
+                window_transform_cs[idx].item(),
+                transform.d,
+                transform.e,
+                window_transform_fs[idx].item(),
+            )
+            if only_one_window:
+                new_raster_name = f"{raster_name_no_extension}_{vector_name}.tif"
+            else:
+                new_raster_name = (
+                    f"{raster_name_no_extension}_{vector_name}_"
+                    f"{raster_rows[idx]}_{raster_cols[idx]}.tif"
+                )
+            windows_transforms_raster_names_single_geom.append(
+                (window, window_transform, new_raster_name)
+            )
+
+        return windows_transforms_raster_names_single_geom
 
     def _get_min_max_row_col(
         self, raster: DatasetReader, transformed_vector_geom: BaseGeometry
@@ -294,27 +350,22 @@ class SingleRasterCutterAroundVector(SingleRasterCutter):
 
         Bounds returned are min_row, max_row, min_col, max_col.
         """
-        # Find min and max row of rectangular envelope of vector feature
-        list_of_rectangle_corner_coords = list(
-            transformed_vector_geom.envelope.exterior.coords
-        )[:5]
-        list_of_enveloping_rectangle_row_col_pairs = list(
-            map(lambda pair: raster.index(*pair), list_of_rectangle_corner_coords)
+        # Find min and max row and col of the corners of the rectangular
+        # envelope of vector feature
+        minx, miny, maxx, maxy = transformed_vector_geom.bounds
+        rows, cols = rowcol(
+            raster.transform,
+            np.array([minx, maxx, maxx, minx]),
+            np.array([miny, miny, maxy, maxy]),
         )
+        rows, cols = np.asarray(rows), np.asarray(cols)
 
-        tuple_of_rows_of_rectangle_corners = tuple(
-            zip(*list_of_enveloping_rectangle_row_col_pairs)
-        )[0]
-        tuple_of_cols_of_rectangle_corners = tuple(
-            zip(*list_of_enveloping_rectangle_row_col_pairs)
-        )[1]
-
-        min_row = min(*tuple_of_rows_of_rectangle_corners)
-        max_row = max(*tuple_of_rows_of_rectangle_corners)
-        min_col = min(*tuple_of_cols_of_rectangle_corners)
-        max_col = max(*tuple_of_cols_of_rectangle_corners)
-
-        return min_row, max_row, min_col, max_col
+        return (
+            int(rows.min()),
+            int(rows.max()),
+            int(cols.min()),
+            int(cols.max()),
+        )
 
     def _get_grid_row_col_offsets_num_windows_row_col_direction(
         self,
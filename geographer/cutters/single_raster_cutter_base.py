@@ -4,13 +4,17 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 
+import numpy as np
 import rasterio as rio
 from affine import Affine
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from rasterio.crs import CRS
+from rasterio.io import DatasetReader
+from rasterio.transform import array_bounds
 from rasterio.warp import transform_bounds
 from rasterio.windows import Window
 from shapely.geometry import box
@@ -18,13 +22,74 @@ from shapely.geometry import box
 from geographer.connector import Connector
 from geographer.global_constants import RASTER_IMGS_INDEX_NAME
 from geographer.raster_bands_getter_mixin import RasterBandsGetterMixIn
+from geographer.utils.geotiff_profile import GeoTiffProfile
+from geographer.utils.vrt import VRT_SUFFIX, write_window_vrt
 
 logger = logging.getLogger(__name__)
 
 
+class SourceDatasets:
+    """Source rasters (or labels etc.) kept open while cutting several windows.
+
+    Use as a context manager, the datasets are closed on exit.
+    """
+
+    def __init__(self, max_open: int | None = None) -> None:
+        """Initialize SourceDatasets.
+
+        Args:
+            max_open: maximum number of datasets kept open. If more are
+                opened, the least recently used ones are closed. Defaults to
+                None, i.e. no limit.
+        """
+        self.max_open = max_open
+        self._datasets: OrderedDict[Path, DatasetReader] = OrderedDict()
+
+    def open(self, raster_path: Path) -> DatasetReader:
+        """Return dataset for raster path, opening it if necessary."""
+        if raster_path in self._datasets:
+            self._datasets.move_to_end(raster_path)
+        else:
+            self._datasets[raster_path] = rio.open(raster_path)
+            if self.max_open is not None and len(self._datasets) > self.max_open:
+                _, dataset = self._datasets.popitem(last=False)
+                dataset.close()
+        return self._datasets[raster_path]
+
+    def close(self):
+        """Close all datasets."""
+        while self._datasets:
+            _, dataset = self._datasets.popitem()
+            dataset.close()
+
+    def __enter__(self) -> SourceDatasets:
+        """Enter context."""
+        return self
+
+    def __exit__(self, *args: Any):
+        """Exit context, close all datasets."""
+        self.close()
+
+
 class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
     """Base class for SingleRasterCUtter."""
 
+    output_profile: GeoTiffProfile = Field(
+        default_factory=GeoTiffProfile,
+        description="Creation profile for the new rasters.",
+    )
+    labels_output_profile: Optional[GeoTiffProfile] = Field(
+        default=None,
+        description="Creation profile for the new labels (and other raster data "
+        "besides the rasters). Defaults to None, i.e. use output_profile.",
+    )
+    vrt: bool = Field(
+        default=False,
+        description="If True, instead of GeoTiffs create VRTs referencing windows "
+        "of the source rasters (and labels etc). The VRTs can be turned into "
+        "GeoTiffs using geographer.utils.vrt.materialize_vrts.",
+    )
+
     @abstractmethod
     def _get_windows_transforms_raster_names(
         self,
@@ -97,38 +162,107 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
             new_rasters_dict arguments together as the actual the target connector
             argument.
         """
-        # dict to accumulate information about the newly created rasters
-        rasters_from_cut_dict = {
-            index_or_col_name: []
-            for index_or_col_name in [RASTER_IMGS_INDEX_NAME]
-            + list(source_connector.rasters.columns)
-        }
+        # open the source raster (and labels etc) once for planning and
+        # cutting all windows
+        with SourceDatasets() as source_datasets:
+            rasters_from_cut_dict, new_rasters_kwargs = self.plan_cut(
+                raster_name=raster_name,
+                source_connector=source_connector,
+                target_connector=target_connector,
+                new_rasters_dict=new_rasters_dict,
+                source_datasets=source_datasets,
+                **kwargs,
+            )
+            for new_raster_kwargs in new_rasters_kwargs:
+                self._make_new_raster_and_label(
+                    source_connector=source_connector,
+                    target_connector=target_connector,
+                    bands=bands,
+                    source_datasets=source_datasets,
+                    **new_raster_kwargs,
+                )
 
-        windows_transforms_raster_names = self._get_windows_transforms_raster_names(
+        return rasters_from_cut_dict
+
+    def plan_cut(
+        self,
+        raster_name: str,
+        source_connector: Connector,
+        target_connector: Connector | None = None,
+        new_rasters_dict: dict | None = None,
+        source_datasets: SourceDatasets | None = None,
+        **kwargs: Any,
+    ) -> tuple[dict, list[dict]]:
+        """Plan cutting new rasters without writing them.
+
+        Like __call__, but instead of creating the new rasters (and labels)
+        returns the arguments needed to create them later, possibly in another
+        process, using :meth:`_make_new_raster_and_label`.
+
+        Args:
+            raster_name: name of raster in source dataset to be cut.
+            source_connector: connector of source dataset
+            target_connector: connector of target dataset
+            new_rasters_dict: see __call__
+            source_datasets: open source datasets to reuse. Defaults to None.
+            kwargs: optional keyword arguments for _get_windows_transforms_raster_names
+
+        Returns:
+            the dict __call__ would return and a list of keyword arguments for
+            _make_new_raster_and_label (without the connectors and bands), one
+            for each new raster
+        """
+        if source_datasets is None:
+            with SourceDatasets() as source_datasets:
+                return self.plan_cut(
+                    raster_name=raster_name,
+                    source_connector=source_connector,
+                    target_connector=target_connector,
+                    new_rasters_dict=new_rasters_dict,
+                    source_datasets=source_datasets,
+                    **kwargs,
+                )
+
+        windows_transforms_raster_names = self._plan_windows(
             source_raster_name=raster_name,
             source_connector=source_connector,
             target_connector=target_connector,
             new_rasters_dict=new_rasters_dict,
+            source_datasets=source_datasets,
             **kwargs,
         )
 
+        source_raster_path = source_connector.rasters_dir / raster_name
+        raster_crs = source_datasets.open(source_raster_path).crs
+
+        # dict to accumulate information about the newly created rasters
+        rasters_from_cut_dict = {
+            index_or_col_name: []
+            for index_or_col_name in [RASTER_IMGS_INDEX_NAME]
+            + list(source_connector.rasters.columns)
+        }
+        new_rasters_kwargs = []
+
         for (
             window,
             window_transform,
             new_raster_name,
         ) in windows_transforms_raster_names:
-            # Make new raster and label in target dataset ...
-            raster_bounds_in_raster_crs, raster_crs = self._make_new_raster_and_label(
-                new_raster_name=new_raster_name,
-                source_raster_name=raster_name,
-                source_connector=source_connector,
-                target_connector=target_connector,
-                window=window,
-                window_transform=window_transform,
-                bands=bands,
+            # the arguments to make the new raster and label later ...
+            new_rasters_kwargs.append(
+                dict(
+                    new_raster_name=new_raster_name,
+                    source_raster_name=raster_name,
+                    window=window,
+                    window_transform=window_transform,
+                )
             )
 
-            # ... gather all the information about the raster in a dict ...
+            # ... gather all the information about the raster in a dict, using
+            # the bounds the new raster will have once written ...
+            raster_bounds_in_raster_crs = array_bounds(
+                int(window.height), int(window.width), window_transform
+            )
             single_new_raster_info_dict = self._make_raster_info_dict(
                 new_raster_name=new_raster_name,
                 source_raster_name=raster_name,
@@ -136,12 +270,40 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
                 raster_bounds_in_raster_crs=raster_bounds_in_raster_crs,
                 raster_crs=raster_crs,
             )
-
             # ... and accumulate that information.
             for key in rasters_from_cut_dict.keys():
                 rasters_from_cut_dict[key].append(single_new_raster_info_dict[key])
 
-        return rasters_from_cut_dict
+        return rasters_from_cut_dict, new_rasters_kwargs
+
+    def _plan_windows(
+        self,
+        source_raster_name: str,
+        source_connector: Connector,
+        target_connector: Connector | None = None,
+        new_rasters_dict: dict | None = None,
+        **kwargs: Any,
+    ) -> list[Tuple[Window, Affine, str]]:
+        """Return windows, window transforms, and new raster names.
+
+        Like _get_windows_transforms_raster_names, but in vrt mode the new
+        raster names have suffix .vrt.
+        """
+        windows_transforms_raster_names = self._get_windows_transforms_raster_names(
+            source_raster_name=source_raster_name,
+            source_connector=source_connector,
+            target_connector=target_connector,
+            new_rasters_dict=new_rasters_dict,
+            **kwargs,
+        )
+        if self.vrt:
+            windows_transforms_raster_names = [
+                (window, window_transform, Path(new_raster_name).stem + VRT_SUFFIX)
+                for window, window_transform, new_raster_name in (
+                    windows_transforms_raster_names
+                )
+            ]
+        return windows_transforms_raster_names
 
     def _make_raster_info_dict(
         self,
@@ -194,6 +356,34 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
 
         return single_new_raster_info_dict
 
+    def make_new_rasters_and_labels(
+        self,
+        new_rasters_kwargs: list[dict],
+        source_connector: Connector,
+        target_connector: Connector,
+        bands: dict[str, list[int] | None] | None,
+    ):
+        """Make new rasters and labels planned by :meth:`plan_cut`.
+
+        The source rasters (and labels etc) are opened once for all new rasters.
+
+        Args:
+            new_rasters_kwargs: keyword arguments for _make_new_raster_and_label
+                as returned by plan_cut, one for each new raster
+            source_connector: connector of source dataset
+            target_connector: connector of target dataset
+            bands: bands to extract, see DSCreatorFromSourceWithBands
+        """
+        with SourceDatasets() as source_datasets:
+            for kwargs in new_rasters_kwargs:
+                self._make_new_raster_and_label(
+                    source_connector=source_connector,
+                    target_connector=target_connector,
+                    bands=bands,
+                    source_datasets=source_datasets,
+                    **kwargs,
+                )
+
     def _make_new_raster_and_label(
         self,
         new_raster_name: str,
@@ -203,6 +393,7 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
         window: Window,
         window_transform: Affine,
         bands: dict[str, list[int] | None] | None,
+        source_datasets: SourceDatasets | None = None,
     ) -> Tuple[Tuple[float, float, float, float], CRS]:
         """Make a new raster and label.
 
@@ -214,10 +405,25 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
             source_raster_name: name of source raster
             window: window
             window_transform: window transform
+            source_datasets: open source datasets to reuse. If None, the source
+                rasters are opened (and closed) just for this raster.
 
         Returns:
             tuple of bounds (in raster CRS) and CRS of new raster
         """
+        if source_datasets is None:
+            with SourceDatasets() as source_datasets:
+                return self._make_new_raster_and_label(
+                    new_raster_name=new_raster_name,
+                    source_raster_name=source_raster_name,
+                    source_connector=source_connector,
+                    target_connector=target_connector,
+                    window=window,
+                    window_transform=window_transform,
+                    bands=bands,
+                    source_datasets=source_datasets,
+                )
+
         for count, (source_rasters_dir, target_rasters_dir) in enumerate(
             zip(source_connector.raster_data_dirs, target_connector.raster_data_dirs)
         ):
@@ -225,21 +431,36 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
             dst_raster_path = target_rasters_dir / new_raster_name
 
             if (
-                not source_raster_path.is_file() and count > 0
+                not source_connector.raster_data_file_exists(source_raster_path)
+                and count > 0
             ):  # count == 0 corresponds to rasters_dir
                 continue
             else:
-                raster_bands = self._get_bands_for_raster(bands, source_raster_path)
-
-                # write raster window to destination raster geotif
-                bounds_in_raster_crs, crs = self._write_window_to_geotif(
-                    source_raster_path,
-                    dst_raster_path,
-                    raster_bands,
-                    window,
-                    window_transform,
+                src = source_datasets.open(source_raster_path)
+                raster_bands = self._get_bands_for_raster(
+                    bands, source_raster_path, src
                 )
 
+                # write raster window to destination raster geotif (or vrt)
+                if self.vrt:
+                    bounds_in_raster_crs, crs = write_window_vrt(
+                        src,
+                        dst_raster_path,
+                        raster_bands,
+                        window,
+                        window_transform,
+                    )
+                else:
+                    bounds_in_raster_crs, crs = self._write_window_to_geotif(
+                        source_raster_path,
+                        dst_raster_path,
+                        raster_bands,
+                        window,
+                        window_transform,
+                        src=src,
+                        output_profile=self._get_output_profile(count),
+                    )
+
             # make sure all rasters/labels/masks have same bounds and crs
             if count == 0:
                 raster_bounds_in_raster_crs, raster_crs = bounds_in_raster_crs, crs
@@ -260,6 +481,8 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
         raster_bands: list[int],
         window: Window,
         window_transform: Affine,
+        src: DatasetReader | None = None,
+        output_profile: GeoTiffProfile | None = None,
     ) -> Tuple[Tuple[float, float, float, float], CRS]:
         """Write window from source GeoTiff to new GeoTiff.
 
@@ -269,31 +492,83 @@ class SingleRasterCutter(ABC, BaseModel, RasterBandsGetterMixIn):
             raster_bands: bands to extract from source GeoTiff
             window: window to cut out from source GeoTiff
             window_transform: window transform of window
+            src: open dataset of source GeoTiff. If None, the source GeoTiff
+                will be opened.
+            output_profile: creation profile of new GeoTiff. Defaults to None,
+                i.e. output_profile.
 
         Returns:
             bounds (in raster CRS) and CRS of new raster
         """
-        # Open source ...
-        with rio.open(src_raster_path) as src:
-            # and destination ...
-            Path(dst_raster_path).parent.mkdir(exist_ok=True, parents=True)
-            with rio.open(
-                Path(dst_raster_path),
-                "w",
-                driver="GTiff",
-                height=window.height,
-                width=window.width,
-                count=len(raster_bands),
-                dtype=src.profile["dtype"],
-                crs=src.crs,
-                transform=window_transform,
-            ) as dst:
-                # ... and go through the bands.
-                for target_band, source_band in enumerate(raster_bands, start=1):
-                    # Read window for that band from source ...
-                    new_raster_band_raster = src.read(source_band, window=window)
-
-                    # ... write to new geotiff.
-                    dst.write(new_raster_band_raster, target_band)
+        if src is None:
+            with rio.open(src_raster_path) as src:
+                return self._write_window_to_geotif(
+                    src_raster_path,
+                    dst_raster_path,
+                    raster_bands,
+                    window,
+                    window_transform,
+                    src=src,
+                    output_profile=output_profile,
+                )
+
+        # Read window for all bands from source ...
+        new_raster = src.read(raster_bands, window=window)
+
+        # ... and write to new geotiff.
+        return self._write_array_to_geotif(
+            new_raster, dst_raster_path, src, window_transform, output_profile
+        )
+
+    def _write_array_to_geotif(
+        self,
+        new_raster: np.ndarray,
+        dst_raster_path: Path | str,
+        src: DatasetReader,
+        window_transform: Affine,
+        output_profile: GeoTiffProfile | None = None,
+    ) -> Tuple[Tuple[float, float, float, float], CRS]:
+        """Write array of shape (bands, rows, cols) cut from source to new GeoTiff.
+
+        Args:
+            new_raster: array to write
+            dst_raster_path: path to GeoTiff to be created
+            src: dataset of source GeoTiff the array was read from
+            window_transform: window transform of new GeoTiff
+            output_profile: creation profile of new GeoTiff. Defaults to None,
+                i.e. output_profile.
+
+        Returns:
+            bounds (in raster CRS) and CRS of new raster
+        """
+        if output_profile is None:
+            output_profile = self.output_profile
+
+        Path(dst_raster_path).parent.mkdir(exist_ok=True, parents=True)
+        with output_profile.open(
+            Path(dst_raster_path),
+            "w",
+            height=new_raster.shape[1],
+            width=new_raster.shape[2],
+            count=new_raster.shape[0],
+            dtype=src.profile["dtype"],
+            crs=src.crs,
+            transform=window_transform,
+        ) as dst:
+            dst.write(new_raster)
 
         return dst.bounds, dst.crs
+
+    def _get_output_profile(self, raster_data_dir_index: int) -> GeoTiffProfile:
+        """Return creation profile for a raster data dir.
+
+        Args:
+            raster_data_dir_index: index of raster data dir in the connector's
+                raster_data_dirs, 0 corresponds to rasters_dir
+
+        Returns:
+            creation profile
+        """
+        if raster_data_dir_index == 0 or self.labels_output_profile is None:
+            return self.output_profile
+        return self.labels_output_profile
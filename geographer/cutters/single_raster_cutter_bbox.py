@@ -10,12 +10,14 @@ import geopandas as gpd
 import rasterio as rio
 from geopandas import GeoDataFrame
 from pydantic import PrivateAttr, field_validator
+from rasterio.warp import transform_bounds
 from rasterio.windows import Window, from_bounds
 from shapely.geometry import box
 
 from geographer.connector import Connector
 from geographer.cutters.single_raster_cutter_base import SingleRasterCutter
 from geographer.cutters.type_aliases import RasterSize
+from geographer.utils.spatial_index import SpatialIndex
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,7 @@ class SingleRasterCutterFromBBoxes(SingleRasterCutter):
     bbox_geojson_path: Path
 
     _bboxes_df: GeoDataFrame = PrivateAttr()
+    _bboxes_spatial_index: SpatialIndex = PrivateAttr()
 
     def __init__(self, **data) -> None:
         """Initialize a SingleRasterCutterFromBBoxes.
@@ -48,6 +51,9 @@ class SingleRasterCutterFromBBoxes(SingleRasterCutter):
         """
         super().__init__(**data)
         self._bboxes_df = gpd.read_file(self.bbox_geojson_path)
+        self._bboxes_spatial_index = SpatialIndex(
+            range(len(self._bboxes_df)), self._bboxes_df.geometry.values
+        )
 
     @field_validator("bbox_geojson_path")
     def path_points_to_geojson(cls, value: Path):
@@ -114,7 +120,18 @@ class SingleRasterCutterFromBBoxes(SingleRasterCutter):
 
         with rio.open(source_raster_path) as src:
             raster_bounds = box(*src.bounds)
-            bounding_boxes = self.bounding_boxes.to_crs(src.crs)
+
+            # Only reproject and test the bboxes whose bounding boxes
+            # overlap the raster ...
+            candidate_positions = sorted(
+                self._bboxes_spatial_index.query_bbox(
+                    transform_bounds(src.crs, self._bboxes_df.crs, *src.bounds),
+                    predicate=None,
+                )
+            )
+            bounding_boxes = self._bboxes_df.iloc[candidate_positions].to_crs(src.crs)
+
+            # ... and keep those contained in the raster.
             bounding_boxes = bounding_boxes.loc[
                 bounding_boxes.geometry.within(raster_bounds)
             ]
@@ -3,25 +3,40 @@
 from __future__ import annotations
 
 import logging
+import math
+from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import rasterio as rio
 from affine import Affine
 from pydantic import field_validator
+from rasterio.crs import CRS
+from rasterio.io import DatasetReader
 from rasterio.windows import Window
 
 from geographer.connector import Connector
 from geographer.cutters.single_raster_cutter_base import SingleRasterCutter
 from geographer.cutters.type_aliases import RasterSize
+from geographer.global_constants import RASTER_IMGS_INDEX_NAME
+from geographer.utils.geotiff_profile import GeoTiffProfile
 
 logger = logging.getLogger(__name__)
 
 
 class SingleRasterCutterToGrid(SingleRasterCutter):
-    """SingleRasterCutter that cuts a raster into a grid of rasters."""
+    """SingleRasterCutter that cuts a raster into a grid of rasters.
+
+    If streaming is True, each row of the grid is cut from a strip read
+    from the source in one sequential pass. The strips are aligned to the
+    source's blocks and consecutive strips share the blocks straddling
+    grid rows, so each source pixel is decoded once and peak memory is
+    about one row of the grid. Streaming is not used in vrt mode.
+    """
 
     new_raster_size: RasterSize
+    streaming: bool = False
 
     @field_validator("new_raster_size")
     def new_raster_size_type_correctness(cls, value: RasterSize) -> RasterSize:
@@ -113,3 +128,189 @@ class SingleRasterCutterToGrid(SingleRasterCutter):
                 )
 
         return windows_transforms_raster_names
+
+    def __call__(
+        self,
+        raster_name: str,
+        source_connector: Connector,
+        target_connector: Connector | None = None,
+        new_rasters_dict: dict | None = None,
+        bands: dict[str, list[int] | None] | None = None,
+        **kwargs: Any,
+    ) -> dict:
+        """Cut new rasters and return return_dict.
+
+        See :meth:`SingleRasterCutter.__call__`.
+        """
+        if not self.streaming or self.vrt:
+            return super().__call__(
+                raster_name=raster_name,
+                source_connector=source_connector,
+                target_connector=target_connector,
+                new_rasters_dict=new_rasters_dict,
+                bands=bands,
+                **kwargs,
+            )
+
+        windows_transforms_raster_names = self._plan_windows(
+            source_raster_name=raster_name,
+            source_connector=source_connector,
+            target_connector=target_connector,
+            new_rasters_dict=new_rasters_dict,
+            **kwargs,
+        )
+
+        # bounds and crs of new rasters, by new raster name
+        new_rasters_bounds_crs: dict[
+            str, tuple[tuple[float, float, float, float], CRS]
+        ] = {}
+
+        for count, (source_rasters_dir, target_rasters_dir) in enumerate(
+            zip(source_connector.raster_data_dirs, target_connector.raster_data_dirs)
+        ):
+            source_raster_path = source_rasters_dir / raster_name
+            if (
+                not source_connector.raster_data_file_exists(source_raster_path)
+                and count > 0
+            ):  # count == 0 corresponds to rasters_dir
+                continue
+
+            with rio.open(source_raster_path) as src:
+                raster_bands = self._get_bands_for_raster(
+                    bands, source_raster_path, src
+                )
+                for (
+                    new_raster_name,
+                    bounds_in_raster_crs,
+                    crs,
+                ) in self._stream_grid_to_geotifs(
+                    src,
+                    raster_bands,
+                    windows_transforms_raster_names,
+                    target_rasters_dir,
+                    self._get_output_profile(count),
+                ):
+                    # make sure all rasters/labels/masks have same bounds and crs
+                    if count == 0:
+                        new_rasters_bounds_crs[new_raster_name] = (
+                            bounds_in_raster_crs,
+                            crs,
+                        )
+                    else:
+                        assert (
+                            crs == new_rasters_bounds_crs[new_raster_name][1]
+                        ), f"new raster and {target_rasters_dir.name} crs disagree!"
+                        assert (
+                            bounds_in_raster_crs
+                            == new_rasters_bounds_crs[new_raster_name][0]
+                        ), f"new raster and {target_rasters_dir.name} bounds disagree"
+
+        # accumulate information about the new rasters in the same
+        # order as the non-streaming __call__
+        rasters_from_cut_dict = {
+            index_or_col_name: []
+            for index_or_col_name in [RASTER_IMGS_INDEX_NAME]
+            + list(source_connector.rasters.columns)
+        }
+        for _, _, new_raster_name in windows_transforms_raster_names:
+            raster_bounds_in_raster_crs, raster_crs = new_rasters_bounds_crs[
+                new_raster_name
+            ]
+            single_new_raster_info_dict = self._make_raster_info_dict(
+                new_raster_name=new_raster_name,
+                source_raster_name=raster_name,
+                source_connector=source_connector,
+                raster_bounds_in_raster_crs=raster_bounds_in_raster_crs,
+                raster_crs=raster_crs,
+            )
+            for key in rasters_from_cut_dict.keys():
+                rasters_from_cut_dict[key].append(single_new_raster_info_dict[key])
+
+        return rasters_from_cut_dict
+
+    def _stream_grid_to_geotifs(
+        self,
+        src: DatasetReader,
+        raster_bands: list[int],
+        windows_transforms_raster_names: list[tuple[Window, Affine, str]],
+        target_rasters_dir: Path,
+        output_profile: GeoTiffProfile,
+    ):
+        """Write grid of windows to GeoTiffs reading the source row by row.
+
+        Args:
+            src: source dataset
+            raster_bands: bands to extract from source
+            windows_transforms_raster_names: grid of windows, window transforms
+                and new raster names
+            target_rasters_dir: directory to write the new GeoTiffs to
+            output_profile: creation profile of the new GeoTiffs
+
+        Yields:
+            new raster name, bounds (in raster CRS), and CRS of each new raster
+        """
+        grid_rows: dict[int, list[tuple[Window, Affine, str]]] = defaultdict(list)
+        for window, window_transform, new_raster_name in (
+            windows_transforms_raster_names
+        ):
+            grid_rows[int(window.row_off)].append(
+                (window, window_transform, new_raster_name)
+            )
+        if not grid_rows:
+            return
+
+        col_off = min(
+            int(window.col_off) for window, _, _ in windows_transforms_raster_names
+        )
+        col_end = max(
+            int(window.col_off + window.width)
+            for window, _, _ in windows_transforms_raster_names
+        )
+        block_height = src.block_shapes[0][0]
+
+        # rows strip_row_off, ..., strip_row_off + strip.shape[1] - 1 of source
+        strip = np.empty(
+            (len(raster_bands), 0, col_end - col_off),
+            dtype=src.profile["dtype"],
+        )
+        strip_row_off = 0
+
+        for row_off in sorted(grid_rows):
+            row_end = row_off + self.new_raster_size_rows
+
+            # drop rows above grid row, ...
+            strip = strip[:, max(0, row_off - strip_row_off) :, :]
+            strip_row_off = max(strip_row_off, row_off)
+
+            # ... read remaining rows up to the next block boundary
+            read_row_off = strip_row_off + strip.shape[1]
+            read_row_end = min(
+                src.height, math.ceil(row_end / block_height) * block_height
+            )
+            if read_row_end > read_row_off:
+                new_rows = src.read(
+                    raster_bands,
+                    window=Window(
+                        col_off,
+                        read_row_off,
+                        width=col_end - col_off,
+                        height=read_row_end - read_row_off,
+                    ),
+                )
+                strip = np.concatenate([strip, new_rows], axis=1)
+
+            for window, window_transform, new_raster_name in grid_rows[row_off]:
+                window_col_off = int(window.col_off) - col_off
+                new_raster = strip[
+                    :,
+                    row_off - strip_row_off : row_end - strip_row_off,
+                    window_col_off : window_col_off + int(window.width),
+                ]
+                bounds_in_raster_crs, crs = self._write_array_to_geotif(
+                    new_raster,
+                    target_rasters_dir / new_raster_name,
+                    src,
+                    window_transform,
+                    output_profile,
+                )
+                yield new_raster_name, bounds_in_raster_crs, crs
@@ -213,6 +213,7 @@ class RasterDownloaderForVectors(BaseModel, SaveAndLoadBaseModelMixIn):
                 except NoRastersForVectorFoundError as exc:
                     # ... in which case we save it in connector.vectors, ...
                     connector.vectors.loc[vector_name, "download_exception"] = repr(exc)
+                    connector.mark_rows_changed("vectors", [vector_name])
 
                     # ... log a warning, ...
                     log.warning(exc, exc_info=True)
@@ -223,6 +224,7 @@ class RasterDownloaderForVectors(BaseModel, SaveAndLoadBaseModelMixIn):
                 # ... or a download error occured, ...
                 except RasterDownloadError as exc:
                     connector.vectors.loc[vector_name, "download_exception"] = repr(exc)
+                    connector.mark_rows_changed("vectors", [vector_name])
                     log.warning(exc, exc_info=True)
 
                 # ... or downloader_for_single_vector tried downloading a previously
@@ -277,18 +279,24 @@ class RasterDownloaderForVectors(BaseModel, SaveAndLoadBaseModelMixIn):
                             # list_raster_info_dicts, too).
                             raster_info_dict.update(single_raster_processed_return_dict)
 
-                            # Connect the raster: Add a raster vertex to the graph,
-                            # connect to all vectors vertices for which
-                            # the intersection is non-empty and modify
-                            # connector.vectors where necessary ...
-                            connector._add_raster_to_graph_modify_vectors(
-                                raster_name=raster_name,
-                                raster_bounding_rectangle=raster_info_dict["geometry"],
-                            )
-
                             # Finally, remember we downloaded the raster.
                             previously_downloaded_rasters_set.add(raster_name)
 
+                        # Connect the rasters: Add raster vertices to the graph,
+                        # connect to all vectors vertices for which
+                        # the intersection is non-empty and modify
+                        # connector.vectors where necessary.
+                        connector._add_rasters_to_graph_modify_vectors(
+                            raster_names=[
+                                raster_info_dict["raster_name"]
+                                for raster_info_dict in list_raster_info_dicts
+                            ],
+                            raster_bounding_rectangles=[
+                                raster_info_dict["geometry"]
+                                for raster_info_dict in list_raster_info_dicts
+                            ],
+                        )
+
                         # update new_raster_dicts_list
                         new_raster_dicts_list += list_raster_info_dicts
 
@@ -1,3 +1,7 @@
 """Code for bipartite graphs used by the associator."""
 
 from geographer.graph.bipartite_graph import BipartiteGraph, empty_bipartite_graph
+from geographer.graph.csr_bipartite_graph import (
+    CSRBipartiteGraph,
+    empty_csr_bipartite_graph,
+)
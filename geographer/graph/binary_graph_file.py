@@ -0,0 +1,275 @@
+"""Binary file format for bipartite graphs.
+
+A compact alternative to serializing the graph dict (see
+:mod:`geographer.graph.bipartite_graph`) as json. The graph is saved as an
+uncompressed numpy ``.npz`` archive containing:
+
+* ``header``: utf-8 encoded json dict with the format version, the vertex
+  colors and the list of distinct edge data values,
+* ``names_data_{i}``, ``names_offsets_{i}``: the utf-8 encoded names of the
+  vertices of the i-th color concatenated and their byte offsets. The id of
+  a vertex is its position in this list,
+* ``indptr_{i}``, ``indices_{i}``, ``codes_{i}``: the edges starting at
+  vertices of the i-th color in compressed sparse row (CSR) format, i.e. the
+  edges starting at the vertex with id ``v`` have opposite vertex ids
+  ``indices_{i}[indptr_{i}[v]:indptr_{i}[v + 1]]`` and edge data
+  ``header["edge_data_values"][codes_{i}[...]]``.
+
+Like in the json format vertex names are saved as strings. Since the archive
+is uncompressed, its arrays can be memory-mapped when loading.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+BINARY_GRAPH_FILE_SUFFIX = ".npz"
+BINARY_GRAPH_FORMAT_VERSION = 1
+
+# size of the fixed part of a zip local file header, see the zip specification
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def is_binary_graph_file(file_path: Path | str) -> bool:
+    """Return True if the file path is that of a binary graph file."""
+    return Path(file_path).suffix == BINARY_GRAPH_FILE_SUFFIX
+
+
+def save_graph_arrays(
+    file_path: Path | str,
+    colors: list[Any],
+    edge_data_values: list[Any],
+    names: list[list[Any]],
+    csr_arrays: list[tuple[np.ndarray, np.ndarray, np.ndarray]],
+):
+    """Save graph in binary format.
+
+    Args:
+        file_path: path to .npz file
+        colors: the two vertex colors
+        edge_data_values: distinct edge data values, the edge codes index into
+            this list. Must be JSON-serializable.
+        names: for each color the list of vertex names, ordered by vertex id
+        csr_arrays: for each color the indptr, indices, and codes CSR arrays
+            of the edges starting at vertices of that color
+    """
+    header = {
+        "format_version": BINARY_GRAPH_FORMAT_VERSION,
+        "colors": list(colors),
+        "edge_data_values": list(edge_data_values),
+    }
+    arrays = {"header": _encode_str(json.dumps(header, ensure_ascii=False))}
+    for color_idx in (0, 1):
+        names_data, names_offsets = _encode_names(names[color_idx])
+        indptr, indices, codes = csr_arrays[color_idx]
+        arrays.update(
+            {
+                f"names_data_{color_idx}": names_data,
+                f"names_offsets_{color_idx}": names_offsets,
+                f"indptr_{color_idx}": np.asarray(indptr, dtype=np.int64),
+                f"indices_{color_idx}": np.asarray(indices, dtype=np.int32),
+                f"codes_{color_idx}": np.asarray(codes, dtype=np.uint8),
+            }
+        )
+
+    # np.savez appends .npz to file names without that suffix
+    with open(file_path, "wb") as file:
+        np.savez(file, **arrays)
+
+
+def load_graph_arrays(file_path: Path | str, mmap: bool = True) -> dict:
+    """Load graph saved in binary format.
+
+    Args:
+        file_path: path to .npz file
+        mmap: whether to memory-map the CSR arrays. Defaults to True.
+
+    Returns:
+        dict with keys "colors", "edge_data_values", "names" (list of vertex
+        names for each color), and "csr_arrays" (indptr, indices, codes
+        arrays for each color)
+    """
+    arrays = _memmap_npz(file_path) if mmap else dict(np.load(file_path))
+    header = json.loads(_decode_str(arrays["header"]))
+    if header["format_version"] != BINARY_GRAPH_FORMAT_VERSION:
+        raise ValueError(
+            f"Unknown binary graph format version: {header['format_version']}"
+        )
+    return {
+        "colors": header["colors"],
+        "edge_data_values": header["edge_data_values"],
+        "names": [
+            _decode_names(
+                arrays[f"names_data_{color_idx}"],
+                arrays[f"names_offsets_{color_idx}"],
+            )
+            for color_idx in (0, 1)
+        ],
+        "csr_arrays": [
+            (
+                arrays[f"indptr_{color_idx}"],
+                arrays[f"indices_{color_idx}"],
+                arrays[f"codes_{color_idx}"],
+            )
+            for color_idx in (0, 1)
+        ],
+    }
+
+
+def graph_dict_to_graph_arrays(graph_dict: dict) -> dict:
+    """Convert graph dict to the arrays saved in the binary format.
+
+    Args:
+        graph_dict: graph dict, see :mod:`geographer.graph.bipartite_graph`
+
+    Returns:
+        dict of the same form as the one returned by :func:`load_graph_arrays`
+    """
+    colors = list(graph_dict)
+    names = [list(graph_dict[color]) for color in colors]
+    ids = [
+        {name: vertex_id for vertex_id, name in enumerate(names_)} for names_ in names
+    ]
+    edge_data_values: list[Any] = []
+    edge_data_codes: dict[Any, int] = {}
+
+    csr_arrays = []
+    for color_idx, color in enumerate(colors):
+        opposite_ids = ids[1 - color_idx]
+        indptr = [0]
+        indices = []
+        codes = []
+        for adjacency in graph_dict[color].values():
+            row = sorted(
+                (opposite_ids[opposite_vertex], edge_data)
+                for opposite_vertex, edge_data in adjacency.items()
+            )
+            for opposite_id, edge_data in row:
+                if edge_data not in edge_data_codes:
+                    edge_data_codes[edge_data] = len(edge_data_values)
+                    edge_data_values.append(edge_data)
+                indices.append(opposite_id)
+                codes.append(edge_data_codes[edge_data])
+            indptr.append(len(indices))
+        csr_arrays.append(
+            (
+                np.array(indptr, dtype=np.int64),
+                np.array(indices, dtype=np.int32),
+                np.array(codes, dtype=np.uint8),
+            )
+        )
+
+    return {
+        "colors": colors,
+        "edge_data_values": edge_data_values,
+        "names": names,
+        "csr_arrays": csr_arrays,
+    }
+
+
+def graph_arrays_to_graph_dict(graph_arrays: dict) -> dict:
+    """Convert arrays saved in the binary format to a graph dict.
+
+    Args:
+        graph_arrays: dict as returned by :func:`load_graph_arrays`
+
+    Returns:
+        graph dict, see :mod:`geographer.graph.bipartite_graph`
+    """
+    edge_data_values = graph_arrays["edge_data_values"]
+    graph_dict = {}
+    for color_idx, color in enumerate(graph_arrays["colors"]):
+        names = graph_arrays["names"][color_idx]
+        opposite_names = graph_arrays["names"][1 - color_idx]
+        indptr, indices, codes = (
+            array.tolist() for array in graph_arrays["csr_arrays"][color_idx]
+        )
+        graph_dict[color] = {
+            name: {
+                opposite_names[opposite_id]: edge_data_values[code]
+                for opposite_id, code in zip(
+                    indices[indptr[vertex_id] : indptr[vertex_id + 1]],
+                    codes[indptr[vertex_id] : indptr[vertex_id + 1]],
+                )
+            }
+            for vertex_id, name in enumerate(names)
+        }
+    return graph_dict
+
+
+def _encode_str(string: str) -> np.ndarray:
+    return np.frombuffer(string.encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_str(array: np.ndarray) -> str:
+    return array.tobytes().decode("utf-8")
+
+
+def _encode_names(names: list[Any]) -> tuple[np.ndarray, np.ndarray]:
+    encoded_names = [str(name).encode("utf-8") for name in names]
+    offsets = np.zeros(len(encoded_names) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(encoded_name) for encoded_name in encoded_names])
+    return np.frombuffer(b"".join(encoded_names), dtype=np.uint8), offsets
+
+
+def _decode_names(names_data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    buffer = names_data.tobytes()
+    offsets = offsets.tolist()
+    return [
+        buffer[start:stop].decode("utf-8")
+        for start, stop in zip(offsets[:-1], offsets[1:])
+    ]
+
+
+def _memmap_npz(file_path: Path | str) -> dict[str, np.ndarray]:
+    """Memory-map the arrays of an uncompressed .npz file.
+
+    np.load ignores mmap_mode for .npz files, but the members of an
+    uncompressed archive are plain .npy files stored contiguously, so they
+    can be memory-mapped individually.
+    """
+    with zipfile.ZipFile(file_path) as zip_file:
+        infos = zip_file.infolist()
+
+    arrays = {}
+    with open(file_path, "rb") as file:
+        for info in infos:
+            name = info.filename.removesuffix(".npy")
+            if info.compress_type != zipfile.ZIP_STORED:
+                arrays[name] = np.load(file_path)[name]
+                continue
+
+            file.seek(info.header_offset)
+            local_header = file.read(_ZIP_LOCAL_HEADER_SIZE)
+            filename_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            file.seek(
+                info.header_offset
+                + _ZIP_LOCAL_HEADER_SIZE
+                + filename_length
+                + extra_length
+            )
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(file)
+            else:
+                header = np.lib.format.read_array_header_2_0(file)
+            shape, fortran_order, dtype = header
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    file_path,
+                    dtype=dtype,
+                    mode="r",
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                    offset=file.tell(),
+                )
+    return arrays
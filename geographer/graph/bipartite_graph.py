@@ -40,6 +40,13 @@ from json import JSONDecodeError
 from pathlib import Path
 from typing import Any
 
+from geographer.graph.binary_graph_file import (
+    graph_arrays_to_graph_dict,
+    graph_dict_to_graph_arrays,
+    is_binary_graph_file,
+    load_graph_arrays,
+    save_graph_arrays,
+)
 from geographer.graph.bipartite_graph_class import BipartiteGraphClass
 from geographer.graph.type_aliases import VertexColor, VertexName
 
@@ -106,7 +113,9 @@ class BipartiteGraph(BipartiteGraphClass):
         Args:
             graph_dict: dict (of dicts of dicts) defining a bipartite graph.
                 See example in module header.
-            file_path:path to .json containing such a dict.
+            file_path:path to .json containing such a dict or to a .npz file
+                in the binary graph format, see
+                :mod:`geographer.graph.binary_graph_file`.
             red: vertex color, defaults to 'red'.
             black: vertex color, defaults to 'black.
             directed: If True the graph is directed, defaults to False.
@@ -115,8 +124,13 @@ class BipartiteGraph(BipartiteGraphClass):
             self.file_path: Path | None = file_path
             self.directed = directed
             try:
-                with open(file_path, "r") as file:
-                    self._graph_dict = json.load(file)
+                if is_binary_graph_file(file_path):
+                    self._graph_dict = graph_arrays_to_graph_dict(
+                        load_graph_arrays(file_path, mmap=False)
+                    )
+                else:
+                    with open(file_path, "r") as file:
+                        self._graph_dict = json.load(file)
             except FileNotFoundError:
                 log.exception("Graph dict file %s not found", file_path)
             except JSONDecodeError:
@@ -259,6 +273,7 @@ class BipartiteGraph(BipartiteGraphClass):
         else:
             # create vertex w/o edges
             self._graph_dict[vertex_color][vertex_name] = {}
+            self._log_change(("vertex", vertex_name, vertex_color))
 
     def add_edge(
         self,
@@ -312,6 +327,10 @@ class BipartiteGraph(BipartiteGraphClass):
                 to_vertex_color = self._opposite_color(from_vertex_color)
                 self._graph_dict[to_vertex_color][to_vertex][from_vertex] = edge_data
 
+            self._log_change(
+                ("edge", from_vertex, from_vertex_color, to_vertex, edge_data)
+            )
+
     def delete_vertex(
         self,
         vertex_name: VertexName,
@@ -370,6 +389,7 @@ class BipartiteGraph(BipartiteGraphClass):
                 self._graph_dict[opposite_color][opposite_vertex].pop(vertex_name)
             # then we take out the edges starting in vertex and the vertex itself
             self._graph_dict[vertex_color].pop(vertex_name)
+            self._log_change(None)
 
     def delete_edge(
         self,
@@ -399,12 +419,17 @@ class BipartiteGraph(BipartiteGraphClass):
             if not self.directed:  # delete opposite edge
                 opposite_color = self._opposite_color(from_vertex_color)
                 self._graph_dict[opposite_color][to_vertex].pop(from_vertex)
+            self._log_change(None)
 
     def save_to_file(self, file_path: Path | None = None):
-        """Save graph (i.e. graph_dict) to disk as json file.
+        """Save graph (i.e. graph_dict) to disk.
+
+        The graph is saved as json file unless the file path has a .npz
+        suffix, in which case the binary graph format is used (see
+        :mod:`geographer.graph.binary_graph_file`).
 
         Args:
-            file_path: path of json file to save graph to.
+            file_path: path of file to save graph to.
         """
         if file_path is None:
             if self.file_path is not None:
@@ -416,6 +441,12 @@ class BipartiteGraph(BipartiteGraphClass):
                 )
         else:
             self.file_path = file_path
+
+        if is_binary_graph_file(file_path):
+            save_graph_arrays(
+                file_path, **graph_dict_to_graph_arrays(self._graph_dict)
+            )
+        else:
             with open(file_path, "w", encoding="utf-8") as write_file:
                 json.dump(self._graph_dict, write_file, indent=4, ensure_ascii=False)
 
@@ -112,3 +112,32 @@ class BipartiteGraphClass(ABC):
     def __str__(self) -> str:
         """Return str repr."""
         raise NotImplementedError
+
+    def start_change_log(self):
+        """Start recording the vertices and edges added to the graph.
+
+        Used to save graphs incrementally. Deleting vertices or edges
+        invalidates the change log, see :meth:`change_log`.
+        """
+        self._change_log: list[tuple] | None = []
+
+    def change_log(self) -> list[tuple] | None:
+        """Return changes since :meth:`start_change_log` was last called.
+
+        Returns:
+            list of ("vertex", vertex_name, vertex_color) and ("edge",
+            from_vertex, from_vertex_color, to_vertex, edge_data) tuples that
+            can be replayed using add_vertex and add_edge (with force=True), or
+            None if the graph was changed in any other way since or if
+            recording was never started.
+        """
+        return getattr(self, "_change_log", None)
+
+    def _log_change(self, change: tuple | None):
+        """Record change if recording. None invalidates the change log."""
+        if getattr(self, "_change_log", None) is None:
+            return
+        if change is None:
+            self._change_log = None
+        else:
+            self._change_log.append(change)
@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Sequence
 
+import numpy as np
+import pandas as pd
+import shapely
 from geopandas import GeoDataFrame
 from shapely.geometry.base import BaseGeometry
 
@@ -334,7 +337,7 @@ class BipartiteGraphMixIn:
         # if the vector feature is fully contained in the raster
         # increment the raster counter in self.vectors
         if contains_or_intersects == "contains":
-            vectors.loc[vector_name, self.raster_count_col_name] += 1
+            self._add_to_raster_counts([vector_name], 1, vectors=vectors)
 
     def _add_vector_to_graph(
         self, vector_name: str, vectors: GeoDataFrame | None = None
@@ -349,49 +352,54 @@ class BipartiteGraphMixIn:
         if vectors is None:
             vectors = self.vectors
 
-        # add vertex if one does not yet exist
-        if not self._graph.exists_vertex(vector_name, VECTOR_FEATURES_COLOR):
-            self._graph.add_vertex(vector_name, VECTOR_FEATURES_COLOR)
+        self._add_vectors_to_graph(vectors=vectors.loc[[vector_name]])
 
-        # raise an exception if the vector feature already has connections
-        if list(self._graph.vertices_opposite(vector_name, VECTOR_FEATURES_COLOR)):
-            log.warning(
-                "_add_vector_to_graph: !!!Warning (connect_vector): "
-                "vector feature %s already has connections! Probably "
-                "_add_vector_to_graph is being used wrongly. Check your code!",
-                vector_name,
-            )
+    def _add_vectors_to_graph(self, vectors: GeoDataFrame):
+        """Connect vector features to all intersecting rasters.
 
-        vector_geom = vectors.geometry.loc[vector_name]
+        Determines all intersecting and containing (vector feature, raster)
+        pairs with a single bulk query of the spatial index of self.rasters,
+        adds the corresponding edges to the graph and increments the
+        raster_count column of vectors.
+
+        Args:
+            vectors: vector features to add. The raster_count column will
+                be modified in place.
+        """
+        for vector_name in vectors.index:
+            # add vertex if one does not yet exist
+            if not self._graph.exists_vertex(vector_name, VECTOR_FEATURES_COLOR):
+                self._graph.add_vertex(vector_name, VECTOR_FEATURES_COLOR)
+
+            # raise an exception if the vector feature already has connections
+            elif list(
+                self._graph.vertices_opposite(vector_name, VECTOR_FEATURES_COLOR)
+            ):
+                log.warning(
+                    "_add_vector_to_graph: !!!Warning (connect_vector): "
+                    "vector feature %s already has connections! Probably "
+                    "_add_vector_to_graph is being used wrongly. Check your code!",
+                    vector_name,
+                )
+
+        if len(vectors) == 0 or len(self.rasters) == 0:
+            return
 
         # determine intersecting and containing rasters
-        intersection_mask = self.rasters.geometry.intersects(vector_geom)
-        containment_mask = self.rasters.loc[intersection_mask].geometry.contains(
-            vector_geom
+        vector_idxs, raster_names = self._get_spatial_index("rasters").query(
+            vectors.geometry.values, predicate="intersects"
         )
-
-        intersecting_rasters = set(self.rasters.loc[intersection_mask].index)
-        containing_rasters = set(
-            self.rasters.loc[intersection_mask].loc[containment_mask].index
+        containment_mask = shapely.contains(
+            np.asarray(self.rasters.geometry.loc[raster_names].values),
+            np.asarray(vectors.geometry.values)[vector_idxs],
         )
 
-        # add edges in graph
-        for raster_name in containing_rasters:
-            self._connect_raster_to_vector(
-                raster_name,
-                vector_name,
-                "contains",
-                vectors=vectors,
-                do_safety_check=False,
-            )
-        for raster_name in intersecting_rasters - containing_rasters:
-            self._connect_raster_to_vector(
-                raster_name,
-                vector_name,
-                "intersects",
-                vectors=vectors,
-                do_safety_check=False,
-            )
+        self._connect_rasters_to_vectors(
+            raster_names=raster_names,
+            vector_names=vectors.index.to_numpy()[vector_idxs],
+            containment_mask=containment_mask,
+            vectors=vectors,
+        )
 
     def _add_raster_to_graph_modify_vectors(
         self,
@@ -416,6 +424,37 @@ class BipartiteGraphMixIn:
             vectors: Optional vector features dataframe
             graph: optional bipartied graph
         """
+        # default raster_bounding_rectangle
+        if raster_bounding_rectangle is None:
+            raster_bounding_rectangle = self.rasters.geometry.loc[raster_name]
+
+        self._add_rasters_to_graph_modify_vectors(
+            raster_names=[raster_name],
+            raster_bounding_rectangles=[raster_bounding_rectangle],
+            vectors=vectors,
+            graph=graph,
+        )
+
+    def _add_rasters_to_graph_modify_vectors(
+        self,
+        raster_names: Sequence[str],
+        raster_bounding_rectangles: Sequence[BaseGeometry],
+        vectors: GeoDataFrame | None = None,
+        graph: BipartiteGraphClass | None = None,
+    ):
+        """Add rasters to graph and modify vector features.
+
+        Bulk version of :meth:`_add_raster_to_graph_modify_vectors`: all
+        intersecting and contained (raster, vector feature) pairs are
+        determined with a single query of the spatial index of self.vectors
+        and the raster_counts are modified in one step.
+
+        Args:
+            raster_names: Names of rasters to add
+            raster_bounding_rectangles: geometries decribing raster footprints
+            vectors: Optional vector features dataframe
+            graph: optional bipartied graph
+        """
         # default vectors
         if vectors is None:
             vectors = self.vectors
@@ -424,53 +463,123 @@ class BipartiteGraphMixIn:
         if graph is None:
             graph = self._graph
 
-        # default raster_bounding_rectangle
-        if raster_bounding_rectangle is None:
-            raster_bounding_rectangle = self.rasters.geometry.loc[raster_name]
-
-        # add vertex if it does not yet exist
-        if not graph.exists_vertex(raster_name, RASTER_IMGS_COLOR):
-            graph.add_vertex(raster_name, RASTER_IMGS_COLOR)
+        for raster_name in raster_names:
+            # add vertex if it does not yet exist
+            if not graph.exists_vertex(raster_name, RASTER_IMGS_COLOR):
+                graph.add_vertex(raster_name, RASTER_IMGS_COLOR)
+
+            # check if raster already has connections
+            elif list(graph.vertices_opposite(raster_name, RASTER_IMGS_COLOR)) != []:
+                log.warning(
+                    "!!!Warning (connect_raster): raster %s already has connections!",
+                    raster_name,
+                )
 
-        # check if raster already has connections
-        if list(graph.vertices_opposite(raster_name, RASTER_IMGS_COLOR)) != []:
-            log.warning(
-                "!!!Warning (connect_raster): raster %s already has connections!",
-                raster_name,
-            )
+        if len(raster_names) == 0 or len(self.vectors) == 0:
+            return
 
-        # # determine intersecting and containing rasters
-        intersection_mask = self.vectors.geometry.intersects(raster_bounding_rectangle)
-        containment_mask = self.vectors.loc[intersection_mask].geometry.within(
-            raster_bounding_rectangle
+        # determine intersecting and containing rasters
+        raster_geoms = np.asarray(raster_bounding_rectangles, dtype=object)
+        raster_idxs, vector_names = self._get_spatial_index("vectors").query(
+            raster_geoms, predicate="intersects"
+        )
+        containment_mask = shapely.within(
+            np.asarray(self.vectors.geometry.loc[vector_names].values),
+            raster_geoms[raster_idxs],
         )
 
-        intersecting_vectors = set(self.vectors.loc[intersection_mask].index)
-        contained_vectors = set(
-            self.vectors.loc[intersection_mask].loc[containment_mask].index
+        self._connect_rasters_to_vectors(
+            raster_names=np.asarray(raster_names, dtype=object)[raster_idxs],
+            vector_names=vector_names,
+            containment_mask=containment_mask,
+            vectors=vectors,
+            graph=graph,
         )
 
-        # add edges in graph
-        for vector_name in contained_vectors:
-            self._connect_raster_to_vector(
+    def _connect_rasters_to_vectors(
+        self,
+        raster_names: Sequence[str],
+        vector_names: Sequence[str],
+        containment_mask: Sequence[bool],
+        vectors: GeoDataFrame | None = None,
+        graph: BipartiteGraphClass | None = None,
+    ):
+        """Connect pairs of rasters and vector features in the graph.
+
+        Bulk version of :meth:`_connect_raster_to_vector` without safety
+        checks: adds a "contains" or "intersects" edge for each pair and
+        increments the raster_count of the contained vector features in a
+        single vectorized step.
+
+        Args:
+            raster_names: raster names, one for each pair
+            vector_names: vector feature names, one for each pair
+            containment_mask: whether the raster contains the vector feature,
+                one for each pair
+            vectors: Optional vector feature dataframe
+            graph: optional bipartied graph
+        """
+        # default vectors
+        if vectors is None:
+            vectors = self.vectors
+
+        # default graph
+        if graph is None:
+            graph = self._graph
+
+        for raster_name, vector_name, contains in zip(
+            raster_names, vector_names, containment_mask
+        ):
+            graph.add_edge(
                 raster_name,
+                RASTER_IMGS_COLOR,
                 vector_name,
-                "contains",
-                vectors=vectors,
-                raster_bounding_rectangle=raster_bounding_rectangle,
-                graph=graph,
-                do_safety_check=False,
+                "contains" if contains else "intersects",
             )
-        for vector_name in intersecting_vectors - contained_vectors:
-            self._connect_raster_to_vector(
-                raster_name,
-                vector_name,
-                "intersects",
-                vectors=vectors,
-                raster_bounding_rectangle=raster_bounding_rectangle,
-                graph=graph,
-                do_safety_check=False,
+
+        # increment the raster counter in vectors for
+        # the vector features fully contained in the rasters
+        self._add_to_raster_counts(
+            np.asarray(vector_names, dtype=object)[np.asarray(containment_mask, bool)],
+            1,
+            vectors=vectors,
+        )
+
+    def _add_to_raster_counts(
+        self,
+        vector_names: Sequence[str],
+        increment: int,
+        vectors: GeoDataFrame | None = None,
+    ):
+        """Add an increment to the raster_counts of vector features.
+
+        The increments are gathered (vector features occurring several times
+        in vector_names are incremented several times) and applied to the
+        raster_count column in a single index-aligned step.
+
+        Args:
+            vector_names: names of vector features, possibly with repetitions
+            increment: increment per occurrence in vector_names, e.g. 1 or -1
+            vectors: Optional vector feature dataframe
+        """
+        # default vectors
+        if vectors is None:
+            vectors = self.vectors
+
+        raster_count_deltas = (
+            pd.Series(vector_names, dtype=object).value_counts() * increment
+        )
+        if len(raster_count_deltas) > 0:
+            raster_counts = vectors.loc[
+                raster_count_deltas.index, self.raster_count_col_name
+            ]
+            # keep the column's dtype (e.g. int32 when loaded from GeoJSON)
+            vectors.loc[raster_count_deltas.index, self.raster_count_col_name] = (
+                raster_counts.add(raster_count_deltas, fill_value=0)
+                .astype(raster_counts.dtype)
             )
+            if vectors is self.vectors:
+                self.mark_rows_changed("vectors", raster_count_deltas.index)
 
     def _remove_vector_from_graph_modify_vectors(
         self, vector_name: str, set_raster_count_to_zero: bool = True
@@ -491,6 +600,7 @@ class BipartiteGraphMixIn:
 
         if set_raster_count_to_zero:
             self.vectors.loc[vector_name, self.raster_count_col_name] = 0
+            self.mark_rows_changed("vectors", [vector_name])
 
     def _remove_raster_from_graph_modify_vectors(self, raster_name: str):
         """Remove raster from graph & modify self.vectors accordingly.
@@ -502,9 +612,23 @@ class BipartiteGraphMixIn:
         Args:
             raster_name: name/id of raster to remove
         """
-        for vector_name in self.vectors_contained_in_raster(raster_name):
-            self.vectors.loc[vector_name, self.raster_count_col_name] -= 1
+        self._remove_rasters_from_graph_modify_vectors([raster_name])
 
-        self._graph.delete_vertex(
-            raster_name, RASTER_IMGS_COLOR, force_delete_with_edges=True
+    def _remove_rasters_from_graph_modify_vectors(self, raster_names: Sequence[str]):
+        """Remove rasters from graph & modify self.vectors accordingly.
+
+        Bulk version of :meth:`_remove_raster_from_graph_modify_vectors`. The
+        raster_counts of the vector features contained in the rasters are
+        decremented in a single step.
+
+        Args:
+            raster_names: names/ids of rasters to remove
+        """
+        self._add_to_raster_counts(
+            self.vectors_contained_in_raster(list(raster_names)), -1
         )
+
+        for raster_name in raster_names:
+            self._graph.delete_vertex(
+                raster_name, RASTER_IMGS_COLOR, force_delete_with_edges=True
+            )
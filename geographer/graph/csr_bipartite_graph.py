@@ -0,0 +1,857 @@
+"""Compact array-backed class for bipartite graphs.
+
+Implements graphs in compressed sparse row (CSR) format. The vertex names of
+each color are kept in a sorted numpy array (strings are utf-8 encoded) and
+the id of a vertex is its position in that array, so looking up a vertex is
+a binary search and needs no memory beyond the names themselves. The edges
+starting at vertices of a given color are stored as three numpy arrays:
+
+* ``indptr``: the edges starting at the vertex with id ``i`` are the entries
+  ``indptr[i]:indptr[i + 1]`` of the following two arrays,
+* ``indices``: ids of the opposite vertices, sorted within each row,
+* ``codes`` (uint8): edge data interned to codes, i.e. indices into the list
+  of distinct edge data values (at most 256 distinct values).
+
+``indptr`` and ``indices`` use the smallest unsigned integer dtype that can
+hold the number of edges and the number of opposite vertices, respectively.
+
+Since the sorted names and CSR arrays are expensive to modify, vertices and
+edges added or deleted after the arrays were built are recorded in a small
+delta buffer, which is merged into the arrays once it grows beyond a
+fraction of the size of the graph.
+
+Compared to the dict-of-dicts :class:`BipartiteGraph` this uses more than ten
+times less memory for graphs with many edges (e.g. 17 MB instead of 172 MB
+for a million edges including the vertex names, see
+benchmarks/graph_memory_benchmark.py). The graph dict encoding
+of the graph (see :mod:`geographer.graph.bipartite_graph`) is available as
+the ``_graph_dict`` property and is what gets serialized to json. The CSR
+arrays can also be saved as is in the binary graph format, see
+:mod:`geographer.graph.binary_graph_file`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from itertools import chain
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Any, Hashable, Sequence
+
+import numpy as np
+
+from geographer.graph.binary_graph_file import (
+    is_binary_graph_file,
+    load_graph_arrays,
+    save_graph_arrays,
+)
+from geographer.graph.bipartite_graph import empty_graph_dict
+from geographer.graph.bipartite_graph_class import BipartiteGraphClass
+from geographer.graph.type_aliases import VertexColor, VertexName
+
+log = logging.getLogger(__name__)
+
+MAX_NUM_EDGE_DATA_VALUES = 256
+DEFAULT_MAX_DELTA_FRACTION = 0.1
+MIN_DELTA_SIZE = 10_000
+
+
+def empty_csr_bipartite_graph(red="red", black="black"):
+    """Return empty CSR bipartite graph.
+
+    Args:
+        red: vertex color. Defaults to "red".
+        black: vertex color. Defaults to "black".
+
+    Returns:
+        empty graph
+    """
+    return CSRBipartiteGraph(red=red, black=black)
+
+
+class CSRBipartiteGraph(BipartiteGraphClass):
+    """Class implementing bipartite graphs using CSR arrays.
+
+    Drop-in replacement for :class:`BipartiteGraph` for large graphs.
+    The vertex names of each color have to be either all strings or all
+    integers and the edge data hashable with at most 256 distinct values,
+    e.g. 'contains' and 'intersects'.
+    """
+
+    def __init__(
+        self,
+        graph_dict: dict | None = None,
+        file_path: Path | None = None,
+        red: VertexColor = None,
+        black: VertexColor = None,
+        directed: bool = False,
+        max_delta_fraction: float = DEFAULT_MAX_DELTA_FRACTION,
+    ):
+        """Construct graph from graph dict or json file.
+
+        Args:
+            graph_dict: dict (of dicts of dicts) defining a bipartite graph.
+                See :class:`BipartiteGraph`.
+            file_path: path to .json containing such a dict or to a .npz file
+                in the binary graph format, see
+                :mod:`geographer.graph.binary_graph_file`. The CSR arrays of
+                a binary graph file are memory-mapped.
+            red: vertex color, defaults to 'red'.
+            black: vertex color, defaults to 'black'.
+            directed: If True the graph is directed, defaults to False.
+            max_delta_fraction: the delta buffer is merged into the CSR arrays
+                once the number of buffered changes exceeds this fraction
+                of the number of edges or vertices (or MIN_DELTA_SIZE if that
+                is larger).
+        """
+        self.file_path: Path | None = None
+        self.directed = directed
+        self.max_delta_fraction = max_delta_fraction
+
+        if file_path is not None:
+            self.file_path = file_path
+            try:
+                if is_binary_graph_file(file_path):
+                    graph_arrays = load_graph_arrays(file_path)
+                    self.red, self.black = graph_arrays["colors"]
+                    self._init_from_graph_arrays(graph_arrays)
+                    return
+                with open(file_path, "r") as file:
+                    graph_dict = json.load(file)
+            except FileNotFoundError:
+                log.exception("Graph dict file %s not found", file_path)
+                raise
+            except JSONDecodeError:
+                log.exception("Json file %s could not be decoded.", file_path)
+                raise
+
+        if graph_dict is not None:
+            if len(graph_dict) != 2:
+                raise ValueError(
+                    "__init__: input argument graph_dict must have "
+                    "outer dict be of length two!"
+                )
+        elif red is not None or black is not None:
+            if red is None or black is None:
+                raise Exception(
+                    "Error: Need either both or none of red and black specified!"
+                )
+            graph_dict = empty_graph_dict(red=red, black=black)
+        else:
+            graph_dict = empty_graph_dict()
+
+        self.red, self.black = tuple(graph_dict.keys())
+        self._init_from_graph_dict(graph_dict)
+
+    def colors(self) -> list[VertexColor]:
+        """Return vertex colors."""
+        return [self.red, self.black]
+
+    def _opposite_color(self, color: VertexColor) -> VertexColor:
+        """Return opposite vertex color."""
+        return self.colors()[1 - self._color_idx(color)]
+
+    def vertices(self, color: VertexColor) -> list[VertexName]:
+        """Return vertices of a given color."""
+        color_idx = self._color_idx(color)
+        return self._vertex_names(color_idx, self._alive_ids(color_idx))
+
+    def vertices_opposite(
+        self,
+        vertex_name: VertexName,
+        vertex_color: VertexColor,
+        edge_data: Any | None = None,
+    ) -> list[VertexColor]:
+        """Return list of adjacent vertices.
+
+        Since our graph is bipartite, these are always of the opposite
+        color, hence 'opposite'.
+        """
+        color_idx = self._color_idx(vertex_color)
+        opposite_ids, codes = self._row(
+            color_idx, self._get_vertex_id(color_idx, vertex_name)
+        )
+        if edge_data is not None:
+            if edge_data not in self._edge_data_codes:
+                return []
+            opposite_ids = opposite_ids[codes == self._edge_data_codes[edge_data]]
+        return self._vertex_names(1 - color_idx, opposite_ids)
+
+    def exists_vertex(self, vertex_name: VertexName, vertex_color: VertexColor) -> bool:
+        """Return True if the vertex is in the graph, False otherwise."""
+        if vertex_color is None:
+            return any(
+                self._vertex_id(color_idx, vertex_name) is not None
+                for color_idx in (0, 1)
+            )
+        return self._vertex_id(self._color_idx(vertex_color), vertex_name) is not None
+
+    def exists_edge(
+        self,
+        from_vertex: VertexName,
+        from_vertex_color: VertexColor,
+        to_vertex: VertexName,
+        edge_data: Any | None = None,
+    ) -> bool:
+        """Return True if the edge is in the graph, False otherwise."""
+        color_idx = self._color_idx(from_vertex_color)
+        from_id = self._get_vertex_id(color_idx, from_vertex)
+        to_id = self._vertex_id(1 - color_idx, to_vertex)
+        if to_id is None:
+            return False
+        code = self._edge_code(color_idx, from_id, to_id)
+        if code is None:
+            return False
+        return edge_data is None or self._edge_data_values[code] == edge_data
+
+    def edge_data(
+        self, from_vertex: VertexName, from_color: VertexColor, to_vertex: VertexName
+    ) -> Any:
+        """Return edge data.
+
+        Raises a KeyError if there is no such edge.
+        """
+        color_idx = self._color_idx(from_color)
+        code = self._edge_code(
+            color_idx,
+            self._get_vertex_id(color_idx, from_vertex),
+            self._get_vertex_id(1 - color_idx, to_vertex),
+        )
+        if code is None:
+            raise KeyError(to_vertex)
+        return self._edge_data_values[code]
+
+    def add_vertex(self, vertex_name: VertexName, vertex_color: VertexColor):
+        """Add a vertex to the graph."""
+        color_idx = self._color_idx(vertex_color)
+        if self._vertex_id(color_idx, vertex_name) is not None:
+            log.info("Vertex %s of already exists!", vertex_name)
+        else:
+            self._check_name_kind(color_idx, vertex_name)
+            self._new_ids[color_idx][vertex_name] = self._num_ids(color_idx)
+            self._new_names[color_idx].append(vertex_name)
+            self._log_change(("vertex", vertex_name, vertex_color))
+            self._compact_if_necessary()
+
+    def add_edge(
+        self,
+        from_vertex: VertexName,
+        from_vertex_color: VertexColor,
+        to_vertex: VertexName,
+        edge_data: Any,
+        force: bool = False,
+    ):
+        """Add an edge to the graph.
+
+        If the vertices do not yet exist will create them. Throws an
+        error if an edge between the vertices already exists unless
+        force is True, in which case it overwrites the existing
+        edge_data.
+        """
+        color_idx = self._color_idx(from_vertex_color)
+        to_vertex_color = self._opposite_color(from_vertex_color)
+        for vertex, color in [
+            (from_vertex, from_vertex_color),
+            (to_vertex, to_vertex_color),
+        ]:
+            if not self.exists_vertex(vertex, color):
+                log.info(
+                    "add_edge: vertex %s does not exist. Creating first...", vertex
+                )
+                self.add_vertex(vertex, color)
+
+        # look up ids after creating the vertices, which might compact the graph
+        from_id = self._get_vertex_id(color_idx, from_vertex)
+        to_id = self._get_vertex_id(1 - color_idx, to_vertex)
+        if not force and self._edge_code(color_idx, from_id, to_id) is not None:
+            raise Exception(
+                f"add_edge: an edge {from_vertex} (color: {from_vertex_color}) "
+                f"to {to_vertex} already exists. Set force=True to overwrite."
+            )
+
+        code = self._intern_edge_data(edge_data)
+        self._added[color_idx].setdefault(from_id, {})[to_id] = code
+        if not self.directed:
+            self._added[1 - color_idx].setdefault(to_id, {})[from_id] = code
+        self._log_change(("edge", from_vertex, from_vertex_color, to_vertex, edge_data))
+        self._num_delta += 1
+        self._compact_if_necessary()
+
+    def delete_vertex(
+        self,
+        vertex_name: VertexName,
+        vertex_color: VertexColor,
+        force_delete_with_edges=True,
+    ):
+        """Delete a vertex from the graph.
+
+        If force_delete_with_edges is False, will delete only if the
+        vertex has no edges. If True, will also delete edges starting or
+        ending at the vertex. Only implemented for undirected graphs.
+        """
+        if not self.exists_vertex(vertex_name, vertex_color):
+            log.info(
+                "delete_vertex: nothing to do, vertex %s does not exist.", vertex_name
+            )
+            return
+
+        if self.directed:
+            raise Exception(
+                "Sorry, delete_vertex is not implemented for directed graphs."
+            )
+
+        color_idx = self._color_idx(vertex_color)
+        vertex_id = self._get_vertex_id(color_idx, vertex_name)
+        opposite_ids, _ = self._row(color_idx, vertex_id)
+        if not force_delete_with_edges and len(opposite_ids) > 0:
+            raise Exception(
+                f"delete_vertex: vertex {vertex_name} of color {vertex_color} has "
+                "edges. Set force_delete_with_edges=True to delete anyway "
+                "(along with adjacent edges)."
+            )
+
+        for opposite_id in opposite_ids.tolist():
+            self._delete_half_edge(1 - color_idx, opposite_id, vertex_id)
+        # the vertex's name and own row are discarded at the next compaction
+        self._added[color_idx].pop(vertex_id, None)
+        self._deleted[color_idx].pop(vertex_id, None)
+        self._new_ids[color_idx].pop(vertex_name, None)
+        self._dead[color_idx].add(vertex_id)
+        self._log_change(None)
+        self._num_delta += len(opposite_ids)
+        self._compact_if_necessary()
+
+    def delete_edge(
+        self,
+        from_vertex: VertexName,
+        from_vertex_color: VertexColor,
+        to_vertex: VertexName,
+    ):
+        """Delete an edge from the graph."""
+        color_idx = self._color_idx(from_vertex_color)
+        from_id = self._get_vertex_id(color_idx, from_vertex)
+        to_id = self._vertex_id(1 - color_idx, to_vertex)
+        if to_id is None or self._edge_code(color_idx, from_id, to_id) is None:
+            log.info(
+                "delete_edge(%s, %s, %s): There is no such edge.",
+                from_vertex,
+                from_vertex_color,
+                to_vertex,
+            )
+            return
+
+        self._delete_half_edge(color_idx, from_id, to_id)
+        if not self.directed:
+            self._delete_half_edge(1 - color_idx, to_id, from_id)
+        self._log_change(None)
+        self._num_delta += 1
+        self._compact_if_necessary()
+
+    def save_to_file(self, file_path: Path | None = None):
+        """Save graph to disk.
+
+        The graph is saved as json file encoding the graph dict unless the
+        file path has a .npz suffix, in which case the CSR arrays are saved
+        in the binary graph format (see :mod:`geographer.graph.binary_graph_file`).
+
+        Args:
+            file_path: path of file to save graph to. Defaults to the path
+                the graph was last loaded from or saved to.
+        """
+        if file_path is None:
+            if self.file_path is None:
+                raise Exception(
+                    "save_to_file: no file_path on record, "
+                    "specify as file_path argument."
+                )
+            file_path = self.file_path
+        self.file_path = file_path
+
+        if is_binary_graph_file(file_path):
+            # after compacting, the ids are the positions in the sorted names
+            self.compact()
+            save_graph_arrays(
+                file_path,
+                colors=self.colors(),
+                edge_data_values=self._edge_data_values,
+                names=[_names_list(names) for names in self._names],
+                csr_arrays=list(zip(self._indptr, self._indices, self._codes)),
+            )
+        else:
+            with open(file_path, "w", encoding="utf-8") as write_file:
+                json.dump(self._graph_dict, write_file, indent=4, ensure_ascii=False)
+
+    def really_undirected(self) -> bool:
+        """Check if for each edge the opposite edge exists as well.
+
+        Returns:
+            True if graph is undirected, False if it's not.
+        """
+        edges = []
+        for color_idx in (0, 1):
+            from_ids, to_ids, codes = self._edge_arrays(color_idx)
+            if color_idx == 1:
+                from_ids, to_ids = to_ids, from_ids
+            order = np.lexsort((to_ids, from_ids))
+            edges.append((from_ids[order], to_ids[order], codes[order]))
+        return all(
+            np.array_equal(red_array, black_array)
+            for red_array, black_array in zip(*edges)
+        )
+
+    def compact(self):
+        """Merge delta buffer into the sorted names and CSR arrays."""
+        edge_arrays = [self._edge_arrays(color_idx) for color_idx in (0, 1)]
+
+        names = []
+        new_ids = []
+        for color_idx in (0, 1):
+            alive_ids = self._alive_ids(color_idx)
+            num_base = len(self._names[color_idx])
+            alive_new_names = [
+                self._new_names[color_idx][vertex_id - num_base]
+                for vertex_id in alive_ids[alive_ids >= num_base].tolist()
+            ]
+            names.append(
+                _concatenate_names(
+                    self._names[color_idx][alive_ids[alive_ids < num_base]],
+                    _names_array(alive_new_names),
+                )
+            )
+            # deleted vertices have no edges left, so they are never looked up
+            ids = np.full(self._num_ids(color_idx), -1, dtype=np.int64)
+            ids[alive_ids] = np.arange(len(alive_ids))
+            new_ids.append(ids)
+
+        self._build(
+            names,
+            [
+                (new_ids[color_idx][from_ids], new_ids[1 - color_idx][to_ids], codes)
+                for color_idx, (from_ids, to_ids, codes) in enumerate(edge_arrays)
+            ],
+        )
+
+    @property
+    def _graph_dict(self) -> dict:
+        """Graph dict encoding of the graph, see :class:`BipartiteGraph`."""
+        graph_dict = {}
+        for color_idx, color in enumerate(self.colors()):
+            from_ids, to_ids, codes = self._edge_arrays(color_idx)
+            graph_dict[color] = {name: {} for name in self.vertices(color)}
+            for from_name, to_name, code in zip(
+                self._vertex_names(color_idx, from_ids),
+                self._vertex_names(1 - color_idx, to_ids),
+                codes.tolist(),
+            ):
+                graph_dict[color][from_name][to_name] = self._edge_data_values[code]
+        return graph_dict
+
+    def nbytes(self) -> int:
+        """Return number of bytes used by the vertex names and CSR arrays."""
+        return sum(
+            array.nbytes
+            for arrays in (self._names, self._indptr, self._indices, self._codes)
+            for array in arrays
+        )
+
+    def __eq__(self, other) -> bool:
+        """Check equality of graphs.
+
+        Two graphs are equal if the vertex sets and colors and the edge
+        sets and edge data agree.
+        """
+        return self._graph_dict == other._graph_dict
+
+    def __str__(self):
+        """Return string representation of the graph."""
+        return json.dumps(self._graph_dict, indent=4)
+
+    def _init_from_graph_dict(self, graph_dict: dict):
+        self._init_state([])
+
+        names = [list(graph_dict[color]) for color in graph_dict]
+        # temporary ids in graph dict order, the CSR arrays use sorted ids
+        ids = [dict(zip(names_, range(len(names_)))) for names_ in names]
+        edge_arrays = []
+        for color_idx, color in enumerate(graph_dict):
+            rows = graph_dict[color].values()
+            num_edges_per_row = np.fromiter(map(len, rows), dtype=np.int64)
+            num_edges = int(num_edges_per_row.sum())
+            from_ids = np.repeat(np.arange(len(rows)), num_edges_per_row)
+            to_ids = np.fromiter(
+                map(ids[1 - color_idx].__getitem__, chain.from_iterable(rows)),
+                dtype=np.int64,
+                count=num_edges,
+            )
+            edge_datas = list(chain.from_iterable(row.values() for row in rows))
+            for edge_data in set(edge_datas):
+                self._intern_edge_data(edge_data)
+            codes = np.fromiter(
+                map(self._edge_data_codes.__getitem__, edge_datas),
+                dtype=np.uint8,
+                count=num_edges,
+            )
+            edge_arrays.append((from_ids, to_ids, codes))
+
+        self._build([_names_array(names_) for names_ in names], edge_arrays)
+
+    def _init_from_graph_arrays(self, graph_arrays: dict):
+        """Initialize from arrays as returned by load_graph_arrays."""
+        if len(graph_arrays["edge_data_values"]) > MAX_NUM_EDGE_DATA_VALUES:
+            raise ValueError(
+                "CSRBipartiteGraph supports at most "
+                f"{MAX_NUM_EDGE_DATA_VALUES} distinct edge data values"
+            )
+        self._init_state(graph_arrays["edge_data_values"])
+
+        names = [_names_array(names_) for names_ in graph_arrays["names"]]
+        if all(map(_is_sorted, names)):
+            # the arrays may be read-only memory-maps, they are never modified
+            # in place
+            self._names = names
+            for color_idx, (indptr, indices, codes) in enumerate(
+                graph_arrays["csr_arrays"]
+            ):
+                self._indptr[color_idx] = indptr
+                self._indices[color_idx] = indices
+                self._codes[color_idx] = codes
+        else:
+            # e.g. files written by BipartiteGraph, ids are in insertion order
+            self._build(
+                names,
+                [
+                    (
+                        np.repeat(np.arange(len(indptr) - 1), np.diff(indptr)),
+                        np.asarray(indices, dtype=np.int64),
+                        codes,
+                    )
+                    for indptr, indices, codes in graph_arrays["csr_arrays"]
+                ],
+            )
+
+    def _init_state(self, edge_data_values: Sequence[Hashable]):
+        """Initialize edge data codes, empty arrays, and empty delta buffer."""
+        self._edge_data_values: list[Hashable] = list(edge_data_values)
+        self._edge_data_codes: dict[Hashable, int] = {
+            edge_data: code for code, edge_data in enumerate(self._edge_data_values)
+        }
+        self._names: list[np.ndarray] = [_names_array([]), _names_array([])]
+        self._indptr: list[np.ndarray] = [np.zeros(1, dtype=np.uint8)] * 2
+        self._indices: list[np.ndarray] = [np.zeros(0, dtype=np.uint8)] * 2
+        self._codes: list[np.ndarray] = [np.zeros(0, dtype=np.uint8)] * 2
+        self._reset_delta()
+
+    def _reset_delta(self):
+        # vertices added since the last compaction get ids after the ids of
+        # the sorted names
+        self._new_names: list[list[VertexName]] = [[], []]
+        self._new_ids: list[dict[VertexName, int]] = [{}, {}]
+        self._dead: list[set[int]] = [set(), set()]
+        self._added: list[dict[int, dict[int, int]]] = [{}, {}]
+        self._deleted: list[dict[int, set[int]]] = [{}, {}]
+        self._num_delta = 0
+
+    def _build(
+        self,
+        names: list[np.ndarray],
+        edge_arrays: list[tuple[np.ndarray, np.ndarray, np.ndarray]],
+    ):
+        """Sort names, build CSR arrays, and reset delta buffer.
+
+        Args:
+            names: for each color, unique vertex names. The ids in edge_arrays
+                are positions in these arrays.
+            edge_arrays: for each color, from ids, to ids, and codes of the
+                edges starting at vertices of that color.
+        """
+        ranks = []
+        for color_idx in (0, 1):
+            order = np.argsort(names[color_idx], kind="stable")
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            ranks.append(rank)
+            self._names[color_idx] = names[color_idx][order]
+
+        for color_idx, (from_ids, to_ids, codes) in enumerate(edge_arrays):
+            self._set_csr(
+                color_idx,
+                ranks[color_idx][from_ids],
+                ranks[1 - color_idx][to_ids],
+                codes,
+            )
+        self._reset_delta()
+
+    def _set_csr(
+        self,
+        color_idx: int,
+        from_ids: np.ndarray,
+        to_ids: np.ndarray,
+        codes: np.ndarray,
+    ):
+        """Build CSR arrays from edge arrays."""
+        order = np.lexsort((to_ids, from_ids))
+        counts = np.bincount(from_ids, minlength=len(self._names[color_idx]))
+        self._indptr[color_idx] = np.concatenate([[0], np.cumsum(counts)]).astype(
+            np.min_scalar_type(len(from_ids))
+        )
+        self._indices[color_idx] = to_ids[order].astype(
+            np.min_scalar_type(len(self._names[1 - color_idx]))
+        )
+        self._codes[color_idx] = codes[order].astype(np.uint8)
+
+    def _color_idx(self, color: VertexColor) -> int:
+        if color == self.red:
+            return 0
+        if color == self.black:
+            return 1
+        raise Exception(f"not a valid color: {color}")
+
+    def _intern_edge_data(self, edge_data: Any) -> int:
+        code = self._edge_data_codes.get(edge_data)
+        if code is None:
+            if len(self._edge_data_values) == MAX_NUM_EDGE_DATA_VALUES:
+                raise ValueError(
+                    "CSRBipartiteGraph supports at most "
+                    f"{MAX_NUM_EDGE_DATA_VALUES} distinct edge data values"
+                )
+            code = len(self._edge_data_values)
+            self._edge_data_values.append(edge_data)
+            self._edge_data_codes[edge_data] = code
+        return code
+
+    def _num_ids(self, color_idx: int) -> int:
+        return len(self._names[color_idx]) + len(self._new_names[color_idx])
+
+    def _vertex_id(self, color_idx: int, vertex_name: VertexName) -> int | None:
+        """Return id of vertex or None if there is no such vertex."""
+        vertex_id = self._new_ids[color_idx].get(vertex_name)
+        if vertex_id is None:
+            vertex_id = _search_sorted(self._names[color_idx], vertex_name)
+        if vertex_id is None or vertex_id in self._dead[color_idx]:
+            return None
+        return vertex_id
+
+    def _get_vertex_id(self, color_idx: int, vertex_name: VertexName) -> int:
+        """Return id of vertex, raise a KeyError if there is no such vertex."""
+        vertex_id = self._vertex_id(color_idx, vertex_name)
+        if vertex_id is None:
+            raise KeyError(vertex_name)
+        return vertex_id
+
+    def _vertex_names(self, color_idx: int, vertex_ids: np.ndarray) -> list:
+        """Return names of vertices with given ids."""
+        base_names = self._names[color_idx]
+        vertex_ids = np.asarray(vertex_ids, dtype=np.int64)
+        is_base = vertex_ids < len(base_names)
+        if is_base.all():
+            return _names_list(base_names[vertex_ids])
+        new_names = self._new_names[color_idx]
+        names_iter = iter(_names_list(base_names[vertex_ids[is_base]]))
+        return [
+            next(names_iter) if is_base_ else new_names[vertex_id - len(base_names)]
+            for vertex_id, is_base_ in zip(vertex_ids.tolist(), is_base.tolist())
+        ]
+
+    def _alive_ids(self, color_idx: int) -> np.ndarray:
+        """Return ids of vertices that have not been deleted."""
+        vertex_ids = np.arange(self._num_ids(color_idx))
+        if self._dead[color_idx]:
+            vertex_ids = vertex_ids[~np.isin(vertex_ids, list(self._dead[color_idx]))]
+        return vertex_ids
+
+    def _check_name_kind(self, color_idx: int, vertex_name: VertexName):
+        """Raise a TypeError if the vertex name can't be stored with the others."""
+        kind = _name_kind(vertex_name)
+        if len(self._names[color_idx]) > 0:
+            color_kind = self._names[color_idx].dtype.kind
+        elif self._new_names[color_idx]:
+            color_kind = _name_kind(self._new_names[color_idx][0])
+        else:
+            return
+        if kind != color_kind:
+            raise TypeError(
+                "CSRBipartiteGraph: the vertex names of a color have to be either "
+                f"all strings or all integers, got {vertex_name!r}"
+            )
+
+    def _base_row(
+        self, color_idx: int, vertex_id: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        indptr = self._indptr[color_idx]
+        if vertex_id >= len(indptr) - 1:
+            return self._indices[color_idx][:0], self._codes[color_idx][:0]
+        start, stop = indptr[vertex_id], indptr[vertex_id + 1]
+        return self._indices[color_idx][start:stop], self._codes[color_idx][start:stop]
+
+    def _row(self, color_idx: int, vertex_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return opposite vertex ids and edge codes of edges starting at vertex."""
+        opposite_ids, codes = self._base_row(color_idx, vertex_id)
+        added = self._added[color_idx].get(vertex_id, {})
+        deleted = self._deleted[color_idx].get(vertex_id, set())
+        if added or deleted:
+            keep = ~np.isin(opposite_ids, list(deleted | added.keys()))
+            opposite_ids = np.concatenate(
+                [opposite_ids[keep], np.fromiter(added.keys(), dtype=np.int64)]
+            )
+            codes = np.concatenate(
+                [codes[keep], np.fromiter(added.values(), dtype=np.uint8)]
+            )
+        return opposite_ids, codes
+
+    def _edge_code(self, color_idx: int, from_id: int, to_id: int) -> int | None:
+        """Return edge code of edge or None if there is no such edge."""
+        added = self._added[color_idx].get(from_id)
+        if added is not None and to_id in added:
+            return added[to_id]
+        if to_id in self._deleted[color_idx].get(from_id, ()):
+            return None
+        base_position = self._base_position(color_idx, from_id, to_id)
+        if base_position is None:
+            return None
+        return int(self._codes[color_idx][base_position])
+
+    def _base_position(self, color_idx: int, from_id: int, to_id: int) -> int | None:
+        """Return position of edge in CSR arrays or None if it's not there."""
+        indptr = self._indptr[color_idx]
+        # vertices added since the CSR arrays were built have no edges in them
+        if from_id >= len(indptr) - 1 or to_id >= len(self._names[1 - color_idx]):
+            return None
+        start, stop = indptr[from_id], indptr[from_id + 1]
+        position = start + np.searchsorted(self._indices[color_idx][start:stop], to_id)
+        if position < stop and self._indices[color_idx][position] == to_id:
+            return int(position)
+        return None
+
+    def _delete_half_edge(self, color_idx: int, from_id: int, to_id: int):
+        added = self._added[color_idx].get(from_id)
+        if added is not None:
+            added.pop(to_id, None)
+        if self._base_position(color_idx, from_id, to_id) is not None:
+            self._deleted[color_idx].setdefault(from_id, set()).add(to_id)
+
+    def _edge_arrays(self, color_idx: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return from ids, to ids, and codes of all edges starting at color."""
+        indptr = self._indptr[color_idx]
+        from_ids = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        to_ids = self._indices[color_idx].astype(np.int64)
+        codes = self._codes[color_idx]
+
+        # drop edges of deleted vertices and edges deleted or overwritten since
+        # the CSR arrays were built
+        removed_pairs = [
+            (from_id, to_id)
+            for from_id, to_ids_ in self._deleted[color_idx].items()
+            for to_id in to_ids_
+        ] + [
+            (from_id, to_id)
+            for from_id, added in self._added[color_idx].items()
+            for to_id in added
+        ]
+        num_opposite = max(self._num_ids(1 - color_idx), 1)
+        keep = np.ones(len(from_ids), dtype=bool)
+        if self._dead[color_idx]:
+            keep &= ~np.isin(from_ids, list(self._dead[color_idx]))
+        if removed_pairs:
+            removed_keys = np.array(
+                [from_id * num_opposite + to_id for from_id, to_id in removed_pairs],
+                dtype=np.int64,
+            )
+            keep &= ~np.isin(from_ids * num_opposite + to_ids, removed_keys)
+
+        added_from_ids = [
+            from_id for from_id, added in self._added[color_idx].items() for _ in added
+        ]
+        added_to_ids = [
+            to_id for added in self._added[color_idx].values() for to_id in added
+        ]
+        added_codes = [
+            code for added in self._added[color_idx].values() for code in added.values()
+        ]
+        return (
+            np.concatenate([from_ids[keep], np.array(added_from_ids, dtype=np.int64)]),
+            np.concatenate([to_ids[keep], np.array(added_to_ids, dtype=np.int64)]),
+            np.concatenate([codes[keep], np.array(added_codes, dtype=np.uint8)]),
+        )
+
+    def _compact_if_necessary(self):
+        num_edges = len(self._indices[0]) + len(self._indices[1])
+        num_vertices = len(self._names[0]) + len(self._names[1])
+        num_dead = sum(map(len, self._dead))
+        num_new = sum(map(len, self._new_names))
+        if self._num_delta + num_dead > max(
+            self.max_delta_fraction * num_edges, MIN_DELTA_SIZE
+        ) or num_new > max(self.max_delta_fraction * num_vertices, MIN_DELTA_SIZE):
+            log.debug(
+                "Compacting CSR graph with %s buffered changes",
+                self._num_delta + num_dead + num_new,
+            )
+            self.compact()
+
+
+def _name_kind(vertex_name: VertexName) -> str:
+    """Return numpy dtype kind vertex name is stored as."""
+    if isinstance(vertex_name, str):
+        return "S"
+    if _is_int_name(vertex_name):
+        return "i"
+    raise TypeError(
+        "CSRBipartiteGraph: vertex names have to be strings or integers, "
+        f"got {vertex_name!r}"
+    )
+
+
+def _names_array(names: Sequence[VertexName]) -> np.ndarray:
+    """Return vertex names as numpy array, strings are utf-8 encoded."""
+    types = set(map(type, names))
+    if all(issubclass(type_, str) for type_ in types):
+        return np.array(list(map(str.encode, names)), dtype=np.bytes_)
+    if all(
+        issubclass(type_, (int, np.integer)) and not issubclass(type_, bool)
+        for type_ in types
+    ):
+        return np.array(names, dtype=np.int64)
+    raise TypeError(
+        "CSRBipartiteGraph: the vertex names of a color have to be either "
+        "all strings or all integers"
+    )
+
+
+def _names_list(names: np.ndarray) -> list[VertexName]:
+    """Return vertex names in numpy array as list of str or int."""
+    if names.dtype.kind == "S":
+        return [name.decode("utf-8") for name in names.tolist()]
+    return names.tolist()
+
+
+def _concatenate_names(names: np.ndarray, other_names: np.ndarray) -> np.ndarray:
+    if len(other_names) == 0:
+        return names
+    if len(names) == 0:
+        return other_names
+    return np.concatenate([names, other_names])
+
+
+def _is_sorted(names: np.ndarray) -> bool:
+    """Return True if names are strictly increasing."""
+    return len(names) < 2 or bool(np.all(names[:-1] < names[1:]))
+
+
+def _search_sorted(names: np.ndarray, vertex_name: VertexName) -> int | None:
+    """Return position of vertex name in sorted names or None if not there."""
+    if isinstance(vertex_name, str) and names.dtype.kind == "S":
+        key = vertex_name.encode("utf-8")
+    elif _is_int_name(vertex_name) and names.dtype.kind == "i":
+        key = vertex_name
+    else:
+        return None
+    position = int(np.searchsorted(names, key))
+    if position < len(names) and names[position] == key:
+        return position
+    return None
+
+
+def _is_int_name(vertex_name: Any) -> bool:
+    return isinstance(vertex_name, (int, np.integer)) and not isinstance(
+        vertex_name, bool
+    )
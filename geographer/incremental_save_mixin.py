@@ -0,0 +1,471 @@
+"""Mix-in that implements saving a connector incrementally."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Literal
+
+import numpy as np
+import pandas as pd
+from geopandas import GeoDataFrame
+
+from geographer.global_constants import (
+    RASTER_IMGS_INDEX_NAME,
+    VECTOR_FEATURES_INDEX_NAME,
+)
+from geographer.utils.connector_utils import (
+    GRAPH_FILENAMES,
+    STORAGE_FORMAT_SUFFIXES,
+    gdf_file_path,
+    load_gdf,
+    save_gdf,
+)
+from geographer.utils.utils import concat_gdfs
+
+if TYPE_CHECKING:
+    from geographer.graph.bipartite_graph_class import BipartiteGraphClass
+
+log = logging.getLogger(__name__)
+
+JOURNAL_MANIFEST_FILENAME = "journal.json"
+TMP_FILE_PREFIX = ".tmp."
+INDEX_NAMES = {
+    "vectors": VECTOR_FEATURES_INDEX_NAME,
+    "rasters": RASTER_IMGS_INDEX_NAME,
+}
+
+
+def empty_journal_manifest() -> dict:
+    """Return manifest of an empty journal."""
+    return {
+        "vectors": [],
+        "rasters": [],
+        "graph": [],
+        "next_part": 1,
+        "pending_renames": [],
+    }
+
+
+class IncrementalSaveMixIn:
+    """Mix-in that implements saving a connector incrementally.
+
+    Only the components (vectors, rasters, graph, attrs) that changed since
+    the connector was last loaded or saved are written. Changes that only add
+    or modify rows of the vectors or rasters (GeoParquet storage format only)
+    or that only add vertices and edges to the graph are appended to a journal
+    of part files instead of rewriting the component. A component's journal is
+    compacted (i.e. the component is rewritten) once it has journal_max_parts
+    parts or when calling :meth:`save` with compact=True.
+
+    Rows added or dropped using the connector's methods and rows appended
+    using the vectors or rasters setters are tracked. Rows whose non-geometry
+    values were modified in place (e.g. ``connector.vectors.loc[name, col] =
+    value``) are detected by comparing hashes of the rows' non-geometry values
+    to the ones recorded when the connector was last loaded or saved. Rows
+    whose geometries were modified in place need to be marked using
+    :meth:`mark_rows_changed`.
+
+    All files are written to temporary files first and then moved into
+    place by atomic renames. The journal manifest (journal.json) listing the
+    journal parts and the renames of a save is the commit point: if a save is
+    interrupted before the manifest has been replaced the previous state is
+    left untouched, otherwise the renames are completed when loading.
+    """
+
+    journal_max_parts: int = 100
+    """Number of journal parts of a component above which it is compacted."""
+    journal_max_fraction: float = 0.5
+    """Fraction of changed rows above which vectors or rasters are rewritten."""
+
+    if TYPE_CHECKING:
+        vectors: GeoDataFrame
+        rasters: GeoDataFrame
+        attrs: dict
+        attrs_path: Path
+        storage_format: str
+        graph_file_format: str
+        _connector_dir: Path
+        _graph: BipartiteGraphClass
+
+    def save(self, compact: bool = False):
+        """Save connector to disk.
+
+        Only writes the components that changed since the connector was last
+        loaded or saved.
+
+        Args:
+            compact: If True, rewrite changed components and components with
+                journal parts instead of appending to the journal. Defaults to
+                False.
+        """
+        log.info("Saving connector to disk...")
+
+        # Make sure connector_dir exists.
+        self._connector_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = {
+            key: list(val) if isinstance(val, list) else val
+            for key, val in self._get_journal_manifest().items()
+        }
+        renames: list[tuple[Path, Path]] = []
+        obsolete_paths: list[Path] = []
+
+        for df_name in ["rasters", "vectors"]:
+            self._stage_df(df_name, compact, manifest, renames, obsolete_paths)
+        self._stage_graph(compact, manifest, renames, obsolete_paths)
+        self._stage_attrs(renames)
+        self._stage_raster_data_files(renames)
+
+        if not renames:
+            log.info("No changes since connector was last saved.")
+            return
+
+        self._commit(manifest, renames)
+        for path in obsolete_paths:
+            path.unlink(missing_ok=True)
+        self._record_saved_state()
+
+    def mark_rows_changed(
+        self,
+        df_name: Literal["vectors", "rasters"],
+        names: Iterable[Hashable] | None = None,
+    ):
+        """Mark rows of the vectors or rasters modified in place as changed.
+
+        The rows will be saved by the next :meth:`save`. Only needed for rows
+        whose geometries were modified in place, modified non-geometry values
+        are detected when saving.
+
+        Args:
+            df_name: "vectors" or "rasters"
+            names: names of changed rows. Defaults to None, i.e. all rows.
+        """
+        changed_rows = self.__dict__.get("_changed_row_names")
+        if changed_rows is None or changed_rows[df_name] is None:
+            # the whole dataframe will be saved anyway
+            return
+        if names is None:
+            changed_rows[df_name] = None
+        else:
+            changed_rows[df_name].update(dict.fromkeys(names))
+
+    def _update_changed_rows(
+        self, df_name: Literal["vectors", "rasters"], new_df: GeoDataFrame
+    ):
+        """Update changed rows when vectors or rasters are replaced.
+
+        If new_df extends the old dataframe (i.e. agrees with it on the old
+        rows, geometries are compared by identity) only the appended rows are
+        marked as changed, otherwise all rows are.
+        """
+        changed_rows = self.__dict__.get("_changed_row_names")
+        old_df = self.__dict__.get(f"_{df_name}")
+        if changed_rows is None or changed_rows[df_name] is None or old_df is None:
+            return
+
+        if _extends(new_df, old_df):
+            changed_rows[df_name].update(dict.fromkeys(new_df.index[len(old_df) :]))
+        else:
+            changed_rows[df_name] = None
+
+    def _stage_df(
+        self,
+        df_name: Literal["vectors", "rasters"],
+        compact: bool,
+        manifest: dict,
+        renames: list[tuple[Path, Path]],
+        obsolete_paths: list[Path],
+    ):
+        """Write vectors or rasters or their changed rows to a temporary file."""
+        df = getattr(self, df_name)
+        df.index.name = INDEX_NAMES[df_name]
+        parts = manifest[df_name]
+        df_path = gdf_file_path(self._connector_dir, df_name, self.storage_format)
+        # rewrite if the storage format changed
+        changed_rows = self._changed_rows(df_name) if df_path.is_file() else None
+
+        if changed_rows is not None and len(changed_rows) == 0:
+            if not (compact and parts):
+                return
+            changed_rows = None
+
+        if (
+            changed_rows is not None
+            and not compact
+            and self.storage_format == "geoparquet"
+            and len(parts) < self.journal_max_parts
+            and len(changed_rows) <= self.journal_max_fraction * len(df)
+        ):
+            part_name = self._new_part_name(
+                manifest, df_name, STORAGE_FORMAT_SUFFIXES["geoparquet"]
+            )
+            changed_df = df.loc[changed_rows]
+            self._stage_file(
+                part_name, lambda path: save_gdf(changed_df, path), renames
+            )
+            parts.append(part_name)
+            return
+
+        if self.storage_format == "geojson" and df_name == "rasters":
+            self._convert_rasters_dtypes_for_geojson()
+            df = self.rasters
+        self._stage_file(df_path.name, lambda path: save_gdf(df, path), renames)
+        obsolete_paths += [
+            gdf_file_path(self._connector_dir, df_name, storage_format)
+            for storage_format in STORAGE_FORMAT_SUFFIXES
+            if storage_format != self.storage_format
+        ] + [self._connector_dir / part for part in parts]
+        parts.clear()
+
+    def _stage_graph(
+        self,
+        compact: bool,
+        manifest: dict,
+        renames: list[tuple[Path, Path]],
+        obsolete_paths: list[Path],
+    ):
+        """Write graph or its new vertices and edges to a temporary file."""
+        if self.graph_file_format not in GRAPH_FILENAMES:
+            raise ValueError(
+                f"Unknown graph_file_format: {self.graph_file_format}. "
+                f"Should be one of {list(GRAPH_FILENAMES)}."
+            )
+        graph_filename = GRAPH_FILENAMES[self.graph_file_format]
+        parts = manifest["graph"]
+        changes = None
+        # rewrite if the graph file format changed
+        if (
+            self._saved_state is not None
+            and (self._connector_dir / graph_filename).is_file()
+        ):
+            changes = self._graph.change_log()
+
+        if changes == [] and not (compact and parts):
+            return
+
+        if changes and not compact and len(parts) < self.journal_max_parts:
+            part_name = self._new_part_name(manifest, "graph", ".json")
+            self._stage_file(
+                part_name, lambda path: _write_json(changes, path), renames
+            )
+            parts.append(part_name)
+            return
+
+        def write_graph(path: Path):
+            self._graph.save_to_file(path)
+            # save_to_file records the temporary path
+            self._graph.file_path = self._connector_dir / graph_filename
+
+        self._stage_file(graph_filename, write_graph, renames)
+        obsolete_paths += [
+            self._connector_dir / filename
+            for filename in GRAPH_FILENAMES.values()
+            if filename != graph_filename
+        ] + [self._connector_dir / part for part in parts]
+        parts.clear()
+
+    def _stage_attrs(self, renames: list[tuple[Path, Path]]):
+        """Write attrs to a temporary file if they changed."""
+        saveattrs = self._replace_path_values(self.attrs)
+        try:
+            attrs_str = json.dumps(saveattrs, ensure_ascii=False, indent=4)
+        except TypeError as exc:
+            raise TypeError(
+                "User defined attributes must be JSON-serializable."
+            ) from exc
+
+        if self._saved_state is not None and attrs_str == self._saved_state["attrs"]:
+            return
+
+        def write_attrs(path: Path):
+            with open(path, "w", encoding="utf-8") as write_file:
+                write_file.write(attrs_str)
+
+        self._stage_file(Path(self.attrs_path).name, write_attrs, renames)
+
+    def _stage_file(
+        self,
+        filename: str,
+        write: Callable[[Path], Any],
+        renames: list[tuple[Path, Path]],
+    ):
+        """Write file to a temporary path to be renamed when committing."""
+        tmp_path = self._connector_dir / f"{TMP_FILE_PREFIX}{filename}"
+        write(tmp_path)
+        renames.append((tmp_path, self._connector_dir / filename))
+
+    def _commit(self, manifest: dict, renames: list[tuple[Path, Path]]):
+        """Atomically replace journal manifest, then move staged files into place."""
+        manifest["pending_renames"] = [
+            [tmp_path.name, path.name] for tmp_path, path in renames
+        ]
+        self._write_journal_manifest(manifest)
+        _complete_renames(self._connector_dir, manifest)
+        manifest["pending_renames"] = []
+        self._write_journal_manifest(manifest)
+        self._journal_manifest = manifest
+
+    def _write_journal_manifest(self, manifest: dict):
+        manifest_path = self._connector_dir / JOURNAL_MANIFEST_FILENAME
+        tmp_path = self._connector_dir / f"{TMP_FILE_PREFIX}{manifest_path.name}"
+        _write_json(manifest, tmp_path)
+        os.replace(tmp_path, manifest_path)
+
+    def _get_journal_manifest(self) -> dict:
+        """Return journal manifest of the connector's files on disk."""
+        return self.__dict__.get("_journal_manifest") or empty_journal_manifest()
+
+    def _load_journal_manifest(self):
+        """Load journal manifest and complete renames of an interrupted save."""
+        manifest_path = self._connector_dir / JOURNAL_MANIFEST_FILENAME
+        if not manifest_path.is_file():
+            self._journal_manifest = empty_journal_manifest()
+            return
+
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest["pending_renames"]:
+            log.info("Completing interrupted save of connector.")
+            _complete_renames(self._connector_dir, manifest)
+        self._journal_manifest = manifest
+
+    def _apply_df_journal(
+        self,
+        df_name: Literal["vectors", "rasters"],
+        df: GeoDataFrame,
+        columns: list[str] | None = None,
+    ) -> GeoDataFrame:
+        """Apply journaled changes to vectors or rasters loaded from disk."""
+        for part in self._get_journal_manifest()[df_name]:
+            part_df = load_gdf(
+                self._connector_dir / part,
+                index_name=INDEX_NAMES[df_name],
+                columns=columns,
+            )
+            existing_rows = part_df.index.isin(df.index)
+            if existing_rows.any():
+                df.loc[part_df.index[existing_rows], part_df.columns] = part_df[
+                    existing_rows
+                ]
+            df = concat_gdfs([df, part_df[~existing_rows]])
+        return df
+
+    def _apply_graph_journal(self):
+        """Apply journaled changes to graph loaded from disk."""
+        for part in self._get_journal_manifest()["graph"]:
+            with open(self._connector_dir / part, "r", encoding="utf-8") as file:
+                changes = json.load(file)
+            for change in changes:
+                if change[0] == "vertex":
+                    _, vertex_name, vertex_color = change
+                    if not self._graph.exists_vertex(vertex_name, vertex_color):
+                        self._graph.add_vertex(vertex_name, vertex_color)
+                else:
+                    _, from_vertex, from_vertex_color, to_vertex, edge_data = change
+                    self._graph.add_edge(
+                        from_vertex, from_vertex_color, to_vertex, edge_data, force=True
+                    )
+
+    def _record_saved_state(self):
+        """Record state of components on disk to detect changes when saving."""
+        self._saved_state = {
+            "attrs": json.dumps(
+                self._replace_path_values(self.attrs), ensure_ascii=False, indent=4
+            ),
+            "raster_data_files": self._raster_data_files_saved(),
+        }
+        for df_name in ["vectors", "rasters"]:
+            df = getattr(self, df_name)
+            self._saved_state[df_name] = {
+                "dtypes": df.dtypes.astype(str).to_dict(),
+                "index": df.index,
+                "row_hashes": _row_hashes(df),
+            }
+        # names of changed rows (dicts as ordered sets) or None if all changed
+        self._changed_row_names = {"vectors": {}, "rasters": {}}
+        self._graph.start_change_log()
+
+    def _changed_rows(self, df_name: Literal["vectors", "rasters"]) -> pd.Index | None:
+        """Return names of rows that changed since the connector was last saved.
+
+        The tracked rows together with the saved rows whose non-geometry values
+        were modified in place.
+
+        Returns None if the changes can't be journaled, i.e. if the connector
+        was never saved, rows were dropped, or the columns changed.
+        """
+        if self._saved_state is None:
+            return None
+        changed_rows = self.__dict__["_changed_row_names"][df_name]
+        df = getattr(self, df_name)
+        saved_state = self._saved_state[df_name]
+        if (
+            changed_rows is None
+            or saved_state["row_hashes"] is None
+            or df.dtypes.astype(str).to_dict() != saved_state["dtypes"]
+        ):
+            return None
+
+        num_saved = len(saved_state["index"])
+        if not df.index[:num_saved].equals(saved_state["index"]):
+            return None
+        row_hashes = _row_hashes(df.iloc[:num_saved])
+        if row_hashes is None:
+            return None
+        modified_rows = saved_state["index"][row_hashes != saved_state["row_hashes"]]
+        return pd.Index(list(changed_rows)).union(modified_rows, sort=False)
+
+    @staticmethod
+    def _new_part_name(manifest: dict, component: str, suffix: str) -> str:
+        part_name = f"{component}.journal.{manifest['next_part']:06d}{suffix}"
+        manifest["next_part"] += 1
+        return part_name
+
+
+def _extends(new_df: GeoDataFrame, old_df: GeoDataFrame) -> bool:
+    """Return whether new_df agrees with old_df on its initial rows."""
+    num_old = len(old_df)
+    if len(new_df) < num_old or not new_df.index[:num_old].equals(old_df.index):
+        return False
+    if list(new_df.columns) != list(old_df.columns):
+        return False
+    if not all(
+        new_geom is old_geom
+        for new_geom, old_geom in zip(
+            new_df.geometry.values[:num_old], old_df.geometry.values
+        )
+    ):
+        return False
+    geometry_name = old_df.geometry.name
+    return pd.DataFrame(new_df.iloc[:num_old].drop(columns=geometry_name)).equals(
+        pd.DataFrame(old_df.drop(columns=geometry_name))
+    )
+
+
+def _row_hashes(df: GeoDataFrame) -> np.ndarray | None:
+    """Return hashes of the non-geometry values of the rows of a dataframe.
+
+    Returns None if the values can't be hashed (e.g. lists).
+    """
+    values = pd.DataFrame(df.drop(columns=df.geometry.name))
+    if values.columns.empty:
+        return np.zeros(len(df), dtype=np.uint64)
+    try:
+        return pd.util.hash_pandas_object(values, index=False).to_numpy()
+    except TypeError:
+        return None
+
+
+def _complete_renames(connector_dir: Path, manifest: dict):
+    for tmp_name, name in manifest["pending_renames"]:
+        tmp_path = connector_dir / tmp_name
+        if tmp_path.is_file():
+            os.replace(tmp_path, connector_dir / name)
+
+
+def _write_json(obj: Any, path: Path):
+    with open(path, "w", encoding="utf-8") as write_file:
+        json.dump(obj, write_file, ensure_ascii=False)
@@ -2,3 +2,4 @@ from geographer.label_makers.seg_label_maker_categorical import SegLabelMakerCat
 from geographer.label_makers.seg_label_maker_soft_categorical import (
     SegLabelMakerSoftCategorical,
 )
+from geographer.label_makers.label_provider import LabelProvider
@@ -8,11 +8,14 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel
 
 if TYPE_CHECKING:
+    from geopandas import GeoSeries
+
     from geographer.connector import Connector
 
 from geographer.base_model_dict_conversion.save_load_base_model_mixin import (
@@ -35,12 +38,17 @@ class LabelMaker(ABC, BaseModel, SaveAndLoadBaseModelMixIn):
         self,
         connector: Connector,
         raster_names: list[str] | None = None,
+        n_workers: int = 1,
+        executor: Executor | None = None,
     ):
         """Create segmentation labels.
 
         Args:
             raster_names: raster names to create labels for.
                 Defaults to None (i.e. all raster without a label).
+            n_workers: number of worker processes. Ignored if executor is
+                given. Defaults to 1.
+            executor: executor to make the labels with. Defaults to None.
         """
 
     @abstractmethod
@@ -60,10 +68,53 @@ class LabelMaker(ABC, BaseModel, SaveAndLoadBaseModelMixIn):
         self,
         connector: Connector,
         raster_names: list[str] | None = None,
+        n_workers: int = 1,
+        executor: Executor | None = None,
     ):
         """Recompute labels.
 
         Equivalent to delete_labels followed by make_labels
         """
         self.delete_labels(connector, raster_names)
-        self.make_labels(connector, raster_names)
+        self.make_labels(
+            connector, raster_names, n_workers=n_workers, executor=executor
+        )
+
+    def patch_labels(
+        self,
+        connector: Connector,
+        changed_geoms: GeoSeries,
+        raster_names: list[str] | None = None,
+    ):
+        """Update labels after vector features have been added or dropped.
+
+        Recomputes the labels of the rasters intersecting the changed vector
+        features. Override to update only the affected parts of the labels.
+
+        Args:
+            connector: connector
+            changed_geoms: geometries of the added or dropped vector features
+            raster_names: names of rasters whose labels are to be updated.
+                Defaults to None, i.e. all rasters intersecting changed_geoms.
+        """
+        if raster_names is None:
+            raster_names = self._rasters_intersecting_geoms(connector, changed_geoms)
+        self.recompute_labels(connector, raster_names)
+
+    @staticmethod
+    def _rasters_intersecting_geoms(
+        connector: Connector, geoms: GeoSeries
+    ) -> list[str]:
+        """Return names of rasters intersecting geometries."""
+        if geoms.crs is not None:
+            geoms = geoms.to_crs(epsg=connector.crs_epsg_code)
+        raster_names = {
+            raster_name
+            for geom in geoms
+            for raster_name in connector.rasters_in_bbox(geom)
+        }
+        return [
+            raster_name
+            for raster_name in connector.rasters.index
+            if raster_name in raster_names
+        ]
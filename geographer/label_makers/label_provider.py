@@ -0,0 +1,232 @@
+"""Label provider that makes segmentation labels on demand.
+
+Instead of writing label GeoTiffs for all rasters up front, a
+:class:`LabelProvider` rasterizes the label for a raster (or a window of
+it) when it is requested and keeps it in a size-bounded LRU cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+from rasterio.windows import Window
+
+if TYPE_CHECKING:
+    from geographer.connector import Connector
+    from geographer.label_makers.seg_label_maker_base import SegLabelMaker
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_CACHE_BYTES = 2**30
+CACHE_FILE_SUFFIX = ".npy"
+
+
+class LabelProvider:
+    """Makes segmentation labels on demand and caches them.
+
+    The label for a raster (or a window of a raster) is rasterized by the
+    label maker from the vector features intersecting the raster when it
+    is first requested. The labels are kept in a least recently used cache
+    of at most max_cache_bytes bytes, either in memory or as .npy files in
+    cache_dir. A cache_dir can be shared by several processes (e.g. data
+    loader workers) and reused in later runs, in that case the size bound
+    is enforced separately by each process.
+
+    The cache keys contain the label's fingerprint (a hash of the label
+    maker's fields, the connector's classes, and the names, geometries, and
+    values of the vector features intersecting the raster, see
+    :meth:`SegLabelMaker._label_fingerprint`), so e.g. adding, dropping, or
+    changing vector features or changing the connector's task_vector_classes
+    does not return stale labels. Use :meth:`invalidate` to remove labels
+    that are no longer needed from the cache.
+
+    Cached labels are read-only arrays.
+    """
+
+    def __init__(
+        self,
+        label_maker: SegLabelMaker,
+        connector: Connector,
+        max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        cache_dir: Path | str | None = None,
+    ):
+        """Initialize LabelProvider.
+
+        Args:
+            label_maker: label maker to make the labels with
+            connector: connector
+            max_cache_bytes: maximal size of the cached labels in bytes
+            cache_dir: directory to cache the labels in. Defaults to None,
+                i.e. cache the labels in memory.
+        """
+        self.label_maker = label_maker
+        self.connector = connector
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+        # cache key -> label (in memory) or file size (on disk), least
+        # recently used first
+        self._cache: OrderedDict[str, np.ndarray | int] = OrderedDict()
+        self._cache_bytes = 0
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_cache_dir()
+
+    def __call__(self, raster_name: str, window: Window | None = None) -> np.ndarray:
+        """Return label, see :meth:`get_label`."""
+        return self.get_label(raster_name, window)
+
+    def get_label(self, raster_name: str, window: Window | None = None) -> np.ndarray:
+        """Return label for a raster (or a window of it).
+
+        Args:
+            raster_name: name of raster
+            window: window of raster. Defaults to None, i.e. the whole raster.
+
+        Returns:
+            label of shape (number of bands, height, width)
+        """
+        key = self._cache_key(raster_name, window)
+
+        label = self._get_cached(key)
+        if label is not None:
+            self.hits += 1
+            return label
+
+        self.misses += 1
+        label = self.label_maker.make_label_array(self.connector, raster_name, window)
+        label.flags.writeable = False
+        self._put(key, label)
+        return label
+
+    def invalidate(self, raster_names: Sequence[str] | None = None):
+        """Remove cached labels.
+
+        Args:
+            raster_names: names of rasters whose labels (and windows of
+                labels) are to be removed. Defaults to None, i.e. all.
+        """
+        if raster_names is None:
+            prefixes = None
+        else:
+            prefixes = tuple(
+                f"{self._hash(raster_name)}_" for raster_name in raster_names
+            )
+
+        for key in list(self._cache):
+            if prefixes is None or key.startswith(prefixes):
+                self._evict(key)
+
+        # remove labels cached by other processes
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+                if prefixes is None or path.name.startswith(prefixes):
+                    path.unlink(missing_ok=True)
+
+    def _cache_key(self, raster_name: str, window: Window | None) -> str:
+        """Return cache key.
+
+        The key starts with a hash of the raster name so that cached labels
+        can be found by raster name, followed by a hash of the label's
+        fingerprint and the window.
+        """
+        fingerprint = self.label_maker._label_fingerprint(
+            self.connector,
+            raster_name,
+            *self.label_maker._lookup_label_vectors(self.connector, raster_name),
+        )
+        settings = json.dumps(
+            {
+                "fingerprint": fingerprint,
+                "window": None if window is None else list(window.flatten()),
+            },
+            sort_keys=True,
+        )
+        return f"{self._hash(raster_name)}_{self._hash(settings)}"
+
+    def _get_cached(self, key: str) -> np.ndarray | None:
+        """Return cached label or None."""
+        if self.cache_dir is None:
+            label = self._cache.get(key)
+            if label is not None:
+                self._cache.move_to_end(key)
+            return label
+
+        path = self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}"
+        try:
+            label = np.load(path)
+        except FileNotFoundError:
+            # possibly evicted by another process
+            self._forget(key)
+            return None
+
+        os.utime(path)  # for the LRU order in later runs
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._add_to_cache(key, path.stat().st_size)
+        label.flags.writeable = False
+        return label
+
+    def _put(self, key: str, label: np.ndarray):
+        """Add label to cache."""
+        if self.cache_dir is None:
+            self._add_to_cache(key, label)
+            return
+
+        # write atomically, other processes might read the cache_dir
+        path = self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, label)
+        os.replace(tmp_path, path)
+        self._add_to_cache(key, path.stat().st_size)
+
+    def _add_to_cache(self, key: str, value: np.ndarray | int):
+        """Add entry to cache and evict least recently used entries."""
+        self._forget(key)
+        self._cache[key] = value
+        self._cache_bytes += self._entry_bytes(value)
+
+        while self._cache_bytes > self.max_cache_bytes and self._cache:
+            self._evict(next(iter(self._cache)))
+
+    def _evict(self, key: str):
+        """Remove entry from cache (and its file from cache_dir)."""
+        self._forget(key)
+        if self.cache_dir is not None:
+            (self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}").unlink(missing_ok=True)
+
+    def _forget(self, key: str):
+        """Remove entry from cache, but not its file from cache_dir."""
+        value = self._cache.pop(key, None)
+        if value is not None:
+            self._cache_bytes -= self._entry_bytes(value)
+
+    def _load_cache_dir(self):
+        """Add labels cached in cache_dir (e.g. by earlier runs) to the cache."""
+        paths = sorted(
+            self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"),
+            key=lambda path: path.stat().st_mtime,
+        )
+        for path in paths:
+            self._add_to_cache(path.stem, path.stat().st_size)
+        log.debug("Found %s cached labels in %s", len(self._cache), self.cache_dir)
+
+    @staticmethod
+    def _entry_bytes(value: np.ndarray | int) -> int:
+        return value if isinstance(value, int) else value.nbytes
+
+    @staticmethod
+    def _hash(string: str) -> str:
+        return hashlib.sha1(string.encode()).hexdigest()[:16]
@@ -2,10 +2,33 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import math
 from abc import abstractmethod
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Any, Sequence
 
+import numpy as np
+import pandas as pd
+import rasterio as rio
+import shapely
+from affine import Affine
+from geopandas import GeoSeries
 from pydantic import BaseModel, Field
+from rasterio.errors import WindowError
+from rasterio.io import DatasetWriter
+from rasterio.windows import Window, from_bounds
+from rasterio.windows import bounds as window_bounds
+from shapely.geometry.base import BaseGeometry
 from tqdm.auto import tqdm
 
 from geographer.base_model_dict_conversion.save_load_base_model_mixin import (
@@ -13,10 +36,22 @@ from geographer.base_model_dict_conversion.save_load_base_model_mixin import (
 )
 from geographer.connector import Connector
 from geographer.label_makers.label_maker_base import LabelMaker
+from geographer.label_makers.label_provider import (
+    DEFAULT_MAX_CACHE_BYTES,
+    LabelProvider,
+)
+from geographer.utils.geotiff_profile import GeoTiffProfile
+from geographer.utils.utils import transform_shapely_geometries
 
 # logger
 log = logging.getLogger(__name__)
 
+# maximal number of labels submitted to an executor but not yet made
+MAX_PENDING_LABELS = 256
+
+# GeoTiff tag of labels containing the label fingerprint
+LABEL_FINGERPRINT_TAG = "GEOGRAPHER_LABEL_FINGERPRINT"
+
 
 class SegLabelMaker(LabelMaker, BaseModel, SaveAndLoadBaseModelMixIn):
     """Base class for segmentation label makers."""
@@ -24,12 +59,192 @@ class SegLabelMaker(LabelMaker, BaseModel, SaveAndLoadBaseModelMixIn):
     add_background_band: bool = Field(
         default=True, description="Whether to add implicit background band."
     )
+    output_profile: GeoTiffProfile = Field(
+        default_factory=GeoTiffProfile,
+        description="Creation profile for the labels. The default profile uses "
+        "the raster's profile.",
+    )
 
-    @abstractmethod
     def _make_label_for_raster(self, connector: Connector, raster_name: str):
         """Make label for single raster."""
+        label_inputs = self._get_label_inputs(connector, raster_name)
+        if label_inputs is not None:
+            self._make_label(**label_inputs)
+
+    @abstractmethod
+    def _get_label_inputs(
+        self, connector: Connector, raster_name: str
+    ) -> dict[str, Any] | None:
+        """Return keyword arguments for :meth:`_make_label` for a raster.
+
+        Extracts everything needed to make the label from the connector
+        (e.g. the vector geometries in the raster's crs), so that
+        :meth:`_make_label` can run in a worker process without the
+        connector.
+
+        Returns:
+            keyword arguments for :meth:`_make_label`, or None if no label
+            is to be made.
+        """
+        pass
+
+    @abstractmethod
+    def _make_label(self, **label_inputs: Any):
+        """Make label from the output of :meth:`_get_label_inputs`."""
+        pass
+
+    @abstractmethod
+    def _lookup_label_vectors(
+        self, connector: Connector, raster_name: str
+    ) -> tuple[pd.Index, np.ndarray]:
+        """Return names and values of vector features to burn into label."""
+        pass
+
+    def _label_fingerprint(
+        self,
+        connector: Connector,
+        raster_name: str,
+        vector_names: Sequence[str | int] | pd.Index,
+        vector_values: np.ndarray,
+    ) -> str:
+        """Return fingerprint of a raster's label.
+
+        The fingerprint is a hash of the label maker's fields, the
+        connector's classes, the raster's footprint, and the names,
+        geometries (as WKB) and values of the vector features burnt into
+        the label. If the fingerprint doesn't change neither does the label.
+
+        Args:
+            connector: connector
+            raster_name: name of raster
+            vector_names: names of vector features burnt into label
+            vector_values: values of vector features, as returned by
+                :meth:`_lookup_label_vectors`
+
+        Returns:
+            fingerprint
+        """
+        settings = {
+            "label_maker": self.model_dump(mode="json"),
+            "label_maker_class": type(self).__name__,
+            "task_vector_classes": list(connector.task_vector_classes),
+            "background_class": connector.background_class,
+            "crs_epsg_code": connector.crs_epsg_code,
+            "orig_crs_epsg_code": int(
+                connector.rasters.loc[raster_name, "orig_crs_epsg_code"]
+            ),
+            "vector_names": [str(vector_name) for vector_name in vector_names],
+        }
+        vector_values = np.ascontiguousarray(vector_values)
+
+        fingerprint = hashlib.sha256()
+        fingerprint.update(json.dumps(settings, sort_keys=True).encode())
+        fingerprint.update(connector.rasters.geometry.loc[raster_name].wkb)
+        for wkb in connector.vectors.geometry.loc[vector_names].to_wkb():
+            fingerprint.update(wkb)
+        fingerprint.update(f"{vector_values.dtype}{vector_values.shape}".encode())
+        fingerprint.update(vector_values.tobytes())
+        return fingerprint.hexdigest()
+
+    def _label_is_up_to_date(self, connector: Connector, raster_name: str) -> bool:
+        """Return whether label exists and its fingerprint is up to date."""
+        label_path = connector.labels_dir / raster_name
+        if not connector.raster_data_file_exists(label_path):
+            return False
+
+        with rio.open(label_path) as src:
+            stored_fingerprint = src.tags().get(LABEL_FINGERPRINT_TAG)
+        if stored_fingerprint is None:
+            return False
+
+        fingerprint = self._label_fingerprint(
+            connector, raster_name, *self._lookup_label_vectors(connector, raster_name)
+        )
+        return fingerprint == stored_fingerprint
+
+    @abstractmethod
+    def _get_label_vectors(
+        self, connector: Connector, raster_name: str
+    ) -> dict[str, Any]:
+        """Return keyword arguments for :meth:`_rasterize_label` for a raster.
+
+        E.g. the geometries (in the raster's crs) of the vector features
+        intersecting the raster and the values to burn in.
+        """
         pass
 
+    @abstractmethod
+    def _rasterize_label(
+        self, out_shape: tuple[int, int], transform: Affine, **label_vectors: Any
+    ) -> np.ndarray:
+        """Rasterize label with given shape and transform.
+
+        Args:
+            out_shape: shape (height, width) of label
+            transform: transform of label
+            label_vectors: output of :meth:`_get_label_vectors`
+
+        Returns:
+            label of shape (number of bands, height, width)
+        """
+        pass
+
+    def make_label_array(
+        self,
+        connector: Connector,
+        raster_name: str,
+        window: Window | None = None,
+    ) -> np.ndarray:
+        """Return label for a raster (or a window of it) without writing it.
+
+        The array is the same as the one :meth:`make_labels` would write to
+        the label GeoTiff (or the corresponding window of it).
+
+        Args:
+            connector: connector
+            raster_name: name of raster
+            window: window of raster. Defaults to None, i.e. the whole raster.
+
+        Returns:
+            label of shape (number of bands, height, width)
+        """
+        with rio.open(connector.rasters_dir / raster_name) as src:
+            if window is None:
+                window = Window(0, 0, src.width, src.height)
+            transform = src.window_transform(window)
+
+        return self._rasterize_label(
+            (int(window.height), int(window.width)),
+            transform,
+            **self._get_label_vectors(connector, raster_name),
+        )
+
+    def label_provider(
+        self,
+        connector: Connector,
+        max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        cache_dir: Path | str | None = None,
+    ) -> LabelProvider:
+        """Return label provider making labels on demand.
+
+        See :class:`LabelProvider`.
+
+        Args:
+            connector: connector
+            max_cache_bytes: maximal size of the cached labels in bytes
+            cache_dir: directory to cache the labels in. Defaults to None,
+                i.e. cache the labels in memory.
+
+        Returns:
+            label provider
+        """
+        return LabelProvider(
+            label_maker=self,
+            connector=connector,
+            max_cache_bytes=max_cache_bytes,
+            cache_dir=cache_dir,
+        )
+
     @property
     @abstractmethod
     def label_type(self) -> str:
@@ -56,12 +271,22 @@ class SegLabelMaker(LabelMaker, BaseModel, SaveAndLoadBaseModelMixIn):
         self,
         connector: Connector,
         raster_names: list[str] | None = None,
+        n_workers: int = 1,
+        executor: Executor | None = None,
     ):
         """Create segmentation labels.
 
+        The vector features for each label are extracted from the connector
+        in the calling process. If n_workers > 1 or an executor is given,
+        the labels are rasterized and written by worker processes. The
+        labels are the same as when making them serially.
+
         Args:
             raster_names: list of raster names to create labels for.
                 Defaults to None (i.e. all rasters without a label).
+            n_workers: number of worker processes. Ignored if executor is
+                given. Defaults to 1, i.e. make labels serially.
+            executor: executor to make the labels with. Defaults to None.
         """
         # safety checks
         self._run_safety_checks(connector)
@@ -70,19 +295,13 @@ class SegLabelMaker(LabelMaker, BaseModel, SaveAndLoadBaseModelMixIn):
 
         connector.labels_dir.mkdir(parents=True, exist_ok=True)
 
-        existing_rasters = {
-            raster_path.name
-            for raster_path in connector.rasters_dir.iterdir()
-            if raster_path.is_file() and raster_path.name in connector.rasters.index
-        }
+        existing_rasters = connector.raster_data_file_names(
+            connector.rasters_dir
+        ) & set(connector.rasters.index)
 
         if raster_names is None:
             # Find rasters without labels
-            existing_labels = {
-                raster_path.name
-                for raster_path in connector.labels_dir.iterdir()
-                if raster_path.is_file() and raster_path.name in connector.rasters.index
-            }
+            existing_labels = connector.raster_data_file_names(connector.labels_dir)
             raster_names = existing_rasters - existing_labels
         elif not set(raster_names) <= existing_rasters:
             raise FileNotFoundError(
@@ -90,13 +309,213 @@ class SegLabelMaker(LabelMaker, BaseModel, SaveAndLoadBaseModelMixIn):
                 f"{existing_rasters - raster_names}"
             )
 
-        for raster_name in tqdm(raster_names, desc="Making labels: "):
-            self._make_label_for_raster(connector=connector, raster_name=raster_name)
+        if executor is not None:
+            self._make_labels_with_executor(connector, raster_names, executor)
+        elif n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                self._make_labels_with_executor(connector, raster_names, executor)
+        else:
+            for raster_name in tqdm(raster_names, desc="Making labels: "):
+                self._make_label_for_raster(
+                    connector=connector, raster_name=raster_name
+                )
+
+        # record the new labels in the connector's manifest of raster data files
+        connector.record_raster_data_files(
+            connector.labels_dir / raster_name for raster_name in raster_names
+        )
 
         connector.attrs["label_type"] = self.label_type
         self._after_make_labels(connector)
         connector.save()
 
+    def _make_labels_with_executor(
+        self,
+        connector: Connector,
+        raster_names: list[str] | set[str],
+        executor: Executor,
+    ):
+        """Make labels with executor.
+
+        At most MAX_PENDING_LABELS labels are pending at any time, so the
+        label inputs for all rasters are never held in memory at once.
+        """
+        pending: set[Future] = set()
+        for raster_name in tqdm(raster_names, desc="Making labels: "):
+            label_inputs = self._get_label_inputs(connector, raster_name)
+            if label_inputs is None:
+                continue
+            if len(pending) >= MAX_PENDING_LABELS:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()  # raise exceptions from worker
+            pending.add(executor.submit(self._make_label, **label_inputs))
+
+        for future in wait(pending).done:
+            future.result()
+
+    def recompute_labels(
+        self,
+        connector: Connector,
+        raster_names: list[str] | None = None,
+        n_workers: int = 1,
+        executor: Executor | None = None,
+    ):
+        """Recompute labels.
+
+        Equivalent to delete_labels followed by make_labels, except that
+        labels whose fingerprint (see :meth:`_label_fingerprint`) matches
+        the fingerprint stored in the label are skipped.
+
+        Args:
+            raster_names: names of rasters for which to recompute labels.
+                Defaults to None, i.e. all labels.
+            n_workers: number of worker processes. Ignored if executor is
+                given. Defaults to 1.
+            executor: executor to make the labels with. Defaults to None.
+        """
+        self._run_safety_checks(connector)
+
+        if raster_names is None:
+            raster_names = connector.rasters.index.tolist()
+
+        raster_names_to_recompute = [
+            raster_name
+            for raster_name in tqdm(raster_names, desc="Comparing fingerprints: ")
+            if not self._label_is_up_to_date(connector, raster_name)
+        ]
+        log.info(
+            "Recomputing %s labels, %s labels are up to date",
+            len(raster_names_to_recompute),
+            len(raster_names) - len(raster_names_to_recompute),
+        )
+
+        self.delete_labels(connector, raster_names_to_recompute)
+        self.make_labels(
+            connector,
+            raster_names_to_recompute,
+            n_workers=n_workers,
+            executor=executor,
+        )
+
+    def patch_labels(
+        self,
+        connector: Connector,
+        changed_geoms: GeoSeries,
+        raster_names: list[str] | None = None,
+    ):
+        """Update labels in place after vector features were added or dropped.
+
+        For each label only the pixel windows covered by the bounding boxes of
+        the changed vector features intersecting the raster are rasterized
+        again (from the vector features intersecting the window) and written
+        back to the label.
+        Labels that don't exist yet and COG labels are made from scratch.
+
+        Assumes the labels were up to date before the change. If a vector
+        feature's geometry was changed, pass both the old and new geometry.
+
+        Args:
+            connector: connector
+            changed_geoms: geometries of the added or dropped vector features
+            raster_names: names of rasters whose labels are to be updated.
+                Defaults to None, i.e. all rasters intersecting changed_geoms.
+        """
+        if len(changed_geoms) == 0:
+            return
+        self._run_safety_checks(connector)
+
+        if changed_geoms.crs is not None:
+            changed_geoms = changed_geoms.to_crs(epsg=connector.crs_epsg_code)
+        if raster_names is None:
+            raster_names = self._rasters_intersecting_geoms(connector, changed_geoms)
+
+        raster_names_to_recompute = []
+        for raster_name in tqdm(raster_names, desc="Patching labels: "):
+            if self.output_profile.cog or not connector.raster_data_file_exists(
+                connector.labels_dir / raster_name
+            ):
+                raster_names_to_recompute.append(raster_name)
+            else:
+                self._patch_label(connector, raster_name, changed_geoms)
+                connector.record_raster_data_files([connector.labels_dir / raster_name])
+
+        if raster_names_to_recompute:
+            self.recompute_labels(connector, raster_names_to_recompute)
+
+    def _patch_label(
+        self, connector: Connector, raster_name: str, changed_geoms: GeoSeries
+    ):
+        """Rasterize windows of label covered by changed geometries again.
+
+        Each changed geometry intersecting the raster gets its own window, so
+        changed geometries far apart don't lead to rasterizing the pixels
+        between them.
+        """
+        changed_geoms = changed_geoms.values[
+            shapely.intersects(
+                changed_geoms.values, connector.rasters.geometry.loc[raster_name]
+            )
+        ]
+        orig_crs_epsg_code = int(
+            connector.rasters.loc[raster_name, "orig_crs_epsg_code"]
+        )
+        changed_geoms_in_raster_crs = transform_shapely_geometries(
+            changed_geoms, connector.crs_epsg_code, orig_crs_epsg_code
+        )
+
+        with rio.open(connector.labels_dir / raster_name, "r+") as dst:
+            label_vectors = None
+            for changed_geom in changed_geoms_in_raster_crs:
+                window = self._patch_window(changed_geom, dst)
+                if window is None:
+                    continue
+                if label_vectors is None:
+                    label_vectors = self._get_label_vectors(connector, raster_name)
+
+                # rasterize the vector features intersecting the window ...
+                window_bbox = shapely.box(*window_bounds(window, dst.transform))
+                in_window = shapely.intersects(
+                    label_vectors["vector_geoms"], window_bbox
+                )
+                label = self._rasterize_label(
+                    (int(window.height), int(window.width)),
+                    dst.window_transform(window),
+                    **{key: value[in_window] for key, value in label_vectors.items()},
+                )
+
+                # ... and write them to the window.
+                dst.write(label.astype(dst.dtypes[0], copy=False), window=window)
+
+            dst.update_tags(
+                **{
+                    LABEL_FINGERPRINT_TAG: self._label_fingerprint(
+                        connector,
+                        raster_name,
+                        *self._lookup_label_vectors(connector, raster_name),
+                    )
+                }
+            )
+
+    @staticmethod
+    def _patch_window(geom: BaseGeometry, dst: DatasetWriter) -> Window | None:
+        """Return pixel window containing all pixels a geometry touches.
+
+        Returns None if the geometry doesn't touch any pixels of the raster.
+        """
+        window = from_bounds(*geom.bounds, transform=dst.transform)
+        col_off, row_off = math.floor(window.col_off), math.floor(window.row_off)
+        window = Window(
+            col_off,
+            row_off,
+            math.floor(window.col_off + window.width) + 1 - col_off,
+            math.floor(window.row_off + window.height) + 1 - row_off,
+        )
+        try:
+            return window.intersection(Window(0, 0, dst.width, dst.height))
+        except WindowError:
+            return None
+
     def delete_labels(
         self,
         connector: Connector,
@@ -111,8 +530,12 @@ class SegLabelMaker(LabelMaker, BaseModel, SaveAndLoadBaseModelMixIn):
         if raster_names is None:
             raster_names = connector.rasters.index
 
-        for raster_name in tqdm(raster_names, desc="Deleting labels: "):
-            (connector.labels_dir / raster_name).unlink(missing_ok=True)
+        label_paths = [
+            connector.labels_dir / raster_name for raster_name in raster_names
+        ]
+        for label_path in tqdm(label_paths, desc="Deleting labels: "):
+            label_path.unlink(missing_ok=True)
+        connector.forget_raster_data_files(label_paths)
 
     def _set_label_type_in_connector_attrs(self, connector: Connector):
         connector.attrs["label_type"] = self.label_type
@@ -126,11 +549,7 @@ class SegLabelMaker(LabelMaker, BaseModel, SaveAndLoadBaseModelMixIn):
         Raises warnings if there is a discrepancy.
         """
         # Find the set of existing rasters in the dataset, ...
-        existing_rasters = {
-            raster_path.name
-            for raster_path in connector.rasters_dir.iterdir()
-            if raster_path.is_file()
-        }
+        existing_rasters = connector.raster_data_file_names(connector.rasters_dir)
 
         # ... then if the set of rasters is a strict subset
         # of the rasters in rasters ...
@@ -1,15 +1,23 @@
 """Label maker for categorical segmentation labels."""
 
+from __future__ import annotations
+
 import logging
+import time
+from pathlib import Path
+from typing import Any
 
 import numpy as np
+import pandas as pd
 import rasterio as rio
-from geopandas import GeoDataFrame
+from affine import Affine
 from rasterio.features import rasterize
 
 from geographer.connector import Connector
-from geographer.label_makers.seg_label_maker_base import SegLabelMaker
-from geographer.utils.utils import transform_shapely_geometry
+from geographer.label_makers.seg_label_maker_base import (
+    LABEL_FINGERPRINT_TAG,
+    SegLabelMaker,
+)
 
 log = logging.getLogger(__name__)
 
@@ -22,19 +30,80 @@ class SegLabelMakerCategorical(SegLabelMaker):
         """Return label type."""
         return "categorical"
 
-    def _make_label_for_raster(self, connector: Connector, raster_name: str):
-        """Create a categorical GeoTiff (pixel) label for a raster.
+    def _get_label_inputs(
+        self, connector: Connector, raster_name: str
+    ) -> dict[str, Any] | None:
+        """Return inputs for creating a categorical label for a raster.
 
         Args:
-            connector:
+            connector: connector
             raster_name: Name of raster for which a label should be created.
 
         Returns:
-            None:
+            keyword arguments for :meth:`_make_label`, or None if the raster
+            does not exist or the label already exists.
         """
         raster_path = connector.rasters_dir / raster_name
         label_path = connector.labels_dir / raster_name
 
+        # If the raster does not exist ...
+        if not connector.raster_data_file_exists(raster_path):
+            # ... log error to file.
+            log.error(
+                "SegLabelMakerCategorical: input raster %s does not exist!", raster_path
+            )
+            return None
+
+        # Else, if the label already exists ...
+        if connector.raster_data_file_exists(label_path):
+            # ... log error to file.
+            log.error("SegLabelMakerCategorical: label %s already exists!", label_path)
+            return None
+
+        # Else, find the vector features to burn into the label ...
+        start_time = time.perf_counter()
+        vector_names, label_values = self._lookup_label_vectors(connector, raster_name)
+        fingerprint = self._label_fingerprint(
+            connector, raster_name, vector_names, label_values
+        )
+        lookup_time = time.perf_counter() - start_time
+
+        # ... and get their geometries in the crs of the raster.
+        start_time = time.perf_counter()
+        vector_geoms = connector.vector_geoms_in_crs(
+            vector_names, connector.rasters.loc[raster_name, "orig_crs_epsg_code"]
+        )
+        reproject_time = time.perf_counter() - start_time
+
+        return {
+            "raster_path": raster_path,
+            "label_path": label_path,
+            "vector_geoms": vector_geoms,
+            "label_values": label_values,
+            "fingerprint": fingerprint,
+            "lookup_time": lookup_time,
+            "reproject_time": reproject_time,
+        }
+
+    def _get_label_vectors(
+        self, connector: Connector, raster_name: str
+    ) -> dict[str, np.ndarray]:
+        """Return geometries (in the raster's crs) and values to burn in."""
+        vector_names, label_values = self._lookup_label_vectors(connector, raster_name)
+        vector_geoms = connector.vector_geoms_in_crs(
+            vector_names, connector.rasters.loc[raster_name, "orig_crs_epsg_code"]
+        )
+        return {"vector_geoms": vector_geoms, "label_values": label_values}
+
+    @staticmethod
+    def _lookup_label_vectors(
+        connector: Connector, raster_name: str
+    ) -> tuple[pd.Index, np.ndarray]:
+        """Return names and label values of vector features to burn in.
+
+        The vector features are sorted by label value, since (as before)
+        later classes overwrite earlier ones.
+        """
         classes_to_ignore = {
             class_ for class_ in [connector.background_class] if class_ is not None
         }
@@ -44,98 +113,118 @@ class SegLabelMakerCategorical(SegLabelMaker):
             if class_ not in classes_to_ignore
         ]
 
-        # If the raster does not exist ...
-        if not raster_path.is_file():
-            # ... log error to file.
-            log.error(
-                "SegLabelMakerCategorical: input raster %s does not exist!", raster_path
+        # Find the vector features intersecting the raster ...
+        vector_names = connector.vectors_intersecting_raster(raster_name)
+        vector_types = connector.vectors.loc[vector_names, "type"]
+
+        # ... and map their classes to label values (0 for ignored classes).
+        label_values = (
+            pd.Categorical(vector_types, categories=segmentation_classes).codes.astype(
+                np.int64
             )
+            + 1
+        )
+        burn_in = np.flatnonzero(label_values)
+        burn_in = burn_in[np.argsort(label_values[burn_in], kind="stable")]
+
+        return vector_types.index[burn_in], label_values[burn_in]
+
+    def _rasterize_label(
+        self,
+        out_shape: tuple[int, int],
+        transform: Affine,
+        vector_geoms: np.ndarray,
+        label_values: np.ndarray,
+    ) -> np.ndarray:
+        """Rasterize categorical label.
 
-        # Else, if the label already exists ...
-        elif label_path.is_file():
-            # ... log error to file.
-            log.error("SegLabelMakerCategorical: label %s already exists!", label_path)
+        Args:
+            out_shape: shape (height, width) of label
+            transform: transform of label
+            vector_geoms: geometries (in the raster's crs) to burn in
+            label_values: label values to burn in, one for each geometry
 
-        # Else, ...
-        else:
-            # ...open the raster, ...
-            with rio.open(raster_path) as src:
-                profile = src.profile
-                profile.update({"count": 1, "dtype": rio.uint8})
-
-                # ... open the label ...
-                with rio.open(
-                    label_path,
-                    "w",
-                    # for writing single bit raster, see
-                    # https://gis.stackexchange.com/questions/338410/rasterio-invalid-dtype-bool
-                    # nbits=1,
-                    **profile,
-                ) as dst:
-                    # ... create an empty band of zeros (background class) ...
-                    label = np.zeros((src.height, src.width), dtype=np.uint8)
-
-                    # and build up the shapes to be burnt in
-                    shapes = []  # pairs of geometries and values to burn in
-
-                    for count, seg_class in enumerate(segmentation_classes, start=1):
-                        # To do that, first find (the df of) the geometries
-                        # intersecting the raster ...
-                        vectors_intersecting_raster: GeoDataFrame = (
-                            connector.vectors.loc[
-                                connector.vectors_intersecting_raster(raster_name)
-                            ]
-                        )
-
-                        # ... then restrict to (the subdf of) geometries
-                        # with the given class.
-                        vectors_intersecting_raster_of_type: GeoDataFrame = (
-                            vectors_intersecting_raster.loc[
-                                vectors_intersecting_raster["type"] == seg_class
-                            ]
-                        )
-
-                        # Extract those geometries ...
-                        vector_geoms_in_std_crs = list(
-                            vectors_intersecting_raster_of_type["geometry"]
-                        )
-
-                        # ... and convert them to the crs of the source raster.
-                        vector_geoms_in_src_crs = list(
-                            map(
-                                lambda geom: transform_shapely_geometry(
-                                    geom,
-                                    connector.vectors.crs.to_epsg(),
-                                    src.crs.to_epsg(),
-                                ),
-                                vector_geoms_in_std_crs,
-                            )
-                        )
-
-                        shapes_for_seg_class = [
-                            (vector_geom, count)
-                            for vector_geom in vector_geoms_in_src_crs
-                        ]
-
-                        shapes += shapes_for_seg_class
-
-                    # Burn the geomes into the label.
-                    if len(shapes) != 0:
-                        rasterize(
-                            shapes=shapes,
-                            out_shape=(
-                                src.height,
-                                src.width,
-                            ),  # or the other way around?
-                            fill=0,
-                            merge_alg=rio.enums.MergeAlg.replace,
-                            out=label,
-                            transform=src.transform,
-                            dtype=rio.uint8,
-                        )
-
-                    # Write label to file.
-                    dst.write(label, 1)
+        Returns:
+            uint8 label of shape (1, height, width)
+        """
+        # Create an empty band of zeros (background class) ...
+        label = np.zeros((1, *out_shape), dtype=np.uint8)
+
+        # ... and burn the geometries into the label.
+        if len(vector_geoms) != 0:
+            rasterize(
+                shapes=zip(vector_geoms, label_values.tolist()),
+                out_shape=out_shape,
+                fill=0,
+                merge_alg=rio.enums.MergeAlg.replace,
+                out=label[0],
+                transform=transform,
+                dtype=rio.uint8,
+            )
+
+        return label
+
+    def _make_label(
+        self,
+        raster_path: Path,
+        label_path: Path,
+        vector_geoms: np.ndarray,
+        label_values: np.ndarray,
+        fingerprint: str | None = None,
+        lookup_time: float = 0.0,
+        reproject_time: float = 0.0,
+    ):
+        """Create a categorical GeoTiff (pixel) label for a raster.
+
+        Args:
+            raster_path: path of raster
+            label_path: path of label to be created
+            vector_geoms: geometries (in the raster's crs) to burn in
+            label_values: label values to burn in, one for each geometry
+            fingerprint: fingerprint of label to store in the label
+            lookup_time: time taken to look up the vector features
+            reproject_time: time taken to reproject the vector features
+        """
+        # Open the raster, ...
+        with rio.open(raster_path) as src:
+            profile = src.profile
+            profile.update({"count": 1, "dtype": rio.uint8})
+
+            # ... open the label ...
+            with self.output_profile.open(
+                label_path,
+                "w",
+                # for writing single bit raster, see
+                # https://gis.stackexchange.com/questions/338410/rasterio-invalid-dtype-bool
+                # nbits=1,
+                **profile,
+            ) as dst:
+                # ... burn the geometries into the label ...
+                start_time = time.perf_counter()
+                label = self._rasterize_label(
+                    (src.height, src.width), src.transform, vector_geoms, label_values
+                )
+                rasterize_time = time.perf_counter() - start_time
+
+                # ... and write the label to file.
+                start_time = time.perf_counter()
+                dst.write(label)
+                if fingerprint is not None:
+                    dst.update_tags(**{LABEL_FINGERPRINT_TAG: fingerprint})
+                write_time = time.perf_counter() - start_time
+
+        log.debug(
+            "SegLabelMakerCategorical: made label %s (%s vector features) "
+            "in %.3fs: lookup %.3fs, reproject %.3fs, rasterize %.3fs, "
+            "write %.3fs",
+            label_path.name,
+            len(vector_geoms),
+            lookup_time + reproject_time + rasterize_time + write_time,
+            lookup_time,
+            reproject_time,
+            rasterize_time,
+            write_time,
+        )
 
     def _run_safety_checks(self, connector: Connector):
         """Run safety checks.
@@ -3,15 +3,24 @@
 Soft-categorical are probabilistic multi-class labels.
 """
 
+from __future__ import annotations
+
 import logging
+from pathlib import Path
+from typing import Any, Literal
 
 import numpy as np
+import pandas as pd
 import rasterio as rio
+from affine import Affine
+from pydantic import Field, model_validator
 from rasterio.features import rasterize
 
 from geographer.connector import Connector
-from geographer.label_makers.seg_label_maker_base import SegLabelMaker
-from geographer.utils.utils import transform_shapely_geometry
+from geographer.label_makers.seg_label_maker_base import (
+    LABEL_FINGERPRINT_TAG,
+    SegLabelMaker,
+)
 
 log = logging.getLogger(__name__)
 
@@ -24,145 +33,218 @@ class SegLabelMakerSoftCategorical(SegLabelMaker):
     Assumes the connector's vectors contains for each segmentation class
     a "prob_seg_class<seg_class>" column containing the probabilities
     for that class.
+
+    The probabilities are stored as float32, float16, or uint8 (scaled by
+    255, the scale is recorded in the labels' band metadata) depending on
+    probability_dtype.
     """
 
     add_background_band: bool
+    probability_dtype: Literal["float32", "float16", "uint8"] = Field(
+        default="float32",
+        description="Storage type of the probabilities. float16 is stored as "
+        "16 bit floating point GeoTiff (NBITS=16) and not supported for COGs.",
+    )
+
+    @model_validator(mode="after")
+    def no_float16_for_cogs(self) -> SegLabelMakerSoftCategorical:
+        """Validate float16 probabilities are not used with COGs."""
+        if self.probability_dtype == "float16" and self.output_profile.cog:
+            raise ValueError("probability_dtype float16 is not supported for COGs")
+        return self
 
     @property
     def label_type(self):
         """Return label_type."""
         return "soft-categorical"
 
-    def _make_label_for_raster(
-        self,
-        connector: Connector,
-        raster_name: str,
-    ) -> None:
-        """Create (pixel) label for a raster.
+    def _get_label_inputs(
+        self, connector: Connector, raster_name: str
+    ) -> dict[str, Any] | None:
+        """Return inputs for creating a (pixel) label for a raster.
 
         Args:
             connector : calling Connector
             raster_name: name of raster for which a label should be created
 
-
         Returns:
-            None:
+            keyword arguments for :meth:`_make_label`, or None if the raster
+            does not exist or the label already exists.
         """
         # paths
         raster_path = connector.rasters_dir / raster_name
         label_path = connector.labels_dir / raster_name
 
         # If the raster does not exist ...
-        if not raster_path.is_file():
+        if not connector.raster_data_file_exists(raster_path):
             # ... log error to file.
             log.error(
                 "_make_geotif_label_soft_categorical: input raster %s does not exist!",
                 raster_path,
             )
+            return None
 
         # Else, if the label already exists ...
-        elif label_path.is_file():
+        if connector.raster_data_file_exists(label_path):
             # ... log error to file.
             log.error(
                 "_make_geotif_label_soft_categorical: label %s already exists!",
                 label_path,
             )
+            return None
+
+        # Else, find the geoms and class probabilities ...
+        vector_names, class_probabilities = self._lookup_label_vectors(
+            connector, raster_name
+        )
+
+        # ... and get the geoms in the crs of the raster.
+        vector_geoms = connector.vector_geoms_in_crs(
+            vector_names, connector.rasters.loc[raster_name, "orig_crs_epsg_code"]
+        )
+
+        return {
+            "raster_path": raster_path,
+            "label_path": label_path,
+            "vector_geoms": vector_geoms,
+            "class_probabilities": class_probabilities,
+            "fingerprint": self._label_fingerprint(
+                connector, raster_name, vector_names, class_probabilities
+            ),
+        }
+
+    def _get_label_vectors(
+        self, connector: Connector, raster_name: str
+    ) -> dict[str, np.ndarray]:
+        """Return geometries (in the raster's crs) and class probabilities."""
+        vector_names, class_probabilities = self._lookup_label_vectors(
+            connector, raster_name
+        )
+        vector_geoms = connector.vector_geoms_in_crs(
+            vector_names, connector.rasters.loc[raster_name, "orig_crs_epsg_code"]
+        )
+        return {
+            "vector_geoms": vector_geoms,
+            "class_probabilities": class_probabilities,
+        }
+
+    @staticmethod
+    def _lookup_label_vectors(
+        connector: Connector, raster_name: str
+    ) -> tuple[pd.Index, np.ndarray]:
+        """Return names and class probabilities of geoms intersecting raster.
+
+        The class probabilities array has one column per segmentation class.
+        """
+        vector_names = pd.Index(connector.vectors_intersecting_raster(raster_name))
+        class_probabilities = connector.vectors.loc[
+            vector_names,
+            [
+                f"prob_of_class_{seg_class}"
+                for seg_class in connector.task_vector_classes
+            ],
+        ].to_numpy()
+        return vector_names, class_probabilities
+
+    def _rasterize_label(
+        self,
+        out_shape: tuple[int, int],
+        transform: Affine,
+        vector_geoms: np.ndarray,
+        class_probabilities: np.ndarray,
+    ) -> np.ndarray:
+        """Rasterize soft-categorical label.
+
+        Args:
+            out_shape: shape (height, width) of label
+            transform: transform of label
+            vector_geoms: geometries (in the raster's crs) intersecting the raster
+            class_probabilities: array of shape (number of geometries, number
+                of segmentation classes) of class probabilities
+
+        Returns:
+            label of shape (number of bands, height, width) with dtype uint8
+            if probability_dtype is uint8 and float32 otherwise (float16
+            labels are rounded to 16 bits by GDAL when writing)
+        """
+        num_seg_classes = class_probabilities.shape[1]
+        label_bands_count = num_seg_classes + int(self.add_background_band)
+
+        # (if an implicit background band is to be included,
+        # it will go in band/channel 1.)
+        start_band = 1 if not self.add_background_band else 2
+
+        # Create the label with one band for each segmentation class ...
+        label = np.zeros((label_bands_count, *out_shape), np.float32)
+
+        # ... and burn the class probabilities into the class bands.
+        if len(vector_geoms) != 0:
+            for class_index in range(num_seg_classes):
+                rasterize(
+                    shapes=zip(
+                        vector_geoms, class_probabilities[:, class_index].tolist()
+                    ),
+                    out=label[start_band - 1 + class_index],
+                    transform=transform,
+                )
+
+        # If the background is not included in the segmentation classes ...
+        if self.add_background_band:
+            # ... fill the background band. The probability of a pixel
+            # belonging to the background is the complement of it
+            # belonging to some segmentation class.
+            np.subtract(1, np.add.reduce(label[1:], axis=0), out=label[0])
+
+        if self.probability_dtype == "uint8":
+            # scale in place to avoid float32 temporaries of the label's size
+            np.clip(label, 0, 1, out=label)
+            np.multiply(label, 255, out=label)
+            np.rint(label, out=label)
+            return label.astype(np.uint8)
+        return label
+
+    def _make_label(
+        self,
+        raster_path: Path,
+        label_path: Path,
+        vector_geoms: np.ndarray,
+        class_probabilities: np.ndarray,
+        fingerprint: str | None = None,
+    ) -> None:
+        """Create (pixel) label for a raster.
+
+        Args:
+            raster_path: path of raster
+            label_path: path of label to be created
+            vector_geoms: geometries (in the raster's crs) intersecting the raster
+            class_probabilities: array of shape (number of geometries, number
+                of segmentation classes) of class probabilities
+            fingerprint: fingerprint of label to store in the label
+        """
+        # Open the raster, ...
+        with rio.open(raster_path) as src:
+            # ... make the label ...
+            label = self._rasterize_label(
+                (src.height, src.width),
+                src.transform,
+                vector_geoms,
+                class_probabilities,
+            )
 
-        # Else, ...
-        else:
-            label_bands_count = self._get_label_bands_count(connector)
-
-            # ...open the raster, ...
-            with rio.open(raster_path) as src:
-                # Create profile for the label.
-                profile = src.profile
-                profile.update({"count": label_bands_count, "dtype": rio.float32})
-
-                # Open the label ...
-                with rio.open(label_path, "w+", **profile) as dst:
-                    # ... and create one band in the label for each segmentation class.
-
-                    # (if an implicit background band is to be included,
-                    # it will go in band/channel 1.)
-                    start_band = 1 if not self.add_background_band else 2
-
-                    for count, seg_class in enumerate(
-                        connector.task_vector_classes, start=start_band
-                    ):
-                        # To do that, first find (the df of)
-                        # the geoms intersecting the raster ...
-                        vectors_intersecting_raster_df = connector.vectors.loc[
-                            connector.vectors_intersecting_raster(raster_name)
-                        ]
-
-                        # ... extract the geometries ...
-                        vector_geoms_in_std_crs = list(
-                            vectors_intersecting_raster_df["geometry"]
-                        )
-
-                        # ... and convert them to the crs of the source raster.
-                        vector_geoms_in_src_crs = list(
-                            map(
-                                lambda geom: transform_shapely_geometry(
-                                    geom,
-                                    connector.vectors.crs.to_epsg(),
-                                    src.crs.to_epsg(),
-                                ),
-                                vector_geoms_in_std_crs,
-                            )
-                        )
-
-                        # Extract the class probabilities ...
-                        class_probabilities = list(
-                            vectors_intersecting_raster_df[f"prob_of_class_{seg_class}"]
-                        )
-
-                        # .. and combine with the geometries
-                        # to a list of (geometry, value) pairs.
-                        geom_value_pairs = list(
-                            zip(vector_geoms_in_src_crs, class_probabilities)
-                        )
-
-                        # If there are no geoms of seg_type intersecting the raster ...
-                        if len(vector_geoms_in_src_crs) == 0:
-                            # ... the label raster is empty.
-                            mask = np.zeros((src.height, src.width), dtype=np.uint8)
-                        # Else, burn the values for those geoms into the band.
-                        else:
-                            mask = rasterize(
-                                shapes=geom_value_pairs,
-                                # or the other way around?
-                                out_shape=(src.height, src.width),
-                                fill=0.0,  #
-                                transform=src.transform,
-                                dtype=rio.float32,
-                            )
-
-                        # Write the band to the label file.
-                        dst.write(mask, count)
-
-                    # If the background is not included in the segmentation classes ...
-                    if self.add_background_band:
-                        # ... add background band.
-
-                        non_background_band_indices = list(
-                            range(
-                                start_band,
-                                2 + len(connector.task_vector_classes),
-                            )
-                        )
-
-                        # The probability of a pixel belonging to
-                        # the background is the complement of it
-                        # belonging to some segmentation class.
-                        background_band = 1 - np.add.reduce(
-                            [
-                                dst.read(band_index)
-                                for band_index in non_background_band_indices
-                            ]
-                        )
-
-                        dst.write(background_band, 1)
+            # ... create a profile for the label ...
+            profile = src.profile
+            profile.update({"count": label.shape[0], "dtype": label.dtype.name})
+            if self.probability_dtype == "float16":
+                # GDAL rounds the float32 label to 16 bit floats when writing
+                profile["nbits"] = 16
+
+            # ... and write all bands.
+            with self.output_profile.open(label_path, "w", **profile) as dst:
+                dst.write(label)
+                if self.probability_dtype == "uint8":
+                    dst.scales = [1 / 255] * label.shape[0]
+                if fingerprint is not None:
+                    dst.update_tags(**{LABEL_FINGERPRINT_TAG: fingerprint})
 
     def _get_label_bands_count(self, connector: Connector) -> bool:
         # If the background is not included in the segmentation classes (default) ...
@@ -5,6 +5,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import rasterio as rio
+from rasterio.io import DatasetReader
 
 
 class RasterBandsGetterMixIn:
@@ -14,12 +15,15 @@ class RasterBandsGetterMixIn:
         self,
         bands: dict[str, list[int] | None] | None,
         source_raster_path: Path,
+        src: DatasetReader | None = None,
     ) -> list[int]:
         """Return bands indices to  be used in the target raster.
 
         Args:
             source_raster_path: path to source raster.
             bands: dict of band indices
+            src: open dataset of source raster. If None, the source raster is
+                opened if all its bands are needed.
 
         Raises:
             ValueError: If the optional bands dict is not None
@@ -31,24 +35,28 @@ class RasterBandsGetterMixIn:
         """
         raster_type = source_raster_path.parent.name
         if bands is None:
-            return self._get_all_band_indices(source_raster_path)
+            return self._get_all_band_indices(source_raster_path, src)
         elif raster_type in bands and bands[raster_type] is None:
-            return self._get_all_band_indices(source_raster_path)
+            return self._get_all_band_indices(source_raster_path, src)
         elif raster_type in bands and bands[raster_type] is not None:
             return bands[raster_type]  # type: ignore
         else:
             raise ValueError(f"Missing bands key: {raster_type}")
 
-    def _get_all_band_indices(self, source_raster_path: Path) -> list[int]:
+    def _get_all_band_indices(
+        self, source_raster_path: Path, src: DatasetReader | None = None
+    ) -> list[int]:
         """Return list of all band indices of source GeoTiff.
 
         Args:
             source_raster_path: path to source raster (or label etc)
+            src: open dataset of source raster. If None, the source raster is
+                opened.
 
         Returns:
             indices of all bands in GeoTiff
         """
-        with rio.open(source_raster_path) as src:
-            bands = list(range(1, src.count + 1))
-
-        return bands
+        if src is None:
+            with rio.open(source_raster_path) as src:
+                return list(range(1, src.count + 1))
+        return list(range(1, src.count + 1))
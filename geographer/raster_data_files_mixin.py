@@ -0,0 +1,349 @@
+"""Mix-in that keeps a manifest of the files in a connector's raster data dirs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+
+from geopandas import GeoDataFrame
+
+log = logging.getLogger(__name__)
+
+RASTER_DATA_FILES_FILENAME = "raster_data_files.json"
+CHECKSUM_CHUNK_SIZE = 2**20
+
+# file name -> [size in bytes, modification time in ns, sha256 checksum or None]
+_DirFiles = Dict[str, List[Union[int, Optional[str]]]]
+
+
+class RasterDataFilesMixIn:
+    """Mix-in that keeps a manifest of the files in a connector's raster data dirs.
+
+    Scanning the raster data dirs (e.g. rasters_dir and labels_dir) is slow
+    for large datasets, especially on network file systems. Instead, the
+    connector keeps a manifest of the files in each raster data dir with
+    their size, modification time, and (optionally) sha256 checksum. The
+    manifest is saved with the connector (in raster_data_files.json in the
+    connector_dir) and updated by the code paths that write or delete raster
+    data files, i.e. when rasters are added to the connector's rasters,
+    when rasters are dropped, and when labels are made or deleted. A raster
+    data dir missing from the manifest is scanned the first time it is
+    needed.
+
+    Existence checks only use the manifest, files missing from it are
+    treated as absent. When saving, changes saved to raster_data_files.json by
+    other connector instances in the meantime are kept. If files are written
+    to or deleted from the raster data dirs by other means, call
+    :meth:`record_raster_data_files`, :meth:`forget_raster_data_files`, or
+    :meth:`resync_raster_data_files`.
+    """
+
+    if TYPE_CHECKING:
+        data_dir: Path
+        rasters: GeoDataFrame
+        raster_data_dirs: list[Path]
+        _connector_dir: Path
+        _saved_state: dict | None
+
+    def raster_data_file_names(self, raster_data_dir: Path | str) -> set[str]:
+        """Return names of files in a raster data dir.
+
+        Args:
+            raster_data_dir: raster data dir, e.g. rasters_dir or labels_dir
+
+        Returns:
+            set of file names
+        """
+        raster_data_dir = Path(raster_data_dir)
+        dir_files = self._get_dir_files(raster_data_dir)
+        if dir_files is None:
+            raise ValueError(f"Not a raster data dir: {raster_data_dir}")
+        return set(dir_files)
+
+    def raster_data_file_exists(self, path: Path | str) -> bool:
+        """Return whether a file exists.
+
+        Uses the manifest for files in a raster data dir. Files not in a
+        raster data dir are looked up on disk.
+
+        Args:
+            path: path of file
+
+        Returns:
+            True if the file exists, False otherwise
+        """
+        path = Path(path)
+        dir_files = self._get_dir_files(path.parent)
+        if dir_files is None:
+            return path.is_file()
+        return path.name in dir_files
+
+    def raster_data_file_info(self, path: Path | str) -> dict[str, Any] | None:
+        """Return size, modification time, and checksum of a raster data file.
+
+        Args:
+            path: path of file in a raster data dir
+
+        Returns:
+            dict with keys "size" (in bytes), "mtime_ns", and "checksum" (sha256
+            hex digest or None if not computed) or None if the file does not
+            exist
+        """
+        path = Path(path)
+        if not self.raster_data_file_exists(path):
+            return None
+        entry = self._get_dir_files(path.parent)[path.name]
+        return dict(zip(["size", "mtime_ns", "checksum"], entry))
+
+    def record_raster_data_files(
+        self, paths: Iterable[Path | str], checksum: bool = False
+    ):
+        """Record the current state of files in the manifest.
+
+        Files that do not exist are removed from the manifest. Paths that are
+        not in a raster data dir are ignored.
+
+        Args:
+            paths: paths of files that have been written (or deleted)
+            checksum: whether to compute sha256 checksums. Defaults to False.
+        """
+        for path in paths:
+            path = Path(path)
+            dir_files = self._get_dir_files(path.parent)
+            if dir_files is not None:
+                self._set_entry(path, dir_files, _file_entry(path, checksum))
+
+    def forget_raster_data_files(self, paths: Iterable[Path | str]):
+        """Remove deleted files from the manifest.
+
+        Args:
+            paths: paths of files that have been deleted
+        """
+        for path in paths:
+            path = Path(path)
+            dir_files = self._get_dir_files(path.parent)
+            if dir_files is not None:
+                self._set_entry(path, dir_files, None)
+
+    def resync_raster_data_files(self, checksum: bool = False):
+        """Rebuild the manifest by scanning all raster data dirs.
+
+        Args:
+            checksum: whether to compute sha256 checksums. Defaults to False.
+        """
+        old_files = self.__dict__.get("_raster_data_files", {})
+        new_files = {
+            self._raster_data_dir_key(dir_): _scan_dir(dir_, checksum)
+            for dir_ in self.raster_data_dirs
+        }
+        for key, dir_files in new_files.items():
+            old_dir_files = old_files.get(key, {})
+            log.info(
+                "Resynced %s: %s files added, %s removed, %s changed",
+                key,
+                len(dir_files.keys() - old_dir_files.keys()),
+                len(old_dir_files.keys() - dir_files.keys()),
+                sum(
+                    old_dir_files[name][:2] != entry[:2]
+                    for name, entry in dir_files.items()
+                    if name in old_dir_files
+                ),
+            )
+        self.__dict__["_raster_data_files"] = new_files
+        # the scan supersedes the manifest on disk
+        self.__dict__["_raster_data_files_pending"] = {}
+        self.__dict__["_raster_data_files_disk_stat"] = _disk_stat(
+            self._raster_data_files_path
+        )
+        self._raster_data_files_changed()
+
+    @property
+    def _raster_data_files_path(self) -> Path:
+        return self._connector_dir / RASTER_DATA_FILES_FILENAME
+
+    def _get_raster_data_files(self) -> dict[str, _DirFiles]:
+        """Return manifest, load it from disk if necessary."""
+        if "_raster_data_files" not in self.__dict__:
+            self._load_raster_data_files()
+        return self.__dict__["_raster_data_files"]
+
+    def _load_raster_data_files(self):
+        """(Re)load manifest from disk.
+
+        The changes to the manifest made by this connector since it was last
+        saved are applied to the manifest loaded from disk.
+        """
+        disk_stat = _disk_stat(self._raster_data_files_path)
+        raster_data_files = {}
+        if disk_stat is not None:
+            with open(self._raster_data_files_path, "r", encoding="utf-8") as file:
+                raster_data_files = json.load(file)
+        for key, pending_dir_files in self.__dict__.get(
+            "_raster_data_files_pending", {}
+        ).items():
+            if key not in raster_data_files:
+                # will be scanned when needed
+                continue
+            for name, entry in pending_dir_files.items():
+                if entry is None:
+                    raster_data_files[key].pop(name, None)
+                else:
+                    raster_data_files[key][name] = entry
+
+        self.__dict__["_raster_data_files"] = raster_data_files
+        self.__dict__["_raster_data_files_disk_stat"] = disk_stat
+
+    def _get_dir_files(self, raster_data_dir: Path) -> _DirFiles | None:
+        """Return manifest of a raster data dir or None if it isn't one."""
+        if raster_data_dir not in self.raster_data_dirs:
+            return None
+
+        raster_data_files = self._get_raster_data_files()
+        key = self._raster_data_dir_key(raster_data_dir)
+        if key not in raster_data_files:
+            log.info("Scanning %s for raster data files", raster_data_dir)
+            raster_data_files[key] = _scan_dir(raster_data_dir)
+            self._raster_data_files_changed()
+        return raster_data_files[key]
+
+    def _set_entry(self, path: Path, dir_files: _DirFiles, entry: list | None):
+        """Set entry of file in manifest of raster data dir, None to remove it."""
+        if entry is None:
+            dir_files.pop(path.name, None)
+        else:
+            dir_files[path.name] = entry
+        self.__dict__.setdefault("_raster_data_files_pending", {}).setdefault(
+            self._raster_data_dir_key(path.parent), {}
+        )[path.name] = entry
+        self._raster_data_files_changed()
+
+    def _record_if_exists(self, path: Path, dir_files: _DirFiles) -> bool:
+        """Record file missing from manifest if it exists on disk.
+
+        Returns:
+            whether the file exists
+        """
+        entry = _file_entry(path)
+        if entry is None:
+            return False
+        self._set_entry(path, dir_files, entry)
+        return True
+
+    def _raster_data_dir_key(self, raster_data_dir: Path) -> str:
+        """Return key of raster data dir in manifest."""
+        try:
+            return raster_data_dir.relative_to(self.data_dir).as_posix()
+        except ValueError:
+            return str(raster_data_dir)
+
+    def _raster_data_files_changed(self):
+        """Count changes of manifest to detect changes when saving."""
+        self.__dict__["_raster_data_files_num_changes"] = (
+            self._raster_data_files_changes() + 1
+        )
+
+    def _raster_data_files_changes(self) -> int:
+        return self.__dict__.get("_raster_data_files_num_changes", 0)
+
+    def _raster_data_files_saved(self) -> int:
+        """Forget changes saved to disk, return number of changes of manifest."""
+        self.__dict__.pop("_raster_data_files_pending", None)
+        if "_raster_data_files" in self.__dict__:
+            self.__dict__["_raster_data_files_disk_stat"] = _disk_stat(
+                self._raster_data_files_path
+            )
+        return self._raster_data_files_changes()
+
+    def _update_raster_data_files(self, new_rasters: GeoDataFrame):
+        """Record files of rasters added when rasters are replaced."""
+        if "_raster_data_dirs" not in self.__dict__ or "_rasters" not in self.__dict__:
+            # still initializing
+            return
+        if (
+            "_raster_data_files" not in self.__dict__
+            and not self._raster_data_files_path.is_file()
+        ):
+            # the raster data dirs will be scanned when the manifest is needed
+            return
+
+        added_raster_names = new_rasters.index.difference(
+            self.__dict__["_rasters"].index, sort=False
+        )
+        # Only record files that exist, the other files might be written
+        # later (e.g. by another connector instance).
+        for dir_ in self.raster_data_dirs:
+            dir_files = self._get_dir_files(dir_)
+            for raster_name in added_raster_names:
+                self._record_if_exists(dir_ / raster_name, dir_files)
+
+    def _stage_raster_data_files(self, renames: list[tuple[Path, Path]]):
+        """Write manifest to a temporary file if it changed, see save."""
+        if "_raster_data_files" not in self.__dict__:
+            return
+        if (
+            self._saved_state is not None
+            and self._saved_state.get("raster_data_files")
+            == self._raster_data_files_changes()
+        ):
+            return
+
+        # include changes saved by other connector instances
+        if (
+            _disk_stat(self._raster_data_files_path)
+            != self.__dict__["_raster_data_files_disk_stat"]
+        ):
+            self._load_raster_data_files()
+        raster_data_files = self.__dict__["_raster_data_files"]
+
+        def write_raster_data_files(path: Path):
+            with open(path, "w", encoding="utf-8") as write_file:
+                json.dump(raster_data_files, write_file, ensure_ascii=False)
+
+        self._stage_file(RASTER_DATA_FILES_FILENAME, write_raster_data_files, renames)
+
+
+def _file_entry(path: Path, checksum: bool = False) -> list | None:
+    """Return manifest entry of a file or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, _sha256(path) if checksum else None]
+
+
+def _scan_dir(raster_data_dir: Path, checksum: bool = False) -> _DirFiles:
+    """Return manifest of all files in a directory."""
+    if not raster_data_dir.is_dir():
+        return {}
+    dir_files = {}
+    with os.scandir(raster_data_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                dir_files[entry.name] = [
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    _sha256(Path(entry.path)) if checksum else None,
+                ]
+    return dir_files
+
+
+def _disk_stat(path: Path) -> tuple[int, int] | None:
+    """Return modification time and size of a file or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _sha256(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHECKSUM_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
@@ -0,0 +1,125 @@
+"""Mix-in that caches a connector's vector geometries reprojected to other crs."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from geopandas import GeoDataFrame, GeoSeries
+from shapely.geometry.base import BaseGeometry
+
+from geographer.utils.utils import transform_shapely_geometries
+
+log = logging.getLogger(__name__)
+
+# vector name -> (geometry in connector's crs, reprojected geometry)
+_ReprojectedVectors = Dict[Union[str, int], Tuple[BaseGeometry, BaseGeometry]]
+
+
+class ReprojectedVectorsMixIn:
+    """Mix-in that caches a connector's vector geometries reprojected to other crs.
+
+    Typically, the vector geometries are needed in the crs of the rasters
+    (i.e. the crs in the rasters' ``orig_crs_epsg_code`` column) e.g. to
+    make labels or cut rasters. The cache is filled lazily by
+    :meth:`vector_geoms_in_crs`. Vector features added using
+    :meth:`add_to_vectors` are reprojected to all cached crs and vector
+    features dropped using :meth:`drop_vectors` are removed from the cache.
+    Reprojected geometries are recomputed if the geometry of a vector
+    feature has been replaced.
+    """
+
+    if TYPE_CHECKING:
+        vectors: GeoDataFrame
+        crs_epsg_code: int
+
+    def vector_geoms_in_crs(
+        self, vector_names: Sequence[str | int] | pd.Index, epsg_code: int
+    ) -> np.ndarray:
+        """Return vector geometries reprojected to a crs.
+
+        Args:
+            vector_names: vector_names/identifiers of vector features
+            epsg_code: EPSG code of crs
+
+        Returns:
+            array of reprojected geometries in the order of vector_names
+        """
+        vector_geoms = self.vectors.geometry.loc[vector_names]
+        if int(epsg_code) == self.crs_epsg_code:
+            return np.asarray(vector_geoms.values, dtype=object)
+
+        reprojected_vectors = self.__dict__.setdefault(
+            "_reprojected_vectors", {}
+        ).setdefault(int(epsg_code), {})
+        self._reproject_vectors(reprojected_vectors, vector_geoms, int(epsg_code))
+
+        reprojected_geoms = np.empty(len(vector_geoms), dtype=object)
+        reprojected_geoms[:] = [
+            reprojected_vectors[vector_name][1] for vector_name in vector_geoms.index
+        ]
+        return reprojected_geoms
+
+    def _reproject_vectors(
+        self,
+        reprojected_vectors: _ReprojectedVectors,
+        vector_geoms: GeoSeries,
+        epsg_code: int,
+    ):
+        """Reproject vector geometries missing from or stale in the cache."""
+        missing = [
+            (vector_name, vector_geom)
+            for vector_name, vector_geom in zip(vector_geoms.index, vector_geoms.values)
+            if vector_name not in reprojected_vectors
+            or reprojected_vectors[vector_name][0] is not vector_geom
+        ]
+        if not missing:
+            return
+
+        log.debug(
+            "Reprojecting %s vector features to EPSG:%s", len(missing), epsg_code
+        )
+        missing_names, missing_geoms = zip(*missing)
+        reprojected_geoms = transform_shapely_geometries(
+            missing_geoms, self.crs_epsg_code, epsg_code
+        )
+        reprojected_vectors.update(
+            zip(missing_names, zip(missing_geoms, reprojected_geoms))
+        )
+
+    def _update_reprojected_vectors(self, new_vectors: GeoDataFrame):
+        """Update cache when vectors are replaced.
+
+        New vector features are reprojected to all cached crs. If the
+        crs changes the cache is invalidated.
+        """
+        cache = self.__dict__.get("_reprojected_vectors")
+        if not cache or "_vectors" not in self.__dict__:
+            return
+
+        old_vectors: GeoDataFrame = self.__dict__["_vectors"]
+        if new_vectors.crs != old_vectors.crs:
+            self._invalidate_reprojected_vectors()
+            return
+
+        added_vector_geoms = new_vectors.geometry.loc[
+            new_vectors.index.difference(old_vectors.index, sort=False)
+        ]
+        if len(added_vector_geoms) == 0:
+            return
+        for epsg_code, reprojected_vectors in cache.items():
+            self._reproject_vectors(reprojected_vectors, added_vector_geoms, epsg_code)
+
+    def _drop_from_reprojected_vectors(self, vector_names: Sequence[str | int]):
+        """Drop vector features from cache."""
+        for reprojected_vectors in self.__dict__.get(
+            "_reprojected_vectors", {}
+        ).values():
+            for vector_name in vector_names:
+                reprojected_vectors.pop(vector_name, None)
+
+    def _invalidate_reprojected_vectors(self):
+        """Invalidate cache of reprojected vector geometries."""
+        self.__dict__.pop("_reprojected_vectors", None)
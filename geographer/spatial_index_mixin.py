@@ -0,0 +1,118 @@
+"""Mix-in that provides spatial indexes for a connector's rasters and vectors."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Literal, Sequence
+
+from geopandas import GeoDataFrame
+from shapely.geometry.base import BaseGeometry
+
+from geographer.utils.spatial_index import SpatialIndex
+
+log = logging.getLogger(__name__)
+
+
+class SpatialIndexMixIn:
+    """Mix-in that provides spatial indexes for a connector's rasters and vectors.
+
+    The indexes are built lazily on first use. Appending rows to (i.e.
+    concatenating to) or dropping rows from the vectors or rasters using
+    the connector's methods or setters only updates the corresponding
+    index entries. Replacing the geometries in place requires calling
+    :meth:`_invalidate_spatial_index`.
+    """
+
+    if TYPE_CHECKING:
+        vectors: GeoDataFrame
+        rasters: GeoDataFrame
+
+    def rasters_in_bbox(
+        self,
+        bbox: BaseGeometry | tuple[float, float, float, float],
+        predicate: Literal["intersects", "contains", "within"] | None = "intersects",
+    ) -> list[str]:
+        """Return rasters matching a bounding box or geometry.
+
+        Args:
+            bbox: (minx, miny, maxx, maxy) tuple or shapely geometry in the
+                connector's crs.
+            predicate: shapely binary predicate the bbox and the raster
+                geometry have to satisfy, e.g. 'within' returns the rasters
+                containing the bbox. If None, returns all rasters whose
+                bounding boxes intersect the bbox. Defaults to 'intersects'.
+
+        Returns:
+            raster_names/identifiers of matching rasters
+        """
+        return self._get_spatial_index("rasters").query_bbox(bbox, predicate=predicate)
+
+    def vectors_in_bbox(
+        self,
+        bbox: BaseGeometry | tuple[float, float, float, float],
+        predicate: Literal["intersects", "contains", "within"] | None = "intersects",
+    ) -> list[str]:
+        """Return vector features matching a bounding box or geometry.
+
+        Args:
+            bbox: (minx, miny, maxx, maxy) tuple or shapely geometry in the
+                connector's crs.
+            predicate: shapely binary predicate the bbox and the vector
+                geometry have to satisfy, e.g. 'contains' returns the vector
+                features contained in the bbox. If None, returns all vector
+                features whose bounding boxes intersect the bbox. Defaults to
+                'intersects'.
+
+        Returns:
+            vector_names/identifiers of matching vector features
+        """
+        return self._get_spatial_index("vectors").query_bbox(bbox, predicate=predicate)
+
+    def _get_spatial_index(
+        self, df_name: Literal["vectors", "rasters"]
+    ) -> SpatialIndex:
+        """Return (and build if necessary) spatial index of vectors or rasters."""
+        spatial_indexes = self.__dict__.setdefault("_spatial_indexes", {})
+        df: GeoDataFrame = getattr(self, df_name)
+        spatial_index = spatial_indexes.get(df_name)
+
+        # safety net in case rows have been added or dropped without going
+        # through the connector's setters or methods
+        if spatial_index is None or len(spatial_index) != len(df):
+            log.debug("Building spatial index of %s", df_name)
+            spatial_index = SpatialIndex(df.index, df.geometry.values)
+            spatial_indexes[df_name] = spatial_index
+
+        return spatial_index
+
+    def _update_spatial_index(
+        self, df_name: Literal["vectors", "rasters"], new_df: GeoDataFrame
+    ):
+        """Update spatial index when vectors or rasters are replaced.
+
+        If new_df extends the indexed rows only the new rows are added to
+        the index, otherwise the index is invalidated.
+        """
+        spatial_index = self.__dict__.get("_spatial_indexes", {}).get(df_name)
+        if spatial_index is None:
+            return
+
+        num_indexed = spatial_index.extends(new_df.index, new_df.geometry.values)
+        if num_indexed == -1:
+            self._invalidate_spatial_index(df_name)
+        else:
+            spatial_index.append(
+                new_df.index[num_indexed:], new_df.geometry.values[num_indexed:]
+            )
+
+    def _drop_from_spatial_index(
+        self, df_name: Literal["vectors", "rasters"], names: Sequence[str]
+    ):
+        """Drop rows from spatial index of vectors or rasters."""
+        spatial_index = self.__dict__.get("_spatial_indexes", {}).get(df_name)
+        if spatial_index is not None:
+            spatial_index.drop(names)
+
+    def _invalidate_spatial_index(self, df_name: Literal["vectors", "rasters"]):
+        """Invalidate spatial index of vectors or rasters."""
+        self.__dict__.get("_spatial_indexes", {}).pop(df_name, None)
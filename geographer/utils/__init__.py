@@ -10,4 +10,8 @@ from geographer.utils.rasters_from_tif_dir import (
     default_read_in_raster_for_raster_df_function,
     rasters_from_rasters_dir,
 )
-from geographer.utils.utils import deepcopy_gdf, transform_shapely_geometry
+from geographer.utils.utils import (
+    deepcopy_gdf,
+    transform_shapely_geometries,
+    transform_shapely_geometry,
+)
@@ -1,19 +1,50 @@
 """Utilites used in the Connector class."""
 
+from __future__ import annotations
+
 import logging
+from pathlib import Path
+from typing import Literal
 
+import geopandas as gpd
 import pandas as pd
 from geopandas import GeoDataFrame, GeoSeries
 
 from geographer.global_constants import STANDARD_CRS_EPSG_CODE
 from geographer.graph.bipartite_graph import BipartiteGraph, empty_bipartite_graph
+from geographer.graph.bipartite_graph_class import BipartiteGraphClass
 from geographer.graph.bipartite_graph_mixin import (
     RASTER_IMGS_COLOR,
     VECTOR_FEATURES_COLOR,
 )
+from geographer.graph.csr_bipartite_graph import CSRBipartiteGraph
 
 log = logging.getLogger(__name__)
 
+GraphEngine = Literal["dict", "csr"]
+GRAPH_ENGINES: dict[str, type[BipartiteGraphClass]] = {
+    "dict": BipartiteGraph,
+    "csr": CSRBipartiteGraph,
+}
+"""Bipartite graph implementations a connector can use for its internal graph."""
+
+StorageFormat = Literal["geoparquet", "geojson"]
+STORAGE_FORMAT_SUFFIXES: dict[str, str] = {
+    "geoparquet": ".parquet",
+    "geojson": ".geojson",
+}
+"""File suffixes of the formats a connector can store its vectors and rasters in."""
+
+GraphFileFormat = Literal["npz", "json"]
+GRAPH_FILENAMES = {
+    "npz": "graph.npz",
+    "json": "graph.json",
+}
+"""Graph file name for each graph file format.
+
+When loading a connector the first of these files that exists is used.
+"""
+
 
 def empty_gdf(
     index_name: str,
@@ -106,13 +137,137 @@ def empty_rasters_same_format_as(rasters: GeoDataFrame) -> GeoDataFrame:
     return empty_gdf_same_format_as(rasters)
 
 
-def empty_graph() -> BipartiteGraph:
+def empty_graph(graph_engine: GraphEngine = "dict") -> BipartiteGraphClass:
     """Return an empty bipartite graph to be used by Connector.
 
+    Args:
+        graph_engine: bipartite graph implementation, one of the keys of
+            GRAPH_ENGINES. Defaults to "dict".
+
     Returns:
         empty graph
     """
-    return empty_bipartite_graph(red=VECTOR_FEATURES_COLOR, black=RASTER_IMGS_COLOR)
+    if graph_engine == "dict":
+        # BipartiteGraph can't be initialized from the vertex colors alone
+        return empty_bipartite_graph(red=VECTOR_FEATURES_COLOR, black=RASTER_IMGS_COLOR)
+    return _graph_engine_class(graph_engine)(
+        red=VECTOR_FEATURES_COLOR, black=RASTER_IMGS_COLOR
+    )
+
+
+def load_graph(
+    file_path: Path, graph_engine: GraphEngine = "dict"
+) -> BipartiteGraphClass:
+    """Load a connector's bipartite graph from disk.
+
+    Args:
+        file_path: path to graph file
+        graph_engine: bipartite graph implementation, one of the keys of
+            GRAPH_ENGINES. Defaults to "dict".
+
+    Returns:
+        graph
+    """
+    return _graph_engine_class(graph_engine)(file_path=file_path)
+
+
+def _graph_engine_class(graph_engine: GraphEngine) -> type[BipartiteGraphClass]:
+    if graph_engine not in GRAPH_ENGINES:
+        raise ValueError(
+            f"Unknown graph_engine: {graph_engine}. "
+            f"Should be one of {list(GRAPH_ENGINES)}."
+        )
+    return GRAPH_ENGINES[graph_engine]
+
+
+def gdf_file_path(
+    connector_dir: Path, df_name: str, storage_format: StorageFormat
+) -> Path:
+    """Return path of the file a connector's vectors or rasters are saved to.
+
+    Args:
+        connector_dir: connector directory
+        df_name: "vectors" or "rasters"
+        storage_format: one of the keys of STORAGE_FORMAT_SUFFIXES
+
+    Returns:
+        file path
+    """
+    if storage_format not in STORAGE_FORMAT_SUFFIXES:
+        raise ValueError(
+            f"Unknown storage_format: {storage_format}. "
+            f"Should be one of {list(STORAGE_FORMAT_SUFFIXES)}."
+        )
+    return Path(connector_dir) / f"{df_name}{STORAGE_FORMAT_SUFFIXES[storage_format]}"
+
+
+def existing_gdf_file_path(
+    connector_dir: Path, df_name: str, storage_format: StorageFormat
+) -> Path:
+    """Return path of the file a connector's vectors or rasters are loaded from.
+
+    Prefers the file in storage_format and falls back to files in the other
+    storage formats (e.g. for connectors saved before storage_format existed).
+
+    Args:
+        connector_dir: connector directory
+        df_name: "vectors" or "rasters"
+        storage_format: preferred storage format
+
+    Returns:
+        file path
+    """
+    storage_formats = [storage_format] + [
+        format_ for format_ in STORAGE_FORMAT_SUFFIXES if format_ != storage_format
+    ]
+    for format_ in storage_formats:
+        file_path = gdf_file_path(connector_dir, df_name, format_)
+        if file_path.is_file():
+            return file_path
+    raise FileNotFoundError(f"No {df_name} file found in {connector_dir}")
+
+
+def save_gdf(gdf: GeoDataFrame, file_path: Path):
+    """Save a connector's vectors or rasters.
+
+    The format is determined by the file suffix, see STORAGE_FORMAT_SUFFIXES.
+
+    Args:
+        gdf: vectors or rasters
+        file_path: file path
+    """
+    if Path(file_path).suffix == STORAGE_FORMAT_SUFFIXES["geoparquet"]:
+        gdf.to_parquet(file_path)
+    else:
+        gdf.to_file(file_path, driver="GeoJSON")
+
+
+def load_gdf(
+    file_path: Path, index_name: str, columns: list[str] | None = None
+) -> GeoDataFrame:
+    """Load a connector's vectors or rasters.
+
+    The format is determined by the file suffix, see STORAGE_FORMAT_SUFFIXES.
+
+    Args:
+        file_path: file path
+        index_name: name of index
+        columns: columns to load (should include the geometry column).
+            For GeoParquet files only these columns are read from disk.
+            Defaults to None, i.e. all columns.
+
+    Returns:
+        vectors or rasters
+    """
+    if Path(file_path).suffix == STORAGE_FORMAT_SUFFIXES["geoparquet"]:
+        # the index is restored from the GeoParquet pandas metadata
+        return gpd.read_parquet(file_path, columns=columns)
+
+    gdf = gpd.read_file(file_path)
+    gdf.set_index(index_name, inplace=True)
+    if columns is not None:
+        gdf = gdf[columns]
+    return gdf
 
 
 def _check_df_cols_agree(
@@ -0,0 +1,151 @@
+"""Creation profiles for GeoTiffs written by cutters and label makers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Literal, Optional
+
+import numpy as np
+import rasterio as rio
+import rasterio.shutil
+from pydantic import BaseModel, Field, field_validator, model_validator
+from rasterio.io import DatasetWriter, MemoryFile
+
+
+class GeoTiffProfile(BaseModel):
+    """Creation options for new GeoTiffs.
+
+    The default profile does not set any creation options, i.e. the
+    GeoTiffs are written with GDAL's defaults (or the options in the
+    profile passed to :meth:`open`), e.g. striped and uncompressed.
+    """
+
+    tiled: bool = Field(default=False, description="Whether to use a tiled layout.")
+    blocksize: int = Field(
+        default=256, description="Side length of tiles, needs to be a multiple of 16."
+    )
+    compress: Optional[Literal["deflate", "zstd", "lzw"]] = Field(
+        default=None, description="Compression. Defaults to None (uncompressed)."
+    )
+    predictor: bool = Field(
+        default=False,
+        description="Whether to use a predictor when compressing, horizontal "
+        "differencing for integer and floating point predictor for float data.",
+    )
+    compress_level: Optional[int] = Field(
+        default=None, description="DEFLATE or ZSTD compression level."
+    )
+    nbits: Optional[int] = Field(
+        default=None,
+        description="Number of bits per sample for integer data, e.g. for "
+        "categorical labels. Not supported for COGs.",
+    )
+    cog: bool = Field(
+        default=False,
+        description="Whether to write Cloud-Optimized GeoTiffs with overviews. "
+        "Implies a tiled layout.",
+    )
+    overview_resampling: str = Field(
+        default="nearest",
+        description="Resampling method for the overviews of COGs.",
+    )
+
+    @field_validator("blocksize")
+    def blocksize_multiple_of_16(cls, value: int) -> int:
+        """Validate blocksize is a positive multiple of 16."""
+        if value <= 0 or value % 16 != 0:
+            raise ValueError("blocksize needs to be a positive multiple of 16")
+        return value
+
+    @model_validator(mode="after")
+    def no_nbits_for_cogs(self) -> GeoTiffProfile:
+        """Validate nbits is not used for COGs."""
+        if self.cog and self.nbits is not None:
+            raise ValueError("nbits is not supported for COGs")
+        return self
+
+    def creation_options(self, dtype: str | np.dtype) -> dict[str, Any]:
+        """Return GTiff creation options.
+
+        Args:
+            dtype: dtype of GeoTiff
+
+        Returns:
+            creation options to be passed to rasterio.open
+        """
+        options: dict[str, Any] = {}
+        if self.tiled or self.cog:
+            options.update(
+                tiled=True, blockxsize=self.blocksize, blockysize=self.blocksize
+            )
+        if self.compress is not None:
+            options["compress"] = self.compress
+            if self.predictor:
+                options["predictor"] = self._predictor(dtype)
+            if self.compress_level is not None and self.compress == "deflate":
+                options["zlevel"] = self.compress_level
+            if self.compress_level is not None and self.compress == "zstd":
+                options["zstd_level"] = self.compress_level
+        if self.nbits is not None:
+            options["nbits"] = self.nbits
+        return options
+
+    def cog_creation_options(self) -> dict[str, Any]:
+        """Return COG creation options."""
+        options: dict[str, Any] = {
+            "blocksize": self.blocksize,
+            "overview_resampling": self.overview_resampling,
+        }
+        if self.compress is not None:
+            options["compress"] = self.compress
+            if self.predictor:
+                options["predictor"] = "YES"
+            if self.compress_level is not None and self.compress != "lzw":
+                options["level"] = self.compress_level
+        return options
+
+    @contextmanager
+    def open(
+        self, path: Path | str, mode: Literal["w", "w+"] = "w", **profile: Any
+    ) -> Iterator[DatasetWriter]:
+        """Open new GeoTiff for writing using this profile.
+
+        Args:
+            path: path of GeoTiff
+            mode: "w" or "w+"
+            profile: rasterio profile, e.g. height, width, count, dtype, crs,
+                transform. The profile's creation options take precedence.
+
+        Yields:
+            dataset to write to. For COGs, an in-memory GeoTiff that is copied
+            to path when the context exits.
+        """
+        profile = {
+            **profile,
+            "driver": "GTiff",
+            **self.creation_options(profile["dtype"]),
+        }
+
+        if not self.cog:
+            with rio.open(path, mode, **profile) as dst:
+                yield dst
+            return
+
+        # COGs can't be written window by window, so we write to
+        # an uncompressed in-memory GeoTiff first
+        for option in ["compress", "predictor", "zlevel", "zstd_level"]:
+            profile.pop(option, None)
+        with MemoryFile() as memfile:
+            with memfile.open(**profile) as dst:
+                yield dst
+            with memfile.open() as tmp:
+                rasterio.shutil.copy(
+                    tmp, path, driver="COG", **self.cog_creation_options()
+                )
+
+    @staticmethod
+    def _predictor(dtype: str | np.dtype) -> int:
+        """Return GTiff predictor for dtype."""
+        return 3 if np.issubdtype(np.dtype(dtype), np.floating) else 2
@@ -31,12 +31,15 @@ def merge_datasets(
     for source_dir, target_dir in zip(
         source_connector.raster_data_dirs, target_connector.raster_data_dirs
     ):
-        files_in_target_dir = {raster.name for raster in target_dir.iterdir()}
-        pbar = tqdm(source_dir.iterdir())
+        files_in_target_dir = target_connector.raster_data_file_names(target_dir)
+        pbar = tqdm(sorted(source_connector.raster_data_file_names(source_dir)))
         pbar.set_description(f"copying {str(source_dir.name)}")
-        for raster_path in pbar:
-            if raster_path.name not in files_in_target_dir:
-                shutil.copy2(raster_path, target_dir)
+        copied_paths = []
+        for file_name in pbar:
+            if file_name not in files_in_target_dir:
+                shutil.copy2(source_dir / file_name, target_dir)
+                copied_paths.append(target_dir / file_name)
+        target_connector.record_raster_data_files(copied_paths)
 
     # merge/copy over downloads (e.g. safe_files)
     merge_dirs(str(source_connector.download_dir), str(target_connector.download_dir))
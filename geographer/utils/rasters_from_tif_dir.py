@@ -6,12 +6,13 @@ import pathlib
 from pathlib import Path
 from typing import Callable
 
+import numpy as np
 import rasterio as rio
 from geopandas import GeoDataFrame
 from shapely.geometry import Polygon, box
 from tqdm.auto import tqdm
 
-from geographer.utils.utils import GEOMS_UNION, transform_shapely_geometry
+from geographer.utils.utils import GEOMS_UNION, transform_shapely_geometries
 
 
 def default_read_in_raster_for_raster_df_function(
@@ -87,7 +88,7 @@ def rasters_from_rasters_dir(
 
     # dict to keep track of information about the rasters that
     # we will make the rasters from.
-    new_rasters_dict: dict[str, str | GEOMS_UNION | int] = {
+    new_rasters_dict: dict[str, list[str | GEOMS_UNION | int]] = {
         index_or_col_name: []
         for index_or_col_name in {"raster_name", "geometry", "orig_crs_epsg_code"}
     }
@@ -102,22 +103,22 @@ def rasters_from_rasters_dir(
         if orig_crs_epsg_code is None or raster_bounding_rectangle_orig_crs is None:
             continue
 
-        raster_bounding_rectangle_rasters_crs = transform_shapely_geometry(
-            raster_bounding_rectangle_orig_crs,
-            orig_crs_epsg_code,
-            rasters_crs_epsg_code,
+        # ... put the information into the dict.
+        new_rasters_dict["raster_name"].append(raster_path.name)
+        new_rasters_dict["geometry"].append(raster_bounding_rectangle_orig_crs)
+        new_rasters_dict["orig_crs_epsg_code"].append(int(orig_crs_epsg_code))
+
+    # transform the bounding rectangles to rasters_crs_epsg_code,
+    # one batch per original crs
+    geometries = np.empty(len(new_rasters_dict["geometry"]), dtype=object)
+    geometries[:] = new_rasters_dict["geometry"]
+    orig_crs_epsg_codes = np.array(new_rasters_dict["orig_crs_epsg_code"], dtype=int)
+    for orig_crs_epsg_code in np.unique(orig_crs_epsg_codes):
+        mask = orig_crs_epsg_codes == orig_crs_epsg_code
+        geometries[mask] = transform_shapely_geometries(
+            geometries[mask], orig_crs_epsg_code, rasters_crs_epsg_code
         )
-
-        # and put the information into a dict.
-        raster_info_dict = {
-            "raster_name": raster_path.name,
-            "geometry": raster_bounding_rectangle_rasters_crs,
-            "orig_crs_epsg_code": int(orig_crs_epsg_code),
-        }
-
-        #  Add information about the raster to new_rasters_dict ...
-        for key in new_rasters_dict.keys():
-            new_rasters_dict[key].append(raster_info_dict[key])
+    new_rasters_dict["geometry"] = list(geometries)
 
     # ... and create a rasters GeoDatFrame from new_rasters_dict:
     new_rasters = GeoDataFrame(new_rasters_dict, geometry="geometry")
@@ -0,0 +1,224 @@
+"""Incrementally updatable spatial index for named geometries.
+
+Shapely's STRtree is immutable, so rebuilding it after every append or
+drop would cost O(n log n) for each change. The SpatialIndex keeps
+
+* a main STRtree over the geometries present when it was last compacted,
+* a small delta STRtree over geometries appended since then, and
+* a boolean mask of main tree entries that have since been dropped.
+
+Once the delta and dropped entries exceed a fraction of the main tree,
+the index is compacted, i.e. the main tree is rebuilt from the live
+entries.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+from shapely import STRtree, box
+from shapely.geometry.base import BaseGeometry
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_DELTA_FRACTION = 0.1
+
+
+class SpatialIndex:
+    """STRtree spatial index over named geometries with incremental updates."""
+
+    def __init__(
+        self,
+        names: Sequence[Hashable] = (),
+        geoms: Sequence[BaseGeometry] = (),
+        max_delta_fraction: float = DEFAULT_MAX_DELTA_FRACTION,
+    ):
+        """Initialize SpatialIndex.
+
+        Args:
+            names: names of the geometries, e.g. an index of a GeoDataFrame
+            geoms: geometries
+            max_delta_fraction: the index is compacted once the number of
+                appended and dropped entries since the last compaction exceeds
+                this fraction of the number of entries in the main tree.
+        """
+        if len(names) != len(geoms):
+            raise ValueError("names and geoms need to have the same length")
+        self.max_delta_fraction = max_delta_fraction
+        self._build_main(_to_object_array(names), _to_object_array(geoms))
+
+    def __len__(self) -> int:
+        """Return number of live entries."""
+        return int(self._main_alive.sum()) + len(self._delta_names)
+
+    @property
+    def names(self) -> np.ndarray:
+        """Names of live entries in insertion order."""
+        return np.concatenate(
+            [self._main_names[self._main_alive], self._delta_names_array()]
+        )
+
+    @property
+    def geoms(self) -> np.ndarray:
+        """Geometries of live entries in insertion order."""
+        return np.concatenate(
+            [self._main_geoms[self._main_alive], self._delta_geoms_array()]
+        )
+
+    def append(self, names: Sequence[Hashable], geoms: Sequence[BaseGeometry]):
+        """Append named geometries to the index.
+
+        Args:
+            names: names of new geometries
+            geoms: new geometries
+        """
+        if len(names) != len(geoms):
+            raise ValueError("names and geoms need to have the same length")
+        self._delta_names += list(names)
+        self._delta_geoms += list(geoms)
+        self._delta_tree = None
+        self._compact_if_necessary()
+
+    def drop(self, names: Sequence[Hashable]):
+        """Drop named geometries from the index.
+
+        Args:
+            names: names of geometries to drop. Unknown names are ignored.
+        """
+        names_to_drop = set(names)
+        if not names_to_drop:
+            return
+
+        positions = self._main_positions.get_indexer(list(names_to_drop))
+        self._main_alive[positions[positions >= 0]] = False
+        self._num_dropped = int((~self._main_alive).sum())
+
+        if any(name in names_to_drop for name in self._delta_names):
+            delta_names, delta_geoms = [], []
+            for name, geom in zip(self._delta_names, self._delta_geoms):
+                if name not in names_to_drop:
+                    delta_names.append(name)
+                    delta_geoms.append(geom)
+            self._delta_names, self._delta_geoms = delta_names, delta_geoms
+            self._delta_tree = None
+
+        self._compact_if_necessary()
+
+    def query(
+        self,
+        geoms: BaseGeometry | Sequence[BaseGeometry],
+        predicate: str | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Query the index.
+
+        Args:
+            geoms: input geometry or geometries
+            predicate: optional shapely binary predicate, e.g. 'intersects' or
+                'within'. A pair (input geometry, indexed geometry) matches if
+                predicate(input geometry, indexed geometry) is True. If None,
+                pairs with intersecting bounding boxes match.
+
+        Returns:
+            positions of the input geometries and names of the matching
+            indexed geometries, one entry for each matching pair.
+        """
+        if isinstance(geoms, BaseGeometry):
+            geoms = [geoms]
+        geoms = _to_object_array(geoms)
+
+        input_idxs, tree_idxs = self._main_tree.query(geoms, predicate=predicate)
+        alive_mask = self._main_alive[tree_idxs]
+        input_idxs = input_idxs[alive_mask]
+        names = self._main_names[tree_idxs[alive_mask]]
+
+        if self._delta_names:
+            if self._delta_tree is None:
+                self._delta_tree = STRtree(self._delta_geoms_array())
+            delta_input_idxs, delta_tree_idxs = self._delta_tree.query(
+                geoms, predicate=predicate
+            )
+            input_idxs = np.concatenate([input_idxs, delta_input_idxs])
+            names = np.concatenate(
+                [names, self._delta_names_array()[delta_tree_idxs]]
+            )
+
+        return input_idxs, names
+
+    def query_bbox(
+        self,
+        bbox: BaseGeometry | tuple[float, float, float, float],
+        predicate: str | None = "intersects",
+    ) -> list[Hashable]:
+        """Return names of indexed geometries matching a bounding box or geometry.
+
+        Args:
+            bbox: (minx, miny, maxx, maxy) tuple or geometry
+            predicate: shapely binary predicate, see :meth:`query`.
+                Defaults to 'intersects'.
+
+        Returns:
+            names of matching geometries
+        """
+        if not isinstance(bbox, BaseGeometry):
+            bbox = box(*bbox)
+        _, names = self.query(bbox, predicate=predicate)
+        return names.tolist()
+
+    def extends(self, names: Sequence[Hashable], geoms: Sequence[BaseGeometry]) -> int:
+        """Check if named geometries extend the live entries of the index.
+
+        Names and geometries extend the index if their initial segment agrees
+        with the live entries of the index (geometries are compared by
+        identity).
+
+        Returns:
+            number of live entries if names and geoms extend the index, else -1.
+        """
+        num_live = len(self)
+        if len(names) < num_live:
+            return -1
+        if not np.array_equal(_to_object_array(names[:num_live]), self.names):
+            return -1
+        if not all(
+            new_geom is geom
+            for new_geom, geom in zip(_to_object_array(geoms[:num_live]), self.geoms)
+        ):
+            return -1
+        return num_live
+
+    def compact(self):
+        """Rebuild main tree from live entries."""
+        self._build_main(self.names, self.geoms)
+
+    def _compact_if_necessary(self):
+        num_changes = self._num_dropped + len(self._delta_names)
+        if num_changes > self.max_delta_fraction * max(len(self._main_names), 1):
+            log.debug("Compacting spatial index with %s changes", num_changes)
+            self.compact()
+
+    def _build_main(self, names: np.ndarray, geoms: np.ndarray):
+        self._main_names = names
+        self._main_geoms = geoms
+        self._main_tree = STRtree(geoms)
+        self._main_alive = np.ones(len(names), dtype=bool)
+        self._main_positions = pd.Index(names)
+        self._num_dropped = 0
+        self._delta_names: list[Hashable] = []
+        self._delta_geoms: list[BaseGeometry] = []
+        self._delta_tree: STRtree | None = None
+
+    def _delta_names_array(self) -> np.ndarray:
+        return _to_object_array(self._delta_names)
+
+    def _delta_geoms_array(self) -> np.ndarray:
+        return _to_object_array(self._delta_geoms)
+
+
+def _to_object_array(items: Sequence[Any]) -> np.ndarray:
+    """Return 1-dimensional object array (never splitting up e.g. tuples)."""
+    array = np.empty(len(items), dtype=object)
+    array[:] = list(items)
+    return array
@@ -3,6 +3,9 @@
 transform_shapely_geometry(geometry, from_epsg, to_epsg): Transforms a
 shapely geometry from one crs to another.
 
+transform_shapely_geometries(geometries, from_epsg, to_epsg): Transforms
+an array of shapely geometries from one crs to another in one go.
+
 round_shapely_geometry(geometry, ndigits=1): Rounds the coordinates of a
 shapely vector geometry. Useful in some cases for testing the coordinate
 conversion of raster bounding rectangles.
@@ -12,14 +15,17 @@ from __future__ import annotations
 
 import copy
 import logging
+from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Union
 
 import fiona
-import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pyproj
 import rasterio as rio
+import shapely
 from fiona.drvsupport import supported_drivers
 from geopandas import GeoDataFrame
 from shapely.geometry import (
@@ -102,27 +108,17 @@ def create_logger(app_name: str, level: int = logging.INFO) -> logging.Logger:
     return logger
 
 
-def transform_shapely_geometry(
-    geometry: GEOMS_UNION, from_epsg: int, to_epsg: int
-) -> GEOMS_UNION:
-    """Transform a shapely geometry from one crs to another.
+@lru_cache(maxsize=128)
+def get_transformer(from_epsg: int, to_epsg: int) -> pyproj.Transformer:
+    """Return (cached) transformer from one crs to another.
 
     Args:
-        geometry: shapely geometry to be transformed.
         from_epsg: EPSG code of crs to be transformed from.
         to_epsg: EPSG code of crs to be transformed to.
 
     Returns:
-        transformed shapely geometry
+        pyproj transformer with traditional GIS (x, y) axis order
     """
-    # define the coordinate transform ...
-    project = pyproj.Transformer.from_crs(
-        f"epsg:{from_epsg}", f"epsg:{to_epsg}", always_xy=True
-    )
-
-    # ... and apply it:
-    transformed_geometry = transform(project.transform, geometry)
-
     # make sure northeasting behavior agrees for both crs
     from_crs = rio.crs.CRS.from_epsg(from_epsg)
     to_crs = rio.crs.CRS.from_epsg(to_epsg)
@@ -132,7 +128,63 @@ def transform_shapely_geometry(
         to_crs
     ), "safety check that both crs treat as northeasting failed!"
 
-    return transformed_geometry
+    return pyproj.Transformer.from_crs(
+        f"epsg:{from_epsg}", f"epsg:{to_epsg}", always_xy=True
+    )
+
+
+def transform_shapely_geometries(
+    geometries: Sequence[GEOMS_UNION] | np.ndarray, from_epsg: int, to_epsg: int
+) -> np.ndarray:
+    """Transform shapely geometries from one crs to another.
+
+    All coordinates of all geometries are transformed in a single call
+    to the (cached) transformer.
+
+    Args:
+        geometries: shapely geometries to be transformed.
+        from_epsg: EPSG code of crs to be transformed from.
+        to_epsg: EPSG code of crs to be transformed to.
+
+    Returns:
+        array of transformed shapely geometries
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    transformer = get_transformer(int(from_epsg), int(to_epsg))
+
+    def transform_coords(coords: np.ndarray) -> np.ndarray:
+        return np.column_stack(transformer.transform(*coords.T))
+
+    # shapely.transform drops z coordinates unless include_z is True
+    has_z = shapely.has_z(geometries)
+    transformed_geometries = np.empty_like(geometries)
+    transformed_geometries[~has_z] = shapely.transform(
+        geometries[~has_z], transform_coords
+    )
+    if has_z.any():
+        transformed_geometries[has_z] = shapely.transform(
+            geometries[has_z], transform_coords, include_z=True
+        )
+
+    return transformed_geometries
+
+
+def transform_shapely_geometry(
+    geometry: GEOMS_UNION, from_epsg: int, to_epsg: int
+) -> GEOMS_UNION:
+    """Transform a shapely geometry from one crs to another.
+
+    To transform many geometries use :func:`transform_shapely_geometries`.
+
+    Args:
+        geometry: shapely geometry to be transformed.
+        from_epsg: EPSG code of crs to be transformed from.
+        to_epsg: EPSG code of crs to be transformed to.
+
+    Returns:
+        transformed shapely geometry
+    """
+    return transform_shapely_geometries([geometry], from_epsg, to_epsg)[0]
 
 
 def round_shapely_geometry(geometry: GEOMS_UNION, ndigits=1) -> Polygon| Point:
@@ -209,11 +261,12 @@ def create_kml_all_geodataframes(
     if out_path.suffix not in {".kml", ".KML"}:
         raise ValueError("out_path should have .kml suffix")
 
-    rasters_path = data_dir / "connector/rasters.geojson"
-    vectors_path = data_dir / "connector/vectors.geojson"
+    # load the connector to apply the journal of incremental saves
+    from geographer.connector import Connector
 
-    rasters = gpd.read_file(rasters_path)[["geometry", RASTER_IMGS_INDEX_NAME]]
-    vectors = gpd.read_file(vectors_path)[["geometry", VECTOR_FEATURES_INDEX_NAME]]
+    connector = Connector.from_data_dir(data_dir)
+    rasters = connector.rasters[["geometry"]].reset_index()
+    vectors = connector.vectors[["geometry"]].reset_index()
 
     rasters["Description"] = "raster"
     rasters["Name"] = rasters[RASTER_IMGS_INDEX_NAME]
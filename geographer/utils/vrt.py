@@ -0,0 +1,158 @@
+"""Window VRTs and their materialization.
+
+A window VRT is a small GDAL VRT file referencing a window of a source
+raster. Dataset cutters can create window VRTs instead of GeoTiffs (see
+the vrt field of SingleRasterCutter), :func:`materialize_vrts` turns them
+into GeoTiffs.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import rasterio as rio
+from affine import Affine
+from rasterio.crs import CRS
+from rasterio.dtypes import dtype_rev, typename_fwd
+from rasterio.io import DatasetReader
+from rasterio.transform import array_bounds
+from rasterio.windows import Window
+from tqdm.auto import tqdm
+
+from geographer.connector import Connector
+from geographer.utils.geotiff_profile import GeoTiffProfile
+
+VRT_SUFFIX = ".vrt"
+
+
+def write_window_vrt(
+    src: DatasetReader,
+    vrt_path: Path,
+    raster_bands: list[int],
+    window: Window,
+    window_transform: Affine,
+) -> tuple[tuple[float, float, float, float], CRS]:
+    """Write VRT referencing a window of a source raster.
+
+    Args:
+        src: source dataset
+        vrt_path: path of VRT to be created
+        raster_bands: bands of source to reference
+        window: window of source
+        window_transform: window transform of window
+
+    Returns:
+        bounds (in raster CRS) and CRS of new (virtual) raster
+    """
+    height, width = int(window.height), int(window.width)
+    col_off, row_off = int(window.col_off), int(window.row_off)
+    source_path = escape(str(Path(src.name).resolve()))
+
+    bands_xml = []
+    for target_band, source_band in enumerate(raster_bands, start=1):
+        dtype = typename_fwd[dtype_rev[src.dtypes[source_band - 1]]]
+        nodata = src.nodatavals[source_band - 1]
+        nodata_xml = "" if nodata is None else f"<NoDataValue>{nodata}</NoDataValue>"
+        bands_xml.append(
+            f'<VRTRasterBand dataType="{dtype}" band="{target_band}">'
+            f"{nodata_xml}"
+            "<SimpleSource>"
+            f'<SourceFilename relativeToVRT="0">{source_path}</SourceFilename>'
+            f"<SourceBand>{source_band}</SourceBand>"
+            f'<SrcRect xOff="{col_off}" yOff="{row_off}" '
+            f'xSize="{width}" ySize="{height}"/>'
+            f'<DstRect xOff="0" yOff="0" xSize="{width}" ySize="{height}"/>'
+            "</SimpleSource>"
+            "</VRTRasterBand>"
+        )
+    geotransform = ", ".join(map(repr, window_transform.to_gdal()))
+    vrt_xml = (
+        f'<VRTDataset rasterXSize="{width}" rasterYSize="{height}">'
+        f"<SRS>{escape(src.crs.to_wkt())}</SRS>"
+        f"<GeoTransform>{geotransform}</GeoTransform>"
+        f"{''.join(bands_xml)}"
+        "</VRTDataset>\n"
+    )
+
+    vrt_path.parent.mkdir(exist_ok=True, parents=True)
+    vrt_path.write_text(vrt_xml)
+
+    return array_bounds(height, width, window_transform), src.crs
+
+
+def materialize_vrts(
+    connector: Connector,
+    raster_names: list[str] | None = None,
+    output_profile: GeoTiffProfile | None = None,
+    labels_output_profile: GeoTiffProfile | None = None,
+) -> list[str]:
+    """Turn VRT rasters (and labels etc.) of a dataset into GeoTiffs.
+
+    The VRTs are replaced by GeoTiffs with the same name but with suffix .tif
+    in the connector and on disk. The connector is not saved.
+
+    Args:
+        connector: connector of dataset
+        raster_names: names of VRT rasters to materialize. Defaults to None,
+            i.e. all VRT rasters.
+        output_profile: creation profile for the rasters. Defaults to None,
+            i.e. GeoTiffProfile().
+        labels_output_profile: creation profile for the labels (and other
+            raster data besides the rasters). Defaults to None, i.e.
+            output_profile.
+
+    Returns:
+        names of new GeoTiff rasters
+    """
+    if raster_names is None:
+        raster_names = [
+            raster_name
+            for raster_name in connector.rasters.index
+            if raster_name.endswith(VRT_SUFFIX)
+        ]
+    if output_profile is None:
+        output_profile = GeoTiffProfile()
+    if labels_output_profile is None:
+        labels_output_profile = output_profile
+
+    new_raster_names = {
+        raster_name: Path(raster_name).with_suffix(".tif").name
+        for raster_name in raster_names
+    }
+    conflicts = set(new_raster_names.values()) & set(connector.rasters.index)
+    if conflicts:
+        raise ValueError(
+            f"Can't materialize VRTs, rasters already exist: {', '.join(conflicts)}"
+        )
+
+    for raster_name in tqdm(raster_names, desc="Materializing VRTs: "):
+        for count, raster_data_dir in enumerate(connector.raster_data_dirs):
+            vrt_path = raster_data_dir / raster_name
+            if not connector.raster_data_file_exists(vrt_path):
+                continue
+            profile = output_profile if count == 0 else labels_output_profile
+            tif_path = raster_data_dir / new_raster_names[raster_name]
+            with rio.open(vrt_path) as src:
+                with profile.open(
+                    tif_path,
+                    "w",
+                    height=src.height,
+                    width=src.width,
+                    count=src.count,
+                    dtype=src.dtypes[0],
+                    crs=src.crs,
+                    transform=src.transform,
+                    nodata=src.nodata,
+                ) as dst:
+                    dst.write(src.read())
+            vrt_path.unlink()
+            connector.forget_raster_data_files([vrt_path])
+            connector.record_raster_data_files([tif_path])
+
+    # re-register the rasters under their new names
+    new_rasters = connector.rasters.loc[raster_names].rename(index=new_raster_names)
+    connector.drop_rasters(raster_names, remove_rasters_from_disk=False)
+    connector.add_to_rasters(new_rasters)
+
+    return list(new_raster_names.values())
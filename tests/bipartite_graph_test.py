@@ -1,14 +1,22 @@
 """Test BipartiteGraph class."""
 
+import numpy as np
 import pytest
 
-from geographer.graph.bipartite_graph import empty_bipartite_graph
+from geographer.graph.bipartite_graph import BipartiteGraph, empty_bipartite_graph
+from geographer.graph.csr_bipartite_graph import (
+    CSRBipartiteGraph,
+    empty_csr_bipartite_graph,
+)
 
 
-def test_bipartite_graph():
-    """Test BipartiteGraph class."""
+@pytest.mark.parametrize(
+    "empty_graph_constructor", [empty_bipartite_graph, empty_csr_bipartite_graph]
+)
+def test_bipartite_graph(empty_graph_constructor):
+    """Test BipartiteGraph and CSRBipartiteGraph classes."""
     # test adding vertices
-    graph1 = empty_bipartite_graph()
+    graph1 = empty_graph_constructor()
 
     red_vertices = set({"r1", "r2", "r3"})
     for vertex in red_vertices:
@@ -243,3 +251,85 @@ def test_bipartite_graph():
 
     # test really_undirected
     assert graph1.really_undirected()
+
+
+def test_csr_bipartite_graph_agrees_with_bipartite_graph():
+    """Test CSRBipartiteGraph against BipartiteGraph under random changes."""
+    rng = np.random.default_rng(0)
+    graph = empty_bipartite_graph()
+    csr_graph = empty_csr_bipartite_graph()
+
+    for step in range(3000):
+        red_vertex = f"r{rng.integers(50)}"
+        black_vertex = f"b{rng.integers(50)}"
+        operation = rng.choice(
+            ["add_edge", "delete_edge", "delete_vertex"], p=[0.7, 0.2, 0.1]
+        )
+        edge_data = str(rng.choice(["contains", "intersects"]))
+        for graph_ in (graph, csr_graph):
+            if operation == "add_edge":
+                graph_.add_edge(red_vertex, "red", black_vertex, edge_data, force=True)
+            elif operation == "delete_edge" and graph_.exists_vertex(red_vertex, "red"):
+                graph_.delete_edge(red_vertex, "red", black_vertex)
+            elif operation == "delete_vertex":
+                graph_.delete_vertex(black_vertex, "black")
+        if step % 500 == 0:
+            csr_graph.compact()
+        if step % 100 == 0:
+            assert csr_graph._graph_dict == graph._graph_dict
+
+    assert csr_graph._graph_dict == graph._graph_dict
+    csr_graph.compact()
+    assert csr_graph._graph_dict == graph._graph_dict
+    assert csr_graph.really_undirected()
+    assert isinstance(csr_graph.vertices("black"), list)
+    assert sorted(csr_graph.vertices("black")) == sorted(graph.vertices("black"))
+    for vertex in graph.vertices("black"):
+        assert set(csr_graph.vertices_opposite(vertex, "black", "contains")) == set(
+            graph.vertices_opposite(vertex, "black", "contains")
+        )
+
+
+@pytest.mark.parametrize("graph_class", [BipartiteGraph, CSRBipartiteGraph])
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+def test_save_load_graph(graph_class, suffix, tmp_path):
+    """Test saving and loading graphs in json and binary format."""
+    graph_dict = {
+        "red": {"r1": {"b1": "contains", "b3": "intersects"}, "r2": {}},
+        "black": {"b1": {"r1": "contains"}, "b2": {}, "b3": {"r1": "intersects"}},
+    }
+    graph = graph_class(graph_dict=graph_dict)
+    file_path = tmp_path / f"graph{suffix}"
+    graph.save_to_file(file_path)
+
+    for loaded_graph_class in [BipartiteGraph, CSRBipartiteGraph]:
+        loaded_graph = loaded_graph_class(file_path=file_path)
+        assert loaded_graph._graph_dict == graph_dict
+        assert loaded_graph.colors() == ["red", "black"]
+
+    # loaded graph can be modified
+    loaded_graph.add_edge("r2", "red", "b2", "intersects")
+    loaded_graph.delete_vertex("b1", "black")
+    assert loaded_graph._graph_dict == {
+        "red": {"r1": {"b3": "intersects"}, "r2": {"b2": "intersects"}},
+        "black": {"b2": {"r2": "intersects"}, "b3": {"r1": "intersects"}},
+    }
+
+
+def test_csr_bipartite_graph_vertex_names():
+    """Test integer vertex names and names of mixed types in CSR graphs."""
+    graph = CSRBipartiteGraph(
+        graph_dict={
+            "red": {2: {"b1": "contains"}, 1: {}},
+            "black": {"b1": {2: "contains"}},
+        }
+    )
+    graph.add_edge(3, "red", "b2", "contains")
+    assert sorted(graph.vertices("red")) == [1, 2, 3]
+    assert graph.vertices_opposite("b2", "black") == [3]
+    assert not graph.exists_vertex("1", "red")
+
+    with pytest.raises(TypeError):
+        graph.add_vertex("r1", "red")
+    with pytest.raises(TypeError):
+        CSRBipartiteGraph(graph_dict={"red": {1: {}, "r2": {}}, "black": {}})
@@ -3,9 +3,7 @@
 import shutil
 
 import pytest
-from utils import create_dummy_rasters, delete_dummy_rasters, get_test_dir
-
-from geographer import Connector
+from utils import create_dummy_rasters, get_test_dir
 
 CUT_SOURCE_DATA_DIR_NAME = "cut_source"
 
@@ -14,13 +12,15 @@ CUT_SOURCE_DATA_DIR_NAME = "cut_source"
 def dummy_cut_source_data_dir():
     """Return cut source data dir containing dummy data.
 
-    Dummy rasters are created before the pytest session starts and
-    removed afterwards.
+    The cut source dataset is copied to the temp dir and dummy rasters are
+    created for the copy before the pytest session starts, so that the tests
+    don't modify the tracked test data. The temp dir is removed afterwards.
     """
-    data_dir = get_test_dir() / CUT_SOURCE_DATA_DIR_NAME
-    connector = Connector.from_data_dir(data_dir=data_dir)
-    if not connector.rasters_dir.exists() or not connector.rasters_dir.glob("*.tif"):
-        create_dummy_rasters(data_dir=data_dir, raster_size=10980)
+    data_dir = get_test_dir() / "temp" / CUT_SOURCE_DATA_DIR_NAME
+    shutil.rmtree(data_dir, ignore_errors=True)
+    shutil.copytree(
+        get_test_dir() / CUT_SOURCE_DATA_DIR_NAME / "connector", data_dir / "connector"
+    )
+    create_dummy_rasters(data_dir=data_dir, raster_size=10980)
     yield data_dir
-    delete_dummy_rasters(data_dir=data_dir)
     shutil.rmtree(get_test_dir() / "temp", ignore_errors=True)
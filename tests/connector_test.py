@@ -9,12 +9,18 @@ See connector_test.png for a visualization of the test data
 TODO: Test save/from_data_dir with clean_up
 """
 
+import json
+import shutil
 from pathlib import Path
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pytest
 from shapely.geometry import Polygon, box
+from utils import get_test_dir
 
+from geographer import incremental_save_mixin
 from geographer.connector import Connector
 from geographer.global_constants import (
     RASTER_IMGS_INDEX_NAME,
@@ -26,6 +32,7 @@ from geographer.graph.bipartite_graph_mixin import (
     VECTOR_FEATURES_COLOR,
 )
 from geographer.testing.graph_df_compatibility import check_graph_vertices_counts
+from geographer.utils.utils import create_kml_all_geodataframes
 
 TASK_FEATURE_CLASSES = ["class1", "class2"]
 
@@ -317,5 +324,313 @@ def test_connector():
     assert check_graph_vertices_counts(connector)
 
 
+@pytest.mark.parametrize("graph_engine", ["dict", "csr"])
+def test_bulk_add_agrees_with_pairwise_predicates(graph_engine):
+    """Test bulk add_to_vectors/add_to_rasters against pairwise predicates."""
+    rng = np.random.default_rng(0)
+
+    def random_boxes(num: int, max_size: float) -> list[Polygon]:
+        mins = rng.uniform(0, 10, size=(num, 2))
+        sizes = rng.uniform(0.1, max_size, size=(num, 2))
+        return [box(*min_, *(min_ + size)) for min_, size in zip(mins, sizes)]
+
+    vectors = gpd.GeoDataFrame(
+        {"type": "class1"},
+        geometry=random_boxes(200, 1),
+        index=pd.Index([f"v{n}" for n in range(200)], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    rasters = gpd.GeoDataFrame(
+        geometry=random_boxes(50, 4),
+        index=pd.Index([f"r{n}" for n in range(50)], name=RASTER_IMGS_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+
+    connector = Connector.from_scratch(
+        data_dir=Path("/whatever/"),
+        task_vector_classes=TASK_FEATURE_CLASSES,
+        graph_engine=graph_engine,
+    )
+    # add half the rasters before and half after the vectors
+    connector.add_to_rasters(rasters.iloc[:25])
+    connector.add_to_vectors(vectors)
+    connector.add_to_rasters(rasters.iloc[25:])
+
+    expected_graph_dict = {
+        VECTOR_FEATURES_COLOR: {vector_name: {} for vector_name in vectors.index},
+        RASTER_IMGS_COLOR: {raster_name: {} for raster_name in rasters.index},
+    }
+    for vector_name, vector_geom in vectors.geometry.items():
+        for raster_name, raster_geom in rasters.geometry.items():
+            if raster_geom.intersects(vector_geom):
+                edge_data = (
+                    "contains" if raster_geom.contains(vector_geom) else "intersects"
+                )
+                expected_graph_dict[VECTOR_FEATURES_COLOR][vector_name][
+                    raster_name
+                ] = edge_data
+                expected_graph_dict[RASTER_IMGS_COLOR][raster_name][
+                    vector_name
+                ] = edge_data
+
+    assert connector._graph._graph_dict == expected_graph_dict
+    assert check_graph_vertices_counts(connector)
+
+
+def test_csr_graph_engine_save_load(tmp_path):
+    """Test saving and loading a connector using the CSR graph engine."""
+    vectors = gpd.GeoDataFrame(
+        {"type": "class1"},
+        geometry=[box(0, 0, 1, 1), box(2, 2, 3, 3)],
+        index=pd.Index(["v1", "v2"], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    rasters = gpd.GeoDataFrame(
+        geometry=[box(-1, -1, 2, 2), box(0.5, 0.5, 2.5, 2.5)],
+        index=pd.Index(["r1", "r2"], name=RASTER_IMGS_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    connector = Connector.from_scratch(
+        data_dir=tmp_path, task_vector_classes=TASK_FEATURE_CLASSES, graph_engine="csr"
+    )
+    connector.add_to_vectors(vectors)
+    connector.add_to_rasters(rasters)
+    connector.drop_rasters(["r1"], remove_rasters_from_disk=False)
+    connector.save()
+
+    loaded_connector = Connector.from_data_dir(tmp_path)
+    assert type(loaded_connector._graph).__name__ == "CSRBipartiteGraph"
+    assert loaded_connector._graph._graph_dict == {
+        VECTOR_FEATURES_COLOR: {"v1": {"r2": "intersects"}, "v2": {"r2": "intersects"}},
+        RASTER_IMGS_COLOR: {"r2": {"v1": "intersects", "v2": "intersects"}},
+    }
+    assert check_graph_vertices_counts(loaded_connector)
+
+
+def test_graph_file_format(tmp_path):
+    """Test legacy json graph files are read and replaced on save."""
+    vectors = gpd.GeoDataFrame(
+        {"type": "class1", "raster_count": 0},
+        geometry=[box(0, 0, 1, 1)],
+        index=pd.Index(["v1"], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    rasters = gpd.GeoDataFrame(
+        geometry=[box(-1, -1, 2, 2)],
+        index=pd.Index(["r1"], name=RASTER_IMGS_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    connector = Connector.from_scratch(
+        data_dir=tmp_path,
+        vectors=vectors,
+        rasters=rasters,
+        task_vector_classes=TASK_FEATURE_CLASSES,
+        graph_file_format="json",
+    )
+    connector.save()
+    assert (connector.connector_dir / "graph.json").is_file()
+    assert not (connector.connector_dir / "graph.npz").is_file()
+
+    loaded_connector = Connector.from_data_dir(tmp_path)
+    assert loaded_connector._graph == connector._graph
+
+    loaded_connector.attrs["graph_file_format"] = "npz"
+    loaded_connector.save()
+    assert (connector.connector_dir / "graph.npz").is_file()
+    assert not (connector.connector_dir / "graph.json").is_file()
+    assert Connector.from_data_dir(tmp_path)._graph == connector._graph
+
+
+def test_storage_format(tmp_path):
+    """Test saving and loading vectors and rasters in either storage format."""
+    vectors = gpd.GeoDataFrame(
+        {
+            "type": "class1",
+            "raster_count": 0,
+            "some_int": pd.array([1], dtype="Int64"),
+        },
+        geometry=[box(0, 0, 1, 1)],
+        index=pd.Index(["v1"], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    rasters = gpd.GeoDataFrame(
+        geometry=[box(-1, -1, 2, 2)],
+        index=pd.Index(["r1"], name=RASTER_IMGS_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    connector = Connector.from_scratch(
+        data_dir=tmp_path,
+        vectors=vectors,
+        rasters=rasters,
+        task_vector_classes=TASK_FEATURE_CLASSES,
+    )
+    connector.save()
+    assert (connector.connector_dir / "vectors.parquet").is_file()
+    assert (connector.connector_dir / "rasters.parquet").is_file()
+
+    loaded_connector = Connector.from_data_dir(tmp_path)
+    assert loaded_connector.storage_format == "geoparquet"
+    pd.testing.assert_frame_equal(loaded_connector.vectors, connector.vectors)
+    assert loaded_connector.empty_connector_same_format(
+        tmp_path / "empty"
+    ).storage_format == "geoparquet"
+
+    # switching the storage format replaces the files on the next save
+    loaded_connector.attrs["storage_format"] = "geojson"
+    loaded_connector.save()
+    assert (connector.connector_dir / "vectors.geojson").is_file()
+    assert not (connector.connector_dir / "vectors.parquet").is_file()
+    reloaded_connector = Connector.from_data_dir(tmp_path)
+    assert reloaded_connector.storage_format == "geojson"
+    assert list(reloaded_connector.vectors.index) == ["v1"]
+
+    # exporting doesn't modify the connector
+    reloaded_connector.rasters["some_str"] = "a"
+    rasters_dtypes = reloaded_connector.rasters.dtypes.copy()
+    reloaded_connector.export_geojson(tmp_path / "export")
+    assert (tmp_path / "export" / "vectors.geojson").is_file()
+    assert (tmp_path / "export" / "rasters.geojson").is_file()
+    pd.testing.assert_series_equal(reloaded_connector.rasters.dtypes, rasters_dtypes)
+
+
+def test_legacy_storage_format(tmp_path):
+    """Test connectors saved without storage_format keep their file formats."""
+    shutil.copytree(get_test_dir() / "cut_source/connector", tmp_path / "connector")
+    connector = Connector.from_data_dir(tmp_path)
+    assert connector.storage_format == "geojson"
+    assert connector.graph_file_format == "json"
+
+    connector.drop_vectors(list(connector.vectors.index[:1]))
+    connector.save()
+    for filename in ["graph.json", "rasters.geojson", "vectors.geojson"]:
+        assert (connector.connector_dir / filename).is_file()
+    for filename in ["graph.npz", "rasters.parquet", "vectors.parquet"]:
+        assert not (connector.connector_dir / filename).is_file()
+    assert len(Connector.from_data_dir(tmp_path).vectors) == len(connector.vectors)
+
+
+def test_int32_raster_count(tmp_path):
+    """Test adding/dropping rasters keeps an int32 raster_count column."""
+    vectors = gpd.GeoDataFrame(
+        {"type": "class1", "raster_count": np.zeros(2, dtype=np.int32)},
+        geometry=[box(0, 0, 1, 1), box(2, 2, 3, 3)],
+        index=pd.Index(["v1", "v2"], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    rasters = gpd.GeoDataFrame(
+        geometry=[box(-1, -1, 4, 4), box(-1, -1, 2, 2)],
+        index=pd.Index(["r1", "r2"], name=RASTER_IMGS_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    connector = Connector.from_scratch(
+        data_dir=tmp_path, task_vector_classes=TASK_FEATURE_CLASSES
+    )
+    connector.add_to_vectors(vectors)
+    connector.vectors["raster_count"] = connector.vectors["raster_count"].astype(
+        np.int32
+    )
+
+    connector.add_to_rasters(rasters)
+    assert connector.vectors["raster_count"].dtype == np.int32
+    assert connector.vectors["raster_count"].to_dict() == {"v1": 2, "v2": 1}
+
+    connector.drop_rasters(["r1"], remove_rasters_from_disk=False)
+    assert connector.vectors["raster_count"].dtype == np.int32
+    assert connector.vectors["raster_count"].to_dict() == {"v1": 1, "v2": 0}
+
+
+def test_incremental_save(tmp_path, monkeypatch):
+    """Test saving only changes and completing interrupted saves."""
+    vectors = gpd.GeoDataFrame(
+        {"type": "class1", "raster_count": 0},
+        geometry=[box(0, 0, 1, 1)],
+        index=pd.Index(["v1"], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+
+    def rasters_gdf(raster_names):
+        return gpd.GeoDataFrame(
+            geometry=[box(-1, -1, 2, 2)] * len(raster_names),
+            index=pd.Index(raster_names, name=RASTER_IMGS_INDEX_NAME),
+            crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+        )
+
+    connector = Connector.from_scratch(
+        data_dir=tmp_path,
+        vectors=vectors,
+        rasters=rasters_gdf(["r1"]),
+        task_vector_classes=TASK_FEATURE_CLASSES,
+    )
+    connector.save()
+    connector_dir = connector.connector_dir
+    attrs_mtime = (connector_dir / "attrs.json").stat().st_mtime_ns
+
+    # new rasters and edges are appended to the journal
+    connector.add_to_rasters(rasters_gdf(["r2"]))
+    connector.save()
+    with open(connector_dir / "journal.json") as file:
+        manifest = json.load(file)
+    assert len(manifest["rasters"]) == 1
+    assert len(manifest["graph"]) == 1
+    assert (connector_dir / "attrs.json").stat().st_mtime_ns == attrs_mtime
+    assert connector._graph.file_path == connector_dir / "graph.npz"
+
+    loaded_connector = Connector.from_data_dir(tmp_path)
+    assert list(loaded_connector.rasters.index) == ["r1", "r2"]
+    assert loaded_connector._graph == connector._graph
+    assert check_graph_vertices_counts(loaded_connector)
+
+    # the KML export includes journaled rows
+    create_kml_all_geodataframes(tmp_path, tmp_path / "connector.kml")
+    assert "<name>r2</name>" in (tmp_path / "connector.kml").read_text()
+
+    # dropping rasters rewrites the rasters and graph
+    loaded_connector.drop_rasters(["r1"], remove_rasters_from_disk=False)
+    loaded_connector.save()
+    with open(connector_dir / "journal.json") as file:
+        manifest = json.load(file)
+    assert manifest["rasters"] == manifest["graph"] == []
+    assert not list(connector_dir.glob("*.journal.*"))
+
+    # interrupted saves are completed when loading
+    loaded_connector.add_to_rasters(rasters_gdf(["r3"]))
+
+    def interrupt(*args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(incremental_save_mixin, "_complete_renames", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        loaded_connector.save()
+    monkeypatch.undo()
+    reloaded_connector = Connector.from_data_dir(tmp_path)
+    assert list(reloaded_connector.rasters.index) == ["r2", "r3"]
+    assert reloaded_connector._graph == loaded_connector._graph
+
+    reloaded_connector.save(compact=True)
+    assert not list(connector_dir.glob("*.journal.*"))
+    assert Connector.from_data_dir(tmp_path)._graph == loaded_connector._graph
+
+    # values modified in place are saved ...
+    reloaded_connector.vectors.loc["v1", "type"] = "class2"
+    reloaded_connector.save()
+    assert Connector.from_data_dir(tmp_path).vectors.loc["v1", "type"] == "class2"
+    reloaded_connector.vectors["type"] = "class1"
+    reloaded_connector.save()
+    assert Connector.from_data_dir(tmp_path).vectors.loc["v1", "type"] == "class1"
+
+    # ... geometries modified in place once they are marked as changed
+    reloaded_connector.vectors.loc["v1", "geometry"] = box(0, 0, 0.5, 0.5)
+    reloaded_connector.save()
+    assert Connector.from_data_dir(tmp_path).vectors.loc["v1", "geometry"] == box(
+        0, 0, 1, 1
+    )
+    reloaded_connector.mark_rows_changed("vectors", ["v1"])
+    reloaded_connector.save()
+    assert Connector.from_data_dir(tmp_path).vectors.loc["v1", "geometry"] == box(
+        0, 0, 0.5, 0.5
+    )
+
+
 if __name__ == "__main__":
     test_connector()
+    test_bulk_add_agrees_with_pairwise_predicates("dict")
@@ -14,6 +14,9 @@ TODO: write more assert statements!
 
 import shutil
 
+import pytest
+import rasterio as rio
+from rasterio.windows import Window
 from shapely.ops import unary_union
 from utils import get_test_dir
 
@@ -22,11 +25,13 @@ from geographer.cutters.cut_every_raster_to_grid import get_cutter_every_raster_
 from geographer.cutters.cut_iter_over_rasters import DSCutterIterOverRasters
 from geographer.testing.graph_df_compatibility import check_graph_vertices_counts
 from geographer.utils.utils import deepcopy_gdf
+from geographer.utils.vrt import materialize_vrts
 
 CUT_INTO = 60  # number of intervals to cut side lengths into
 
 
-def test_cut_every_raster_to_grid(dummy_cut_source_data_dir):
+@pytest.mark.parametrize("n_workers, streaming", [(1, False), (2, False), (1, True)])
+def test_cut_every_raster_to_grid(dummy_cut_source_data_dir, n_workers, streaming):
     """Test get_cutter_every_raster_to_grid."""
     assert 10980 % CUT_INTO == 0
 
@@ -40,6 +45,8 @@ def test_cut_every_raster_to_grid(dummy_cut_source_data_dir):
         target_data_dir=target_data_dir,
         name=cutter_name,
         new_raster_size=10980 // CUT_INTO,
+        n_workers=n_workers,
+        streaming=streaming,
     )
     cutter.cut()
 
@@ -74,3 +81,58 @@ def test_cut_every_raster_to_grid(dummy_cut_source_data_dir):
     cutter.cut()
 
     assert (target_connector.rasters == rasters_before_cutting).all().all()
+
+
+def test_cut_every_raster_to_grid_vrt(dummy_cut_source_data_dir):
+    """Test get_cutter_every_raster_to_grid in vrt mode and materializing VRTs."""
+    source_data_dir = dummy_cut_source_data_dir
+    target_data_dir = get_test_dir() / "temp/cut_every_raster_to_grid_vrt"
+    shutil.rmtree(target_data_dir, ignore_errors=True)
+
+    cutter = get_cutter_every_raster_to_grid(
+        source_data_dir=source_data_dir,
+        target_data_dir=target_data_dir,
+        name="every_raster_to_grid_vrt_cutter",
+        new_raster_size=10980 // CUT_INTO,
+        vrt=True,
+    )
+    cutter.cut()
+
+    target_connector = Connector.from_data_dir(target_data_dir)
+    assert len(target_connector.rasters) == CUT_INTO * CUT_INTO
+    assert all(name.endswith(".vrt") for name in target_connector.rasters.index)
+    assert check_graph_vertices_counts(target_connector)
+
+    raster_name = "S2A_MSIL2A_20220309T100841_N0400_R022_T32UQD_20220309T121849_1_2"
+    source_raster_name = (
+        "S2A_MSIL2A_20220309T100841_N0400_R022_T32UQD_20220309T121849.tif"
+    )
+    size = 10980 // CUT_INTO
+    with rio.open(target_connector.rasters_dir / f"{raster_name}.vrt") as src:
+        vrt_raster = src.read()
+        vrt_bounds = src.bounds
+    source_rasters_dir = Connector.from_data_dir(source_data_dir).rasters_dir
+    with rio.open(source_rasters_dir / source_raster_name) as src:
+        window = Window(2 * size, 1 * size, size, size)
+        assert (vrt_raster == src.read(window=window)).all()
+
+    rasters_before = deepcopy_gdf(target_connector.rasters)
+    rasters_intersecting_vector_before = target_connector.rasters_intersecting_vector(
+        "berlin_tempelhofer_feld"
+    )
+    materialize_vrts(target_connector)
+
+    assert not list(target_connector.rasters_dir.glob("*.vrt"))
+    assert (target_connector.rasters_dir / f"{raster_name}.tif").is_file()
+    assert target_connector.raster_data_file_names(target_connector.rasters_dir) == {
+        name[:-4] + ".tif" for name in rasters_before.index
+    }
+    assert sorted(target_connector.rasters.index) == sorted(
+        name[:-4] + ".tif" for name in rasters_before.index
+    )
+    assert sorted(
+        target_connector.rasters_intersecting_vector("berlin_tempelhofer_feld")
+    ) == sorted(name[:-4] + ".tif" for name in rasters_intersecting_vector_before)
+    with rio.open(target_connector.rasters_dir / f"{raster_name}.tif") as src:
+        assert (src.read() == vrt_raster).all()
+        assert src.bounds == vrt_bounds
@@ -13,6 +13,7 @@ TODO: write more assert statements!
 
 import shutil
 
+import pytest
 from shapely.geometry import Polygon
 from shapely.ops import unary_union
 from utils import get_test_dir
@@ -32,7 +33,10 @@ from geographer.testing.graph_df_compatibility import check_graph_vertices_count
 IMG_SIZE = 128
 
 
-def test_rasters_around_every_vector(dummy_cut_source_data_dir):
+@pytest.mark.parametrize(
+    "n_workers, schedule", [(1, "vector"), (2, "vector"), (1, "raster")]
+)
+def test_rasters_around_every_vector(dummy_cut_source_data_dir, n_workers, schedule):
     """Test get_cutter_rasters_around_every_vector."""
     source_data_dir = dummy_cut_source_data_dir
     target_data_dir = get_test_dir() / "temp/rasters_around_every_vector"
@@ -44,6 +48,8 @@ def test_rasters_around_every_vector(dummy_cut_source_data_dir):
         target_data_dir=target_data_dir,
         name="every_raster_to_grid_cutter",
         new_raster_size=IMG_SIZE,
+        n_workers=n_workers,
+        schedule=schedule,
     )
     cutter.cut()
 
@@ -0,0 +1,70 @@
+"""Test GeoTiffProfile."""
+
+import numpy as np
+import pytest
+import rasterio as rio
+from rasterio.transform import from_origin
+from utils import get_test_dir
+
+from geographer.utils.geotiff_profile import GeoTiffProfile
+
+RASTER_PROFILE = dict(
+    height=64,
+    width=64,
+    count=2,
+    dtype="uint8",
+    crs="EPSG:32633",
+    transform=from_origin(0, 0, 10, 10),
+)
+
+
+@pytest.mark.parametrize(
+    "profile, expected",
+    [
+        (GeoTiffProfile(), {"tiled": False, "compress": None}),
+        (
+            GeoTiffProfile(
+                tiled=True, blocksize=32, compress="deflate", predictor=True
+            ),
+            {"tiled": True, "compress": "deflate", "blockxsize": 32},
+        ),
+        (
+            GeoTiffProfile(tiled=True, blocksize=32, compress="zstd"),
+            {"tiled": True, "compress": "zstd", "blockxsize": 32},
+        ),
+        (
+            GeoTiffProfile(cog=True, blocksize=32, compress="lzw"),
+            {"tiled": True, "compress": "lzw", "blockxsize": 32},
+        ),
+    ],
+)
+def test_geotiff_profile(profile, expected):
+    """Test writing GeoTiffs with a GeoTiffProfile."""
+    path = get_test_dir() / "temp/geotiff_profile/raster.tif"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    raster = np.arange(2 * 64 * 64, dtype=np.uint8).reshape(2, 64, 64)
+    with profile.open(path, "w", **RASTER_PROFILE) as dst:
+        dst.write(raster)
+
+    with rio.open(path) as src:
+        assert (src.read() == raster).all()
+        assert src.profile["tiled"] == expected["tiled"]
+        assert src.compression == (
+            None
+            if expected["compress"] is None
+            else rio.enums.Compression[expected["compress"]]
+        )
+        if "blockxsize" in expected:
+            assert src.profile["blockxsize"] == expected["blockxsize"]
+        if profile.cog:
+            assert src.overviews(1) == [2]
+
+
+def test_geotiff_profile_validation():
+    """Test validation of GeoTiffProfile fields."""
+    with pytest.raises(ValueError):
+        GeoTiffProfile(blocksize=100)
+    with pytest.raises(ValueError):
+        GeoTiffProfile(cog=True, nbits=2)
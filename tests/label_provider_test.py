@@ -0,0 +1,53 @@
+"""Test LabelProvider."""
+
+import numpy as np
+import rasterio as rio
+from rasterio.windows import Window
+from utils import get_test_dir
+
+from geographer import Connector
+from geographer.label_makers import SegLabelMakerCategorical
+
+
+def test_label_provider(dummy_cut_source_data_dir):
+    """Test labels made on demand agree with the label GeoTiffs."""
+    connector = Connector.from_data_dir(dummy_cut_source_data_dir)
+
+    label_maker = SegLabelMakerCategorical()
+    label_maker.recompute_labels(connector)
+
+    cache_dir = get_test_dir() / "temp/label_provider_cache"
+    for provider_cache_dir in [None, cache_dir]:
+        label_provider = label_maker.label_provider(
+            connector, cache_dir=provider_cache_dir
+        )
+        label_provider.invalidate()
+
+        for _ in range(2):  # second epoch hits the cache
+            for raster_name in connector.rasters.index:
+                with rio.open(connector.labels_dir / raster_name) as src:
+                    window = Window(0, 0, src.width // 2, src.height // 2)
+                    assert np.array_equal(label_provider(raster_name), src.read())
+                    assert np.array_equal(
+                        label_provider(raster_name, window), src.read(window=window)
+                    )
+
+        assert label_provider.misses == 2 * len(connector.rasters)
+        assert label_provider.hits == 2 * len(connector.rasters)
+
+        label_provider.invalidate([connector.rasters.index[0]])
+        label_provider(connector.rasters.index[0])
+        assert label_provider.misses == 2 * len(connector.rasters) + 1
+
+    # labels of rasters whose vector features changed are made again
+    raster_name = connector.rasters.index[0]
+    vector_names = connector.vectors_intersecting_raster(raster_name)
+    assert vector_names
+    num_misses = label_provider.misses
+    connector.drop_vectors(vector_names[:1])
+    label_provider(raster_name)
+    assert label_provider.misses == num_misses + 1
+
+
+if __name__ == "__main__":
+    test_label_provider(get_test_dir() / "cut_source")
@@ -0,0 +1,114 @@
+"""Test the connector's manifest of files in its raster data dirs."""
+
+import hashlib
+import shutil
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+from utils import get_test_dir
+
+from geographer.connector import Connector
+from geographer.global_constants import RASTER_IMGS_INDEX_NAME, STANDARD_CRS_EPSG_CODE
+
+
+def _rasters(raster_names):
+    return gpd.GeoDataFrame(
+        {"orig_crs_epsg_code": [STANDARD_CRS_EPSG_CODE] * len(raster_names)},
+        geometry=[box(13, 52, 14, 53)] * len(raster_names),
+        index=pd.Index(raster_names, name=RASTER_IMGS_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+
+
+def test_raster_data_files():
+    """Test manifest is updated when adding/dropping rasters and persisted."""
+    data_dir = get_test_dir() / "temp/raster_data_files"
+    shutil.rmtree(data_dir, ignore_errors=True)
+    connector = Connector.from_scratch(data_dir=data_dir)
+    connector.rasters_dir.mkdir(parents=True)
+    connector.labels_dir.mkdir(parents=True)
+    (connector.rasters_dir / "r1.tif").write_bytes(b"r1")
+
+    # the manifest is built by scanning the raster data dirs ...
+    assert connector.raster_data_file_names(connector.rasters_dir) == {"r1.tif"}
+    assert connector.raster_data_file_names(connector.labels_dir) == set()
+
+    # ... and updated when rasters are added or dropped
+    for raster_name in ["r2.tif", "r3.tif"]:
+        (connector.rasters_dir / raster_name).write_bytes(b"raster")
+    (connector.labels_dir / "r2.tif").write_bytes(b"label")
+    connector.add_to_rasters(_rasters(["r1.tif", "r2.tif", "r3.tif"]))
+    assert connector.raster_data_file_exists(connector.labels_dir / "r2.tif")
+    assert connector.raster_data_file_info(connector.rasters_dir / "r2.tif")[
+        "size"
+    ] == len(b"raster")
+
+    connector.drop_rasters(["r2.tif"])
+    assert not (connector.labels_dir / "r2.tif").exists()
+    assert connector.raster_data_file_names(connector.rasters_dir) == {
+        "r1.tif",
+        "r3.tif",
+    }
+    assert connector.raster_data_file_names(connector.labels_dir) == set()
+
+    # paths outside the raster data dirs are checked on disk
+    assert connector.raster_data_file_exists(connector.attrs_path) is False
+    connector.save()
+    assert connector.raster_data_file_exists(connector.attrs_path)
+
+    # the manifest is loaded from disk, not rebuilt by scanning
+    (connector.rasters_dir / "untracked.tif").write_bytes(b"untracked")
+    connector = Connector.from_data_dir(data_dir)
+    assert connector.raster_data_file_names(connector.rasters_dir) == {
+        "r1.tif",
+        "r3.tif",
+    }
+
+    connector.resync_raster_data_files(checksum=True)
+    assert "untracked.tif" in connector.raster_data_file_names(connector.rasters_dir)
+    assert connector.raster_data_file_info(connector.rasters_dir / "r1.tif")[
+        "checksum"
+    ] == hashlib.sha256(b"r1").hexdigest()
+
+
+def test_raster_data_files_other_connector_instances():
+    """Test files missing from the manifest and other connector instances."""
+    data_dir = get_test_dir() / "temp/raster_data_files_instances"
+    shutil.rmtree(data_dir, ignore_errors=True)
+    connector = Connector.from_scratch(data_dir=data_dir)
+    connector.rasters_dir.mkdir(parents=True)
+    connector.labels_dir.mkdir(parents=True)
+
+    # files that don't exist yet are not recorded ...
+    connector.add_to_rasters(_rasters(["r1.tif", "r2.tif"]))
+    assert connector.raster_data_file_names(connector.rasters_dir) == set()
+    assert connector.raster_data_file_names(connector.labels_dir) == set()
+    connector.save()
+
+    # ... and files missing from the manifest are treated as absent
+    for raster_name in ["r1.tif", "r2.tif"]:
+        (connector.rasters_dir / raster_name).write_bytes(b"raster")
+    assert not connector.raster_data_file_exists(connector.rasters_dir / "r1.tif")
+    connector.record_raster_data_files(
+        [connector.rasters_dir / "r1.tif", connector.rasters_dir / "r2.tif"]
+    )
+    assert connector.raster_data_file_names(connector.rasters_dir) == {
+        "r1.tif",
+        "r2.tif",
+    }
+    connector.save()
+
+    # changes saved by another connector instance are kept when saving
+    other_connector = Connector.from_data_dir(data_dir)
+    (other_connector.labels_dir / "r1.tif").write_bytes(b"label")
+    other_connector.record_raster_data_files([other_connector.labels_dir / "r1.tif"])
+    other_connector.save()
+    (connector.rasters_dir / "r2.tif").unlink()
+    connector.forget_raster_data_files([connector.rasters_dir / "r2.tif"])
+    assert not connector.raster_data_file_exists(connector.labels_dir / "r1.tif")
+    connector.save()
+
+    connector = Connector.from_data_dir(data_dir)
+    assert connector.raster_data_file_names(connector.rasters_dir) == {"r1.tif"}
+    assert connector.raster_data_file_names(connector.labels_dir) == {"r1.tif"}
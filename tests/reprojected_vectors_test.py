@@ -0,0 +1,72 @@
+"""Test the connector's cache of reprojected vector geometries."""
+
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+
+from geographer.connector import Connector
+from geographer.global_constants import (
+    RASTER_IMGS_INDEX_NAME,
+    STANDARD_CRS_EPSG_CODE,
+    VECTOR_FEATURES_INDEX_NAME,
+)
+from geographer.utils.utils import transform_shapely_geometry
+
+UTM_EPSG_CODE = 32633
+
+
+def test_vector_geoms_in_crs():
+    """Test vector_geoms_in_crs after adding, dropping and replacing vectors."""
+    connector = Connector.from_scratch(data_dir=Path("/whatever/"))
+    connector.add_to_rasters(
+        gpd.GeoDataFrame(
+            {"orig_crs_epsg_code": [UTM_EPSG_CODE]},
+            geometry=[box(13, 52, 14, 53)],
+            index=pd.Index(["r1"], name=RASTER_IMGS_INDEX_NAME),
+            crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+        )
+    )
+    vectors = gpd.GeoDataFrame(
+        {"type": "object"},
+        geometry=[
+            box(13.1, 52.1, 13.2, 52.2),
+            box(13.3, 52.3, 13.4, 52.4),
+            box(13.5, 52.5, 13.6, 52.6),
+        ],
+        index=pd.Index(["v1", "v2", "v3"], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+
+    def check(vector_names):
+        reprojected_geoms = connector.vector_geoms_in_crs(vector_names, UTM_EPSG_CODE)
+        assert len(reprojected_geoms) == len(vector_names)
+        for vector_name, reprojected_geom in zip(vector_names, reprojected_geoms):
+            expected = transform_shapely_geometry(
+                connector.vectors.loc[vector_name, "geometry"],
+                STANDARD_CRS_EPSG_CODE,
+                UTM_EPSG_CODE,
+            )
+            assert reprojected_geom.equals_exact(expected, tolerance=1e-6)
+
+    connector.add_to_vectors(vectors.iloc[:2])
+    check(["v2", "v1"])
+    cached = connector.vector_geoms_in_crs(["v1"], UTM_EPSG_CODE)[0]
+    assert connector.vector_geoms_in_crs(["v1"], UTM_EPSG_CODE)[0] is cached
+
+    connector.add_to_vectors(vectors.iloc[2:])
+    assert "v3" in connector._reprojected_vectors[UTM_EPSG_CODE]
+    check(["v1", "v2", "v3"])
+
+    connector.drop_vectors(["v2"])
+    assert "v2" not in connector._reprojected_vectors[UTM_EPSG_CODE]
+    check(["v3", "v1"])
+
+    # replacing a geometry invalidates its reprojected geometry
+    connector.vectors.loc["v1", "geometry"] = box(13.7, 52.7, 13.8, 52.8)
+    check(["v1"])
+
+    assert connector.vector_geoms_in_crs(
+        ["v1"], STANDARD_CRS_EPSG_CODE
+    )[0].equals(connector.vectors.loc["v1", "geometry"])
@@ -3,7 +3,15 @@
 Test SegLabelMakerCategorical and SegLabelMakerSoftCategorical.
 """
 
-from utils import get_test_dir
+import shutil
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import rasterio as rio
+from shapely.geometry import Point
+from utils import create_dummy_rasters, get_test_dir
 
 from geographer import Connector
 from geographer.label_makers import (
@@ -12,10 +20,9 @@ from geographer.label_makers import (
 )
 
 
-def test_label_maker_categorical_seg():
+def test_label_maker_categorical_seg(dummy_cut_source_data_dir):
     """Test SegLabelMakerCategorical."""
-    data_dir = get_test_dir() / "cut_source"
-    connector = Connector.from_data_dir(data_dir)
+    connector = Connector.from_data_dir(dummy_cut_source_data_dir)
 
     label_maker = SegLabelMakerCategorical()
     label_maker.delete_labels(connector)
@@ -24,10 +31,9 @@ def test_label_maker_categorical_seg():
     )
 
 
-def test_label_maker_soft_categorical_seg():
+def test_label_maker_soft_categorical_seg(dummy_cut_source_data_dir):
     """Test SegLabelMakerSoftCategorical."""
-    data_dir = get_test_dir() / "cut_source"
-    connector = Connector.from_data_dir(data_dir)
+    connector = Connector.from_data_dir(dummy_cut_source_data_dir)
     class_names = connector.all_vector_classes
     assert len(class_names) == 1
     class_name = class_names[0]
@@ -40,6 +46,162 @@ def test_label_maker_soft_categorical_seg():
     )
 
 
+@pytest.mark.parametrize("probability_dtype", ["float16", "uint8"])
+def test_label_maker_soft_categorical_probability_dtype(probability_dtype):
+    """Test storing soft-categorical labels as float16 or uint8."""
+    # work on a copy with small rasters
+    data_dir = get_test_dir() / f"temp/probability_dtype_{probability_dtype}"
+    shutil.rmtree(data_dir, ignore_errors=True)
+    shutil.copytree(get_test_dir() / "cut_source/connector", data_dir / "connector")
+    create_dummy_rasters(data_dir=data_dir, raster_size=512)
+    connector = Connector.from_data_dir(data_dir)
+    class_name = connector.all_vector_classes[0]
+    connector.vectors[f"prob_of_class_{class_name}"] = 0.7
+
+    label_maker = SegLabelMakerSoftCategorical(add_background_band=True)
+    label_maker.make_labels(connector)
+    float32_labels_dir = data_dir / "float32_labels"
+    connector.labels_dir.rename(float32_labels_dir)
+    connector.forget_raster_data_files(
+        connector.labels_dir / raster_name for raster_name in connector.rasters.index
+    )
+
+    label_maker = SegLabelMakerSoftCategorical(
+        add_background_band=True, probability_dtype=probability_dtype
+    )
+    label_maker.make_labels(connector)
+
+    for label_path in float32_labels_dir.iterdir():
+        with rio.open(label_path) as float32_src, rio.open(
+            connector.labels_dir / label_path.name
+        ) as src:
+            if probability_dtype == "float16":
+                assert src.dtypes[0] == "float32"
+                assert src.tags(1, ns="IMAGE_STRUCTURE")["NBITS"] == "16"
+            else:
+                assert src.dtypes[0] == "uint8"
+            for band, scale in zip(src.indexes, src.scales):
+                label_band = src.read(band, out_dtype=np.float32) * np.float32(scale)
+                assert np.allclose(label_band, float32_src.read(band), atol=1 / 255)
+
+
+def test_recompute_labels_skips_unchanged_labels(dummy_cut_source_data_dir):
+    """Test recompute_labels only recomputes labels whose fingerprint changed."""
+    # work on a copy, since we modify the vectors
+    data_dir = get_test_dir() / "temp/recompute_labels"
+    shutil.rmtree(data_dir, ignore_errors=True)
+    shutil.copytree(dummy_cut_source_data_dir, data_dir)
+    connector = Connector.from_data_dir(data_dir)
+
+    label_maker = SegLabelMakerCategorical()
+    label_maker.delete_labels(connector)
+    label_maker.make_labels(connector=connector)
+
+    def label_mtimes():
+        return {
+            label_path.name: label_path.stat().st_mtime_ns
+            for label_path in connector.labels_dir.iterdir()
+        }
+
+    mtimes = label_mtimes()
+    label_maker.recompute_labels(connector)
+    assert label_mtimes() == mtimes
+
+    # moving a vector feature changes the labels of the rasters it intersects
+    vector_name = connector.vectors.index[0]
+    raster_names = set(connector.rasters_intersecting_vector(vector_name))
+    connector.vectors.loc[vector_name, "geometry"] = connector.vectors.loc[
+        vector_name, "geometry"
+    ].buffer(0.0001)
+    label_maker.recompute_labels(connector)
+    new_mtimes = label_mtimes()
+    assert {
+        raster_name
+        for raster_name, mtime in new_mtimes.items()
+        if mtime != mtimes[raster_name]
+    } == raster_names
+
+
+@pytest.mark.parametrize(
+    "label_maker",
+    [
+        SegLabelMakerCategorical(),
+        SegLabelMakerSoftCategorical(add_background_band=True),
+    ],
+)
+def test_patch_labels(dummy_cut_source_data_dir, label_maker):
+    """Test patching labels gives the same labels as recomputing them."""
+    data_dir = get_test_dir() / "temp/patch_labels"
+    shutil.rmtree(data_dir, ignore_errors=True)
+    shutil.copytree(dummy_cut_source_data_dir, data_dir)
+    connector = Connector.from_data_dir(data_dir)
+    class_name = connector.all_vector_classes[0]
+    connector.vectors[f"prob_of_class_{class_name}"] = 1.0
+
+    label_maker.delete_labels(connector)
+    label_maker.make_labels(connector=connector)
+
+    # add small vector features in the middle and near a corner of a raster ...
+    raster_bbox = connector.rasters.geometry.iloc[0]
+    minx, miny, _, _ = raster_bbox.bounds
+    new_vector_names = ["patch_labels_test_vector1", "patch_labels_test_vector2"]
+    new_vectors = connector.vectors.iloc[[0, 0]].copy()
+    new_vectors.index = pd.Index(new_vector_names, name=connector.vectors.index.name)
+    new_vectors = new_vectors.set_geometry(
+        gpd.GeoSeries(
+            [
+                raster_bbox.centroid.buffer(0.001),
+                Point(minx + 0.002, miny + 0.002).buffer(0.001),
+            ],
+            index=new_vectors.index,
+            crs=connector.vectors.crs,
+        )
+    )
+    connector.add_to_vectors(new_vectors, label_maker=label_maker)
+    patched_labels = _read_labels(connector)
+
+    label_maker.delete_labels(connector)
+    label_maker.make_labels(connector=connector)
+    assert _read_labels(connector).keys() == patched_labels.keys()
+    for label_name, label in _read_labels(connector).items():
+        assert np.array_equal(label, patched_labels[label_name])
+
+    # ... and drop them again
+    connector.drop_vectors(new_vector_names, label_maker=label_maker)
+    patched_labels = _read_labels(connector)
+
+    label_maker.delete_labels(connector)
+    label_maker.make_labels(connector=connector)
+    for label_name, label in _read_labels(connector).items():
+        assert np.array_equal(label, patched_labels[label_name])
+
+
+def _read_labels(connector: Connector) -> dict[str, np.ndarray]:
+    labels = {}
+    for label_path in connector.labels_dir.iterdir():
+        with rio.open(label_path) as src:
+            labels[label_path.name] = src.read()
+    return labels
+
+
+def test_label_maker_parallel(dummy_cut_source_data_dir):
+    """Test making labels in parallel gives the same labels as serially."""
+    connector = Connector.from_data_dir(dummy_cut_source_data_dir)
+
+    label_maker = SegLabelMakerCategorical()
+    label_maker.delete_labels(connector)
+    label_maker.make_labels(connector=connector)
+    serial_labels = _read_labels(connector)
+
+    label_maker.recompute_labels(connector=connector, n_workers=2)
+    parallel_labels = _read_labels(connector)
+
+    assert serial_labels.keys() == parallel_labels.keys()
+    for label_name, label in serial_labels.items():
+        assert np.array_equal(label, parallel_labels[label_name])
+
+
 if __name__ == "__main__":
-    test_label_maker_categorical_seg()
-    test_label_maker_soft_categorical_seg()
+    test_label_maker_categorical_seg(get_test_dir() / "cut_source")
+    test_label_maker_soft_categorical_seg(get_test_dir() / "cut_source")
+    test_label_maker_parallel(get_test_dir() / "cut_source")
@@ -0,0 +1,84 @@
+"""Test SpatialIndex and the connector's spatial index query methods."""
+
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import box
+
+from geographer.connector import Connector
+from geographer.global_constants import (
+    RASTER_IMGS_INDEX_NAME,
+    STANDARD_CRS_EPSG_CODE,
+    VECTOR_FEATURES_INDEX_NAME,
+)
+from geographer.utils.spatial_index import SpatialIndex
+
+
+def _brute_force_query(names, geoms, query_geom):
+    return {
+        name for name, geom in zip(names, geoms) if query_geom.intersects(geom)
+    }
+
+
+def test_spatial_index_append_drop():
+    """Test queries agree with brute force after appends and drops."""
+    rng = np.random.default_rng(0)
+    mins = rng.uniform(0, 100, size=(1000, 2))
+    geoms = [box(*min_, *(min_ + 1)) for min_ in mins]
+    names = [f"g{n}" for n in range(1000)]
+
+    spatial_index = SpatialIndex(names[:500], geoms[:500], max_delta_fraction=0.5)
+    spatial_index.append(names[500:600], geoms[500:600])
+    spatial_index.drop(names[100:150] + names[550:560])
+    spatial_index.append(names[600:], geoms[600:])  # triggers compaction
+    spatial_index.drop(names[900:])
+
+    live = [
+        (name, geom)
+        for name, geom in zip(names, geoms)
+        if name not in set(names[100:150] + names[550:560] + names[900:])
+    ]
+    assert len(spatial_index) == len(live)
+    assert spatial_index.names.tolist() == [name for name, _ in live]
+
+    for query_geom in [box(10, 10, 30, 30), box(50, 0, 51, 100), box(-5, -5, -1, -1)]:
+        assert set(spatial_index.query_bbox(query_geom)) == _brute_force_query(
+            *zip(*live), query_geom
+        )
+
+
+def test_connector_rasters_vectors_in_bbox():
+    """Test rasters_in_bbox and vectors_in_bbox after adding and dropping."""
+    connector = Connector.from_scratch(data_dir=Path("/whatever/"))
+
+    rasters = gpd.GeoDataFrame(
+        geometry=[box(0, 0, 2, 2), box(1, 1, 3, 3), box(5, 5, 6, 6)],
+        index=pd.Index(["r1", "r2", "r3"], name=RASTER_IMGS_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    vectors = gpd.GeoDataFrame(
+        {"type": "object"},
+        geometry=[box(0.5, 0.5, 1, 1), box(5.2, 5.2, 5.5, 5.5)],
+        index=pd.Index(["v1", "v2"], name=VECTOR_FEATURES_INDEX_NAME),
+        crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+    )
+    connector.add_to_rasters(rasters.iloc[:2])
+    assert set(connector.rasters_in_bbox((1.5, 1.5, 1.6, 1.6))) == {"r1", "r2"}
+
+    connector.add_to_rasters(rasters.iloc[2:])
+    connector.add_to_vectors(vectors)
+    assert connector.rasters_in_bbox((5.5, 5.5, 5.6, 5.6)) == ["r3"]
+    assert connector.rasters_in_bbox(box(0.1, 0.1, 0.2, 0.2), predicate="within") == [
+        "r1"
+    ]
+    assert set(connector.vectors_in_bbox((0, 0, 10, 10), predicate="contains")) == {
+        "v1",
+        "v2",
+    }
+
+    connector.drop_rasters(["r1"], remove_rasters_from_disk=False)
+    assert connector.rasters_in_bbox((1.5, 1.5, 1.6, 1.6)) == ["r2"]
+    connector.drop_vectors(["v2"])
+    assert connector.vectors_in_bbox((5, 5, 6, 6)) == []
@@ -0,0 +1,87 @@
+"""Test DSConverterGeoTiffToNpy."""
+
+import shutil
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import rasterio as rio
+from shapely.geometry import box
+from utils import get_test_dir
+
+from geographer import Connector
+from geographer.converters import DSConverterGeoTiffToNpy
+from geographer.global_constants import RASTER_IMGS_INDEX_NAME, STANDARD_CRS_EPSG_CODE
+
+
+@pytest.mark.parametrize(
+    "n_workers, channels_first_or_last_in_npy", [(1, "last"), (2, "first")]
+)
+def test_tif_to_npy(n_workers, channels_first_or_last_in_npy):
+    """Test converting GeoTiffs to .npy files."""
+    source_data_dir = get_test_dir() / "temp/tif_to_npy_source"
+    target_data_dir = get_test_dir() / "temp/tif_to_npy_target"
+    shutil.rmtree(source_data_dir, ignore_errors=True)
+    shutil.rmtree(target_data_dir, ignore_errors=True)
+
+    raster_names = ["r1.tif", "r2.tif"]
+    source_connector = Connector.from_scratch(
+        data_dir=source_data_dir,
+        rasters=gpd.GeoDataFrame(
+            {"orig_crs_epsg_code": [STANDARD_CRS_EPSG_CODE] * 2},
+            geometry=[box(13, 52, 13.1, 52.1), box(13.1, 52, 13.2, 52.1)],
+            index=pd.Index(raster_names, name=RASTER_IMGS_INDEX_NAME),
+            crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+        ),
+    )
+
+    # write rasters with 3 bands and a single band label for r1 only
+    rng = np.random.default_rng(0)
+    arrays = {}
+    for dir_, raster_name, count in [
+        (source_connector.rasters_dir, "r1.tif", 3),
+        (source_connector.rasters_dir, "r2.tif", 3),
+        (source_connector.labels_dir, "r1.tif", 1),
+    ]:
+        dir_.mkdir(parents=True, exist_ok=True)
+        array = rng.integers(0, 255, size=(count, 20, 30), dtype=np.uint8)
+        with rio.open(
+            dir_ / raster_name,
+            "w",
+            driver="GTiff",
+            height=20,
+            width=30,
+            count=count,
+            dtype=np.uint8,
+            crs=f"EPSG:{STANDARD_CRS_EPSG_CODE}",
+            transform=rio.transform.from_bounds(13, 52, 13.1, 52.1, 30, 20),
+        ) as dst:
+            dst.write(array)
+        arrays[dir_.name, raster_name] = array
+    source_connector.save()
+
+    converter = DSConverterGeoTiffToNpy(
+        name="tif_to_npy",
+        source_data_dir=source_data_dir,
+        target_data_dir=target_data_dir,
+        channels_first_or_last_in_npy=channels_first_or_last_in_npy,
+        bands={"rasters": [3, 1], "labels": None},
+        n_workers=n_workers,
+    )
+    target_connector = converter.create()
+
+    assert set(target_connector.rasters.index) == {"r1.npy", "r2.npy"}
+    assert target_connector.raster_data_file_names(target_connector.labels_dir) == {
+        "r1.npy"
+    }
+    for raster_name in raster_names:
+        npy = np.load(target_connector.rasters_dir / raster_name.replace("tif", "npy"))
+        expected = arrays["rasters", raster_name][[2, 0]]
+        if channels_first_or_last_in_npy == "last":
+            expected = np.moveaxis(expected, 0, 2)
+        assert np.array_equal(npy, expected)
+
+    # single band labels are squeezed
+    label = np.load(target_connector.labels_dir / "r1.npy")
+    assert np.array_equal(label, arrays["labels", "r1.tif"][0])
@@ -0,0 +1,36 @@
+"""Test transform_shapely_geometries."""
+
+import pyproj
+from shapely.geometry import LineString, Point, Polygon, box
+from shapely.ops import transform
+
+from geographer.utils.utils import (
+    get_transformer,
+    transform_shapely_geometries,
+    transform_shapely_geometry,
+)
+
+
+def test_transform_shapely_geometries():
+    """Test batch transform agrees with transforming geometry by geometry."""
+    geometries = [
+        box(13.0, 52.0, 13.1, 52.1),
+        Point(13.05, 52.05),
+        LineString([(13.0, 52.0), (13.1, 52.1)]),
+        Polygon([(13.0, 52.0, 1.0), (13.1, 52.0, 2.0), (13.1, 52.1, 3.0)]),
+    ]
+    project = pyproj.Transformer.from_crs("epsg:4326", "epsg:32633", always_xy=True)
+
+    transformed_geometries = transform_shapely_geometries(geometries, 4326, 32633)
+
+    assert len(transformed_geometries) == len(geometries)
+    for geometry, transformed_geometry in zip(geometries, transformed_geometries):
+        expected = transform(project.transform, geometry)
+        assert transformed_geometry.has_z == geometry.has_z
+        assert transformed_geometry.equals_exact(expected, tolerance=1e-6)
+        assert transformed_geometry.equals_exact(
+            transform_shapely_geometry(geometry, 4326, 32633), tolerance=0
+        )
+
+    assert len(transform_shapely_geometries([], 4326, 32633)) == 0
+    assert get_transformer(4326, 32633) is get_transformer(4326, 32633)
@@ -11,6 +11,7 @@ import rasterio as rio
 from tqdm.auto import tqdm
 
 from geographer import Connector
+from geographer.raster_data_files_mixin import RASTER_DATA_FILES_FILENAME
 from geographer.utils.utils import transform_shapely_geometry
 
 
@@ -73,3 +74,4 @@ def delete_dummy_rasters(data_dir: Path | str) -> None:
     """Delete dummy raster data from dataset."""
     shutil.rmtree(data_dir / "rasters", ignore_errors=True)
     shutil.rmtree(data_dir / "labels", ignore_errors=True)
+    (data_dir / "connector" / RASTER_DATA_FILES_FILENAME).unlink(missing_ok=True)